@@ -0,0 +1,153 @@
+class AnalyseGrammaire:
+    def __init__(self, cfg):
+        """
+        Construire les index nécessaires aux analyses d'une grammaire, en un seul parcours.
+
+        Chaque règle reçoit un numéro (sa position dans cfg.liste_regles()). L'index inverse
+        associe à chaque non-terminal la liste des règles dans lesquelles il apparaît à droite,
+        avec une entrée par occurrence : il permet de propager un changement d'état d'un
+        symbole uniquement vers les règles concernées.
+
+        :param cfg: L'objet CFG à analyser (non modifié)
+        """
+        self.cfg = cfg
+        self.regles = cfg.liste_regles()  # Règles numérotées
+        self.occurrences = {}  # Index inverse {non-terminal: [numéros de règles, une entrée par occurrence]}
+        for index, regle in enumerate(self.regles):
+            for symbole in regle.droite:
+                if symbole >= 0:
+                    self.occurrences.setdefault(symbole, []).append(index)
+
+    def _propager(self, compteurs):
+        """
+        Calculer le plus petit point fixe par une file de travail à compteurs.
+
+        Une règle est « satisfaite » quand son compteur tombe à zéro ; son non-terminal de
+        gauche est alors marqué, et chaque occurrence de ce non-terminal décrémente le compteur
+        de la règle où elle apparaît. Chaque occurrence est traitée au plus une fois, le coût
+        est donc linéaire en la taille de la grammaire.
+
+        :param compteurs: Liste, pour chaque règle, du nombre d'occurrences restant à satisfaire
+        :return: Ensemble des non-terminaux marqués
+        """
+        marques = set()
+        a_traiter = [regle.gauche for regle, compteur in zip(self.regles, compteurs) if compteur == 0]
+        while a_traiter:
+            nt = a_traiter.pop()
+            if nt in marques:
+                continue
+            marques.add(nt)
+            for index in self.occurrences.get(nt, []):
+                compteurs[index] -= 1
+                if compteurs[index] == 0:
+                    a_traiter.append(self.regles[index].gauche)
+        return marques
+
+    def nullables(self):
+        """
+        Calculer les non-terminaux qui peuvent générer la chaîne vide.
+
+        :return: Ensemble des non-terminaux nullables
+        """
+        # Un terminal n'est jamais nullable : il reste compté et la règle n'est jamais satisfaite
+        return self._propager([len(regle.droite) for regle in self.regles])
+
+    def productifs(self):
+        """
+        Calculer les non-terminaux productifs, c'est-à-dire qui génèrent au moins un mot terminal.
+
+        :return: Ensemble des non-terminaux productifs
+        """
+        # Les terminaux sont toujours productifs : seuls les non-terminaux sont comptés
+        return self._propager([sum(1 for symbole in regle.droite if symbole >= 0) for regle in self.regles])
+
+    def accessibles(self, productifs=None):
+        """
+        Calculer les non-terminaux accessibles depuis l'axiome.
+
+        :param productifs: Si donné, ne suivre que les règles dont tous les non-terminaux sont productifs
+        :return: Ensemble des non-terminaux accessibles
+        """
+        axiome = self.cfg.axiome
+        if productifs is not None and axiome not in productifs:
+            return set()
+
+        accessibles = {axiome}
+        pile = [axiome]
+        while pile:
+            nt = pile.pop()
+            for production in self.cfg.productions.get(nt, []):
+                if productifs is not None and any(s >= 0 and s not in productifs for s in production):
+                    continue
+                for symbole in production:
+                    if symbole >= 0 and symbole not in accessibles:
+                        accessibles.add(symbole)
+                        pile.append(symbole)
+        return accessibles
+
+    def coins_gauches(self):
+        """
+        Calculer la relation « coin gauche » : A -> B si une production de A commence par B.
+
+        Un non-terminal est récursif à gauche si et seulement s'il appartient à un cycle de ce graphe.
+
+        :return: Dictionnaire {non-terminal: [coins gauches non-terminaux, sans doublon, dans l'ordre des règles]}
+        """
+        coins = {nt: {} for nt in self.cfg.productions}  # Dictionnaires utilisés comme ensembles ordonnés
+        for regle in self.regles:
+            if regle.droite and regle.droite[0] >= 0:
+                coins[regle.gauche][regle.droite[0]] = None
+        return {nt: list(cibles) for nt, cibles in coins.items()}
+
+def composantes_fortement_connexes(sommets, successeurs):
+    """
+    Calculer les composantes fortement connexes d'un graphe (algorithme de Tarjan, itératif).
+
+    Les composantes sont retournées dans l'ordre topologique inverse : une composante apparaît
+    toujours après toutes celles qu'elle peut atteindre. Le parcours suit l'ordre de `sommets`
+    et de `successeurs`, le résultat est donc déterministe.
+
+    :param sommets: Liste des sommets de départ
+    :param successeurs: Fonction qui associe à un sommet la liste de ses successeurs
+    :return: Liste de composantes (listes de sommets)
+    """
+    index = {}  # Ordre de découverte de chaque sommet
+    bas = {}  # Plus petit index accessible depuis le sous-arbre du sommet
+    pile = []
+    sur_pile = set()
+    composantes = []
+
+    for racine in sommets:
+        if racine in index:
+            continue
+        index[racine] = bas[racine] = len(index)
+        pile.append(racine)
+        sur_pile.add(racine)
+        travail = [(racine, iter(successeurs(racine)))]
+
+        while travail:
+            sommet, suivants = travail[-1]
+            for suivant in suivants:
+                if suivant not in index:  # Descendre dans un nouveau sommet
+                    index[suivant] = bas[suivant] = len(index)
+                    pile.append(suivant)
+                    sur_pile.add(suivant)
+                    travail.append((suivant, iter(successeurs(suivant))))
+                    break
+                if suivant in sur_pile:
+                    bas[sommet] = min(bas[sommet], index[suivant])
+            else:  # Tous les successeurs ont été traités : remonter
+                travail.pop()
+                if travail:
+                    parent = travail[-1][0]
+                    bas[parent] = min(bas[parent], bas[sommet])
+                if bas[sommet] == index[sommet]:  # Le sommet est la racine d'une composante
+                    composante = []
+                    while True:
+                        membre = pile.pop()
+                        sur_pile.discard(membre)
+                        composante.append(membre)
+                        if membre == sommet:
+                            break
+                    composantes.append(composante)
+    return composantes
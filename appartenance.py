@@ -0,0 +1,160 @@
+import sys
+import numpy as np
+from lire import read_cfg_rules
+
+class ReconnaisseurCYK:
+    def __init__(self, cfg):
+        """
+        Compiler une grammaire en forme normale de Chomsky en tables pour l'algorithme CYK.
+
+        Les non-terminaux sont numérotés de 0 à k-1, un ensemble de non-terminaux est alors un
+        vecteur booléen de taille k. Deux tables sont construites :
+        - terminal -> vecteur des non-terminaux A tels que A -> a ;
+        - paire (B, C) -> vecteur des non-terminaux A tels que A -> BC.
+
+        :param cfg: L'objet CFG, déjà en forme normale de Chomsky (par exemple lu depuis alg.chomsky)
+        :raises ValueError: Si une production n'est pas de la forme A -> a, A -> BC ou S -> E.
+        """
+        self.cfg = cfg
+        self.numeros = {nt: i for i, nt in enumerate(cfg.productions)}  # Identifiant -> indice dense
+        k = len(self.numeros)
+
+        self.terminaux = {}  # {nom du terminal: vecteur booléen des parents}
+        paires = {}  # {(B, C): vecteur booléen des parents}
+        self.accepte_vide = False
+        for nt, productions in cfg.productions.items():
+            for prod in productions:
+                if not prod:
+                    # Seul E produit par l'axiome compte ; ailleurs la règle est redondante
+                    # (l'élimination des epsilon a déjà ajouté les variantes sans ce non-terminal)
+                    if nt == cfg.axiome:
+                        self.accepte_vide = True
+                elif len(prod) == 1 and prod[0] < 0:
+                    nom = cfg.nom(prod[0])
+                    if nom not in self.terminaux:
+                        self.terminaux[nom] = np.zeros(k, dtype=bool)
+                    self.terminaux[nom][self.numeros[nt]] = True
+                elif len(prod) == 2 and prod[0] in self.numeros and prod[1] in self.numeros:
+                    paire = (self.numeros[prod[0]], self.numeros[prod[1]])
+                    if paire not in paires:
+                        paires[paire] = np.zeros(k, dtype=bool)
+                    paires[paire][self.numeros[nt]] = True
+                else:
+                    raise ValueError(
+                        f"'{cfg.nom(nt)} -> {cfg.nom_production(prod)}' n'est pas en forme normale de Chomsky !")
+
+        # Table terminal -> parents sous forme de matrice ; la dernière ligne (vide) sert aux caractères inconnus
+        self.alphabet = {nom: i for i, nom in enumerate(self.terminaux)}
+        self.feuilles = np.zeros((len(self.alphabet) + 1, k), dtype=bool)
+        for nom, i in self.alphabet.items():
+            self.feuilles[i] = self.terminaux[nom]
+
+        # Tables de paires sous forme de tableaux : indices B, indices C et matrice paire -> parents
+        self.gauches = np.array([b for b, _ in paires], dtype=np.intp)
+        self.droites = np.array([c for _, c in paires], dtype=np.intp)
+        # Matrice en flottants : le produit passe par BLAS, un parent est présent si la somme est > 0
+        self.parents = np.array(list(paires.values()), dtype=np.float32).reshape(len(paires), k)
+        self.axiome = self.numeros.get(cfg.axiome)
+
+    def reconnait(self, mot):
+        """
+        Vérifier si un mot appartient au langage de la grammaire.
+
+        :param mot: Le mot (chaîne de terminaux, '' pour la chaîne vide)
+        :return: Booléen
+        """
+        return bool(self.reconnait_lot([mot])[0])
+
+    def reconnait_lot(self, mots, memoire=64 * 2**20):
+        """
+        Vérifier l'appartenance d'un lot de mots au langage.
+
+        Les mots sont regroupés par longueur, et chaque groupe est traité en une seule passe CYK
+        vectorisée : pour chaque longueur de segment et chaque point de coupure, toutes les
+        positions de départ et tous les mots du groupe sont combinés par un seul produit
+        matriciel (paires présentes) x (matrice paire -> parents).
+
+        :param mots: Liste de mots
+        :param memoire: Taille approximative (en octets) de la mémoire de travail d'un sous-lot
+        :return: Tableau NumPy de booléens, un par mot
+        """
+        resultats = np.zeros(len(mots), dtype=bool)
+        if self.axiome is None:
+            return resultats
+
+        par_longueur = {}
+        for i, mot in enumerate(mots):
+            par_longueur.setdefault(len(mot), []).append(i)
+
+        k = len(self.numeros)
+        paires = len(self.gauches)
+        for n, indices in par_longueur.items():
+            if n == 0:
+                resultats[indices] = self.accepte_vide
+                continue
+            # Découper le groupe pour borner la mémoire par mot : la table (n(n+1)/2 cases de k booléens)
+            # et, pour une coupure, au plus n positions de paires présentes (booléens puis copie float32,
+            # 5 octets par paire) et de sommes float32 (la somme et le résultat du produit, 8 octets par non-terminal)
+            par_mot = n * (n + 1) // 2 * k + n * (5 * paires + 8 * k)
+            taille = max(1, memoire // max(par_mot, 1))
+            for debut in range(0, len(indices), taille):
+                lot = indices[debut:debut + taille]
+                resultats[lot] = self._cyk([mots[i] for i in lot], n)
+        return resultats
+
+    def _cyk(self, mots, n):
+        """
+        Exécuter CYK sur des mots de même longueur n.
+
+        :param mots: Liste de mots de longueur n
+        :param n: Longueur commune des mots
+        :return: Tableau de booléens, un par mot
+        """
+        k = len(self.numeros)
+        lot = len(mots)
+        inconnu = len(self.alphabet)
+
+        # table[l] : tableau (n - l + 1, lot, k), non-terminaux qui dérivent chaque segment de longueur l
+        table = [None] * (n + 1)
+        codes = np.array([[self.alphabet.get(c, inconnu) for c in mot] for mot in mots], dtype=np.intp)
+        table[1] = self.feuilles[codes.T]
+
+        for longueur in range(2, n + 1):
+            positions = n - longueur + 1
+            somme = np.zeros((positions, lot, k), dtype=np.float32)
+            if len(self.parents):
+                for coupure in range(1, longueur):
+                    gauche = table[coupure][:positions]
+                    droite = table[longueur - coupure][coupure:coupure + positions]
+                    presentes = gauche[..., self.gauches] & droite[..., self.droites]
+                    somme += np.matmul(presentes.astype(np.float32), self.parents)
+            table[longueur] = somme > 0
+
+        return table[n][0, :, self.axiome]
+
+if __name__ == "__main__":
+    # Vérifier les arguments de la ligne de commande
+    if len(sys.argv) not in (2, 3):
+        print("Utilisation : python3 appartenance.py <file_path> [fichier_mots]")
+        sys.exit(1)
+
+    # Lire les règles CFG (forme normale de Chomsky)
+    cfg_rules = read_cfg_rules(sys.argv[1])
+    if cfg_rules is None:
+        print("Échec de la lecture des règles CFG, veuillez vérifier le contenu du fichier.")
+        sys.exit(1)
+
+    try:
+        reconnaisseur = ReconnaisseurCYK(cfg_rules)
+    except ValueError as e:
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+    # Lire les mots (un par ligne, 'E' pour la chaîne vide) depuis un fichier ou l'entrée standard
+    source = open(sys.argv[2], encoding='utf-8') if len(sys.argv) == 3 else sys.stdin
+    with source:
+        mots = [ligne.strip() for ligne in source if ligne.strip()]
+    mots = ['' if mot == 'E' else mot for mot in mots]
+
+    for mot, appartient in zip(mots, reconnaisseur.reconnait_lot(mots)):
+        print(f"{mot if mot != '' else 'E'} : {'oui' if appartient else 'non'}")
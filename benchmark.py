@@ -0,0 +1,411 @@
+import gc
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from cfg import CFG, LETTRES_NON_TERMINAUX, METHODES_GREIBACH
+from generer import WordGenerator
+from lire import read_cfg_rules
+from pipeline import Pipeline, ETAPES, PASSES_GREIBACH, PASSES_GREIBACH_COIN_GAUCHE
+
+def passes_jusqu_a(etape):
+    """
+    Retrouver les passes de CFG appliquées de la source jusqu'à une étape du pipeline.
+
+    :param etape: Nom d'une étape de pipeline.ETAPES
+    :return: Liste de noms de méthodes de CFG, dans l'ordre d'application
+    """
+    passes = []
+    while etape != "source":
+        etape, passes_etape = ETAPES[etape]
+        passes[:0] = passes_etape
+    return passes
+
+# Étapes de CFG.chomsky() et CFG.greibach() (par chaque méthode), reprises du pipeline qui les suit pas à pas
+ETAPES_CHOMSKY = passes_jusqu_a("chomsky")
+ETAPES_GREIBACH = PASSES_GREIBACH
+ETAPES_GREIBACH_COIN_GAUCHE = PASSES_GREIBACH_COIN_GAUCHE
+
+# Parties mesurées de chaque cas (voir executer_cas)
+PARTIES = ("chomsky", "generation", "greibach", "greibach_coin_gauche")
+
+# Profils de grammaires synthétiques : chacun pousse un réglage du générateur
+PROFILS = {
+    "base": {},
+    "nullables": {"densite_nullable": 0.5},
+    "unitaires": {"profondeur_unitaire": 8},
+    "recursion_gauche": {"cycles_gauches": 4},
+    "ambigue": {"ambiguite": 4},
+    "longues": {"longueur_max": 6},
+}
+TAILLES = {"petite": [12, 24], "moyenne": [12, 24, 48], "grande": [12, 24, 48, 96]}
+# Profondeurs des chaînes de coins gauches de la comparaison des méthodes de Greibach
+CHAINES = {"petite": [4, 8], "moyenne": [4, 8, 12], "grande": [4, 8, 12, 16]}
+# Grammaires d'exemple du dépôt, incluses dans la comparaison des méthodes de Greibach
+EXEMPLES = ["cfg.general", "cfg/cfg1.general", "cfg/cfg2.general", "cfg/cfg3.general"]
+
+class DelaiDepasse(Exception):
+    """
+    Une mesure a dépassé le délai accordé.
+    """
+
+def grammaire_synthetique(graine, regles=20, longueur_max=3, densite_nullable=0.0, profondeur_unitaire=0,
+                          cycles_gauches=0, ambiguite=0, terminaux="ab"):
+    """
+    Construire une grammaire aléatoire reproductible.
+
+    Chaque non-terminal reçoit une règle terminale (il est donc productif) et est rendu
+    accessible par une règle d'un non-terminal précédent ; le reste des règles est tiré au hasard.
+
+    :param graine: Graine du générateur aléatoire
+    :param regles: Nombre de règles tirées au hasard (environ trois par non-terminal)
+    :param longueur_max: Longueur maximale de la partie droite de ces règles
+    :param densite_nullable: Proportion de non-terminaux qui reçoivent une règle A -> E
+    :param profondeur_unitaire: Longueur d'une chaîne de règles unitaires A -> B -> C ... (0 : aucune)
+    :param cycles_gauches: Nombre de cycles de récursion à gauche (A -> B..., B -> C..., C -> A...)
+    :param ambiguite: Nombre de non-terminaux qui reçoivent la règle ambiguë A -> AA
+    :param terminaux: Alphabet des terminaux
+    :return: L'objet CFG
+    """
+    rng = random.Random(graine)
+    nombre = max(2, regles // 3)
+    noms = ["S0"] + [nom for nom in (f"{LETTRES_NON_TERMINAUX[k % 25]}{k // 25}" for k in range(nombre)) if nom != "S0"][:nombre - 1]
+    productions = {nom: [rng.choice(terminaux)] for nom in noms}  # Une règle terminale chacun
+
+    def symbole():
+        """
+        :return: Un symbole au hasard, non-terminal une fois sur deux
+        """
+        return rng.choice(noms) if rng.random() < 0.5 else rng.choice(terminaux)
+
+    for i in range(1, nombre):  # Accessibilité : un non-terminal précédent mène à noms[i]
+        productions[noms[rng.randrange(i)]].append(rng.choice(terminaux) + noms[i])
+    for _ in range(regles):
+        longueur = rng.randint(1, longueur_max)
+        productions[rng.choice(noms)].append(''.join(symbole() for _ in range(longueur)))
+    for nom in noms:
+        if rng.random() < densite_nullable:
+            productions[nom].append("E")
+    chaine = rng.sample(noms, min(profondeur_unitaire + 1, nombre)) if profondeur_unitaire else []
+    for gauche, droite in zip(chaine, chaine[1:]):
+        productions[gauche].append(droite)
+    for _ in range(cycles_gauches):
+        cycle = rng.sample(noms, min(rng.randint(1, 3), nombre))
+        for gauche, droite in zip(cycle, cycle[1:] + cycle[:1]):
+            productions[gauche].append(droite + rng.choice(terminaux))
+    for nom in rng.sample(noms, min(ambiguite, nombre)):
+        productions[nom].append(nom + nom)
+
+    grammaire = CFG()
+    for nom in noms:
+        grammaire.add_production(nom, productions[nom])
+    return grammaire
+
+def chaine_gauche(profondeur):
+    """
+    Construire une grammaire en forme de Chomsky dont chaque non-terminal a deux coins gauches
+    vers le suivant : A_i -> A_{i+1} B | A_{i+1} C | a. Le développement par substitution produit
+    2^profondeur règles pour l'axiome, la transformation du coin gauche O(profondeur²).
+
+    :param profondeur: Nombre de niveaux de la chaîne
+    :return: L'objet CFG
+    """
+    candidats = (f"{LETTRES_NON_TERMINAUX[k % 25]}{k // 25}" for k in range(profondeur + 3))
+    noms = ["S0"] + [nom for nom in candidats if nom not in ("S0", "B0", "C0")][:profondeur]
+    grammaire = CFG()
+    for nom, suivant in zip(noms, noms[1:]):
+        grammaire.add_production(nom, [f"{suivant}B0", f"{suivant}C0", "a"])
+    grammaire.add_production(noms[-1], ["a"])
+    grammaire.add_production("B0", ["b"])
+    grammaire.add_production("C0", ["a", "b"])
+    return grammaire
+
+def _mesurer(fonction, delai):
+    """
+    Exécuter une fonction en mesurant sa durée.
+
+    :param fonction: Fonction sans argument
+    :param delai: Délai maximal en secondes (0 : aucun)
+    :return: Couple (résultat, durée en secondes)
+    :raises DelaiDepasse: Si le délai est dépassé
+    """
+    def interrompre(signum, frame):
+        raise DelaiDepasse()
+
+    limite = delai and hasattr(signal, "setitimer")
+    if limite:
+        ancien = signal.signal(signal.SIGALRM, interrompre)
+        signal.setitimer(signal.ITIMER_REAL, delai)
+    try:
+        debut = time.perf_counter()
+        resultat = fonction()
+        return resultat, time.perf_counter() - debut
+    finally:
+        if limite:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, ancien)
+
+def executer_etapes(grammaire, etapes, delai, memoire):
+    """
+    Appliquer des étapes de transformation une par une et mesurer chacune.
+
+    :param grammaire: L'objet CFG (modifié)
+    :param etapes: Liste de noms de méthodes de CFG
+    :param delai: Délai maximal par étape en secondes
+    :param memoire: Si vrai, mesurer le pic d'allocation de chaque étape (tracemalloc, plus lent)
+    :return: Liste de mesures ; la dernière porte l'erreur si une étape échoue
+    """
+    mesures = []
+    for etape in etapes:
+        mesure = {"etape": etape}
+        if memoire:
+            tracemalloc.start()
+        try:
+            _, mesure["duree"] = _mesurer(getattr(grammaire, etape), delai)
+        except DelaiDepasse:
+            mesure["erreur"] = f"délai de {delai} s dépassé"
+        except (RecursionError, KeyError, MemoryError) as e:
+            mesure["erreur"] = type(e).__name__
+        finally:
+            if memoire:
+                mesure["memoire_max"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        mesure["non_terminaux"], mesure["regles"], mesure["symboles"] = grammaire.taille()
+        mesures.append(mesure)
+        if "erreur" in mesure:
+            break
+    return mesures
+
+def executer_cas(nom, parametres, longueur, delai, repetitions, memoire):
+    """
+    Mesurer un cas : toutes les étapes de chomsky() puis de greibach() (par chaque méthode, à
+    partir de la même forme de Chomsky), et la génération de mots.
+
+    Chaque étape est mesurée `repetitions` fois sur une grammaire neuve (durée minimale retenue) ;
+    le pic mémoire est mesuré lors d'une exécution séparée, tracemalloc ralentissant le calcul.
+
+    :param nom: Nom du cas
+    :param parametres: Paramètres de grammaire_synthetique
+    :param longueur: Longueur maximale des mots générés
+    :param delai: Délai maximal par mesure en secondes
+    :param repetitions: Nombre d'exécutions chronométrées
+    :param memoire: Mesurer aussi le pic d'allocation
+    :return: Dictionnaire de résultats, sérialisable en JSON
+    """
+    def une_execution(avec_memoire):
+        grammaire = grammaire_synthetique(**parametres)
+        resultat = {"entree": dict(zip(("non_terminaux", "regles", "symboles"), grammaire.taille()))}
+        resultat["chomsky"] = executer_etapes(grammaire, ETAPES_CHOMSKY, delai, avec_memoire)
+        if "erreur" in resultat["chomsky"][-1]:
+            return resultat
+        generation = []
+        for methode in ("generate_words", "generate_words_dp"):
+            mesure = {"methode": methode, "longueur": longueur}
+            try:
+                mots, mesure["duree"] = _mesurer(lambda: getattr(WordGenerator(grammaire), methode)(longueur), delai)
+                mesure["mots"] = len(mots)
+            except DelaiDepasse:
+                mesure["erreur"] = f"délai de {delai} s dépassé"
+            generation.append(mesure)
+        resultat["generation"] = generation
+        chomsky = grammaire.derivee()
+        resultat["greibach"] = executer_etapes(grammaire, ETAPES_GREIBACH, delai, avec_memoire)
+        resultat["greibach_coin_gauche"] = executer_etapes(chomsky, ETAPES_GREIBACH_COIN_GAUCHE, delai, avec_memoire)
+        return resultat
+
+    resultat = None
+    for _ in range(max(1, repetitions)):
+        gc.collect()
+        essai = une_execution(False)
+        if resultat is None:
+            resultat = essai
+            continue
+        for partie in PARTIES:
+            for garde, nouvelle in zip(resultat.get(partie, []), essai.get(partie, [])):
+                if "duree" in garde and "duree" in nouvelle:
+                    garde["duree"] = min(garde["duree"], nouvelle["duree"])
+    if memoire:
+        trace = une_execution(True)
+        for partie in PARTIES:
+            if partie == "generation":
+                continue
+            for garde, nouvelle in zip(resultat.get(partie, []), trace.get(partie, [])):
+                garde["memoire_max"] = nouvelle["memoire_max"]
+    return {"cas": nom, "parametres": parametres, **resultat}
+
+def comparer_methodes_greibach(grammaire, delai):
+    """
+    Convertir la forme de Chomsky d'une grammaire en forme de Greibach par chaque méthode.
+
+    :param grammaire: L'objet CFG (non modifié)
+    :param delai: Délai maximal par méthode en secondes
+    :return: {méthode: mesure {duree, non_terminaux, regles, symboles} ou {erreur}}
+    """
+    chomsky = Pipeline(grammaire).etape("chomsky")
+    mesures = {"chomsky": dict(zip(("non_terminaux", "regles", "symboles"), chomsky.taille()))}
+    for methode in METHODES_GREIBACH:
+        copie = chomsky.derivee()
+        gc.collect()
+        try:
+            _, duree = _mesurer(lambda: copie.greibach(methode=methode), delai)
+            mesures[methode] = {"duree": duree, **dict(zip(("non_terminaux", "regles", "symboles"), copie.taille()))}
+        except DelaiDepasse:
+            mesures[methode] = {"erreur": f"délai de {delai} s dépassé"}
+        except (RecursionError, KeyError, MemoryError) as e:
+            mesures[methode] = {"erreur": type(e).__name__}
+    return mesures
+
+def suite_greibach(taille, graine):
+    """
+    Construire la liste des grammaires de la comparaison des méthodes de Greibach : les exemples
+    du dépôt, la suite synthétique et des chaînes de coins gauches de profondeur croissante.
+
+    :param taille: 'petite', 'moyenne' ou 'grande'
+    :param graine: Graine commune des grammaires synthétiques
+    :return: Liste de couples (nom du cas, fonction sans argument qui construit la grammaire)
+    """
+    cas = [(chemin, lambda chemin=chemin: read_cfg_rules(chemin)) for chemin in EXEMPLES]
+    cas += [(nom, lambda parametres=parametres: grammaire_synthetique(**parametres)) for nom, parametres in suite(taille, graine)]
+    cas += [(f"chaine-{k}", lambda k=k: chaine_gauche(k)) for k in CHAINES[taille]]
+    return cas
+
+def suite(taille, graine):
+    """
+    Construire la liste des cas de la suite : chaque profil, pour chaque nombre de règles.
+
+    :param taille: 'petite', 'moyenne' ou 'grande'
+    :param graine: Graine commune des grammaires
+    :return: Liste de couples (nom du cas, paramètres de grammaire_synthetique)
+    """
+    cas = []
+    for profil, reglages in PROFILS.items():
+        for regles in TAILLES[taille]:
+            cas.append((f"{profil}-{regles}", {"graine": graine, "regles": regles, **reglages}))
+    return cas
+
+def version_code():
+    """
+    Retourner la version du code mesuré, pour pouvoir comparer les résultats entre commits.
+
+    :return: Identifiant du commit courant, ou None hors d'un dépôt git
+    """
+    try:
+        sortie = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return sortie.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def durees(resultats):
+    """
+    Extraire les durées d'un fichier de résultats.
+
+    :param resultats: Contenu d'un fichier produit par ce module
+    :return: Dictionnaire {(cas, partie, indice, étape): durée}
+    """
+    table = {}
+    for cas in resultats["cas"]:
+        for partie in PARTIES:
+            for indice, mesure in enumerate(cas.get(partie, [])):
+                if "duree" in mesure:
+                    table[(cas["cas"], partie, indice, mesure.get("etape", mesure.get("methode")))] = mesure["duree"]
+    return table
+
+def comparer(ancien, nouveau, seuil):
+    """
+    Comparer deux fichiers de résultats et afficher les mesures qui ont ralenti.
+
+    Les durées trop courtes pour être significatives (moins de 5 ms) sont ignorées.
+
+    :param ancien: Chemin du fichier de référence
+    :param nouveau: Chemin du nouveau fichier
+    :param seuil: Rapport nouveau / ancien au-delà duquel une mesure est une régression
+    :return: Nombre de régressions
+    """
+    with open(ancien, encoding='utf-8') as fichier:
+        avant = durees(json.load(fichier))
+    with open(nouveau, encoding='utf-8') as fichier:
+        apres = durees(json.load(fichier))
+    # Seuls les cas présents dans les deux fichiers sont comparés (voir l'option --cas)
+    communs = {cle[0] for cle in avant} & {cle[0] for cle in apres}
+    avant = {cle: duree for cle, duree in avant.items() if cle[0] in communs}
+    apres = {cle: duree for cle, duree in apres.items() if cle[0] in communs}
+    regressions = 0
+    for cle in sorted(avant.keys() & apres.keys()):
+        if max(avant[cle], apres[cle]) < 5e-3:
+            continue
+        rapport = apres[cle] / max(avant[cle], 1e-9)
+        if rapport > seuil:
+            regressions += 1
+            cas, partie, _, etape = cle
+            print(f"{cas:<22} {partie:<10} {etape:<30} {avant[cle]:>9.4f} s -> {apres[cle]:>9.4f} s  (x{rapport:.2f})")
+    for cle in sorted(avant.keys() - apres.keys()):
+        print(f"{cle[0]:<22} {cle[1]:<10} {cle[3]:<30} n'aboutit plus")
+        regressions += 1
+    print(f"{regressions} régression(s) au-delà de x{seuil}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(usage="python3 benchmark.py [options] | python3 benchmark.py --comparer ancien.json nouveau.json")
+    parser.add_argument("--taille", choices=list(TAILLES), default="petite", help="taille de la suite (par défaut : petite)")
+    parser.add_argument("--graine", type=int, default=0, help="graine des grammaires synthétiques")
+    parser.add_argument("--cas", help="n'exécuter que les cas dont le nom contient ce texte")
+    parser.add_argument("--longueur", type=int, default=4, help="longueur maximale des mots générés (par défaut : 4)")
+    parser.add_argument("--delai", type=float, default=10.0, help="délai maximal par mesure en secondes (0 : aucun)")
+    parser.add_argument("--repetitions", type=int, default=1, help="nombre d'exécutions chronométrées par cas")
+    parser.add_argument("--sans-memoire", action="store_true", help="ne pas mesurer le pic d'allocation")
+    parser.add_argument("--sortie", default="benchmark.json", help="fichier de résultats JSON (par défaut : benchmark.json)")
+    parser.add_argument("--comparer", nargs=2, metavar=("ANCIEN", "NOUVEAU"), help="comparer deux fichiers de résultats")
+    parser.add_argument("--seuil", type=float, default=1.5, help="rapport de durée signalé par --comparer (par défaut : 1.5)")
+    parser.add_argument("--greibach", action="store_true",
+                        help="comparer la taille et la durée des méthodes de conversion en forme de Greibach")
+    args = parser.parse_args()
+
+    if args.comparer:
+        sys.exit(1 if comparer(*args.comparer, args.seuil) else 0)
+
+    if args.greibach:
+        comparaison = {"version": version_code(), "python": platform.python_version(),
+                       "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "reglages": {"taille": args.taille, "graine": args.graine, "delai": args.delai}, "cas": []}
+        print(f"{'cas':<22} {'règles CNF':>10}  " + "  ".join(f"{m + ' (règles, symboles, s)':>40}" for m in METHODES_GREIBACH))
+        for nom, construire in suite_greibach(args.taille, args.graine):
+            if args.cas and args.cas not in nom:
+                continue
+            grammaire = construire()
+            if grammaire is None:
+                continue
+            mesures = comparer_methodes_greibach(grammaire, args.delai)
+            comparaison["cas"].append({"cas": nom, **mesures})
+            colonnes = [f"{m['regles']:>12} {m['symboles']:>14} {m['duree']:>12.4f}" if "erreur" not in m
+                        else f"{m['erreur']:>40}" for m in (mesures[methode] for methode in METHODES_GREIBACH)]
+            print(f"{nom:<22} {mesures['chomsky']['regles']:>10}  " + "  ".join(colonnes))
+        with open(args.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump(comparaison, fichier, indent=1, ensure_ascii=False)
+        print(f"Résultats écrits dans {args.sortie}")
+        sys.exit(0)
+
+    resultats = {
+        "version": version_code(),
+        "python": platform.python_version(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "reglages": {"taille": args.taille, "graine": args.graine, "longueur": args.longueur},
+        "cas": [],
+    }
+    for nom, parametres in suite(args.taille, args.graine):
+        if args.cas and args.cas not in nom:
+            continue
+        resultat = executer_cas(nom, parametres, args.longueur, args.delai, args.repetitions, not args.sans_memoire)
+        resultats["cas"].append(resultat)
+        total = sum(m.get("duree", 0.0) for partie in ("chomsky", "greibach") for m in resultat.get(partie, []))
+        erreurs = [m["erreur"] for partie in PARTIES for m in resultat.get(partie, []) if "erreur" in m]
+        sortie_gnf = resultat["greibach"][-1]["regles"] if "greibach" in resultat else "-"
+        print(f"{nom:<22} {total:>9.4f} s  GNF : {sortie_gnf} règles  {'; '.join(erreurs)}")
+
+    with open(args.sortie, 'w', encoding='utf-8') as fichier:
+        json.dump(resultats, fichier, indent=1, ensure_ascii=False)
+    print(f"Résultats écrits dans {args.sortie}")
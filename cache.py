@@ -0,0 +1,193 @@
+import os
+import sys
+import pickle
+import hashlib
+import tempfile
+import cfg as module_cfg
+import analyse
+import symboles
+import pipeline
+from cfg import CFG
+
+# Dossier du cache par défaut, relatif au répertoire courant
+DOSSIER_CACHE = ".cache_cfg"
+
+def _empreinte_code(*supplementaires):
+    """
+    Calculer l'empreinte du code des transformations (cfg.py, analyse.py, symboles.py, pipeline.py).
+
+    Toute modification de ces fichiers change les clés : une entrée produite par une autre
+    version des transformations n'est jamais relue.
+
+    :param supplementaires: Autres modules dont dépendent les entrées (par exemple le générateur de mots)
+    :return: Empreinte hexadécimale
+    """
+    empreinte = hashlib.sha256(str(module_cfg.VERSION_TRANSFORMATIONS).encode())
+    for module in (module_cfg, analyse, symboles, pipeline, *supplementaires):
+        with open(module.__file__, 'rb') as fichier:
+            empreinte.update(fichier.read())
+    return empreinte.hexdigest()
+
+class CacheGrammaires:
+    def __init__(self, dossier=DOSSIER_CACHE, taille_max=64 * 2**20):
+        """
+        Ouvrir un cache sur disque des grammaires normalisées, adressé par contenu.
+
+        Chaque entrée est un fichier <clé>.pickle, où la clé est une empreinte SHA-256 de la
+        forme canonique de la grammaire d'entrée et de la version des transformations. Les
+        grammaires sont stockées sous leur forme compacte (CFG.vers_compact). La date de
+        modification d'un fichier sert de date de dernier accès : quand la taille totale dépasse
+        taille_max, les entrées les moins récemment utilisées sont supprimées (LRU).
+
+        :param dossier: Dossier du cache (créé si nécessaire)
+        :param taille_max: Taille maximale du cache en octets
+        """
+        self.dossier = dossier
+        self.taille_max = taille_max
+        self.version = _empreinte_code()
+
+    @staticmethod
+    def forme_canonique(cfg):
+        """
+        Retourner la forme textuelle canonique d'une grammaire.
+
+        Les espaces et le découpage en lignes du fichier d'origine disparaissent, mais l'ordre des
+        règles est conservé : il détermine les noms des non-terminaux créés par les transformations.
+
+        :param cfg: L'objet CFG
+        :return: Chaîne de caractères, l'axiome en premier
+        """
+        lignes = [f"axiome:{cfg.nom(cfg.axiome) if cfg.axiome is not None else ''}"]
+        for nt, productions in cfg.productions.items():
+            lignes.append(f"{cfg.nom(nt)}:{'|'.join(cfg.nom_production(p) for p in productions)}")
+        return '\n'.join(lignes)
+
+    def cle(self, cfg, espace, version=None):
+        """
+        Calculer la clé d'une grammaire dans le cache.
+
+        :param cfg: L'objet CFG
+        :param espace: Nature de l'entrée ('normalisation', 'mots'...), pour séparer les usages
+        :param version: Empreinte du code qui produit l'entrée (par défaut, celle des transformations)
+        :return: Clé hexadécimale
+        """
+        empreinte = hashlib.sha256(f"{espace}\n{version or self.version}\n".encode())
+        empreinte.update(CacheGrammaires.forme_canonique(cfg).encode())
+        return empreinte.hexdigest()
+
+    def _chemin(self, cle):
+        """
+        :param cle: Clé de l'entrée
+        :return: Chemin du fichier de l'entrée
+        """
+        return os.path.join(self.dossier, cle + ".pickle")
+
+    def lire(self, cle):
+        """
+        Lire une entrée du cache et la marquer comme récemment utilisée.
+
+        :param cle: Clé de l'entrée
+        :return: Valeur stockée, ou None si elle est absente ou illisible
+        """
+        chemin = self._chemin(cle)
+        try:
+            with open(chemin, 'rb') as fichier:
+                valeur = pickle.load(fichier)
+            os.utime(chemin)  # Date de dernier accès pour l'éviction LRU
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, IndexError,
+                KeyError, ImportError, MemoryError):
+            return None  # Entrée corrompue ou supprimée entre-temps : recalculer
+        return valeur
+
+    def ecrire(self, cle, valeur):
+        """
+        Écrire une entrée du cache (de façon atomique), puis appliquer la limite de taille.
+
+        :param cle: Clé de l'entrée
+        :param valeur: Valeur sérialisable par pickle
+        """
+        os.makedirs(self.dossier, exist_ok=True)
+        descripteur, temporaire = tempfile.mkstemp(dir=self.dossier, suffix=".tmp")
+        try:
+            with os.fdopen(descripteur, 'wb') as fichier:
+                pickle.dump(valeur, fichier, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaire, self._chemin(cle))  # Un lecteur concurrent ne voit jamais un fichier partiel
+        except BaseException:
+            os.unlink(temporaire)
+            raise
+        self._evincer()
+
+    def _evincer(self):
+        """
+        Supprimer les entrées les moins récemment utilisées jusqu'à respecter taille_max.
+        """
+        entrees = []
+        for nom in os.listdir(self.dossier):
+            if not nom.endswith(".pickle"):
+                continue
+            try:
+                infos = os.stat(os.path.join(self.dossier, nom))
+            except FileNotFoundError:
+                continue  # Supprimée par un autre processus
+            entrees.append((infos.st_mtime, infos.st_size, nom))
+        total = sum(taille for _, taille, _ in entrees)
+        for _, taille, nom in sorted(entrees):
+            if total <= self.taille_max:
+                break
+            try:
+                os.remove(os.path.join(self.dossier, nom))
+            except FileNotFoundError:
+                pass
+            total -= taille
+
+    def normaliser(self, cfg, minimiser=False, methode="substitution"):
+        """
+        Calculer les formes normales de Chomsky et de Greibach d'une grammaire, via le cache.
+
+        :param cfg: L'objet CFG d'entrée (non modifié)
+        :param minimiser: Fusionner les non-terminaux équivalents (voir CFG.minimiser)
+        :param methode: Méthode de conversion en forme de Greibach (voir CFG.greibach)
+        :return: Triplet (forme de Chomsky, forme de Greibach, True si le résultat venait du cache)
+        """
+        espace = 'normalisation minimisée' if minimiser else 'normalisation'
+        if methode != "substitution":
+            espace += f' {methode}'
+        cle = self.cle(cfg, espace)
+        entree = self.lire(cle)
+        if entree is not None:
+            try:
+                return CFG.depuis_compact(entree['chomsky']), CFG.depuis_compact(entree['greibach']), True
+            except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+                pass  # Entrée lisible mais mal formée : recalculer (elle sera remplacée)
+
+        chomsky, greibach = pipeline.Pipeline(cfg).calculer(*pipeline.etapes_normalisation(minimiser, methode))
+        self.ecrire(cle, {'chomsky': chomsky.vers_compact(), 'greibach': greibach.vers_compact()})
+        return chomsky, greibach, False
+
+    def mots_par_longueur(self, generateur, max_length, poids_vide=0):
+        """
+        Retourner les tables de mots par longueur d'un générateur, via le cache.
+
+        Une entrée calculée pour une longueur L sert aussi pour toute longueur inférieure. Les
+        tables sont produites par le générateur : la clé dépend aussi du code de son module.
+
+        :param generateur: Le WordGenerator
+        :param max_length: Longueur maximale des mots
+        :param poids_vide: Longueur comptée pour chaque production vide (voir WordGenerator.mots_par_longueur)
+        :return: Liste indexée par la longueur, chaque case contenant l'ensemble des mots
+        """
+        # generer.py importe ce module : son code est retrouvé par la classe du générateur
+        version = _empreinte_code(sys.modules[type(generateur).__module__])
+        cle = self.cle(generateur.cfg, 'mots' if not poids_vide else f'mots poids_vide={poids_vide}', version)
+        entree = self.lire(cle)
+        try:
+            if entree is not None and len(entree) > max_length:
+                return [set(mots) for mots in entree[:max_length + 1]]
+        except (KeyError, TypeError, ValueError, IndexError, AttributeError):
+            pass  # Entrée lisible mais mal formée : recalculer (elle sera remplacée)
+
+        tables = generateur.mots_par_longueur(max_length, poids_vide)
+        self.ecrire(cle, [sorted(mots) for mots in tables])
+        return tables
@@ -1,17 +1,52 @@
 import string
 import re
+from itertools import product, chain
+from symboles import TableSymboles
+from analyse import AnalyseGrammaire, composantes_fortement_connexes
+from instrumentation import etape
+
+# Méthodes de CFG.greibach() : développement par substitution, ou transformation du coin gauche
+METHODES_GREIBACH = ("substitution", "coin_gauche")
+
+# Lettres utilisables pour nommer un non-terminal ('E' est réservé à la chaîne vide)
+LETTRES_NON_TERMINAUX = [letter for letter in string.ascii_uppercase if letter != 'E']
+
+# Version des transformations, à incrémenter quand le résultat de chomsky() ou greibach() change
+# (elle fait partie des clés du cache des grammaires normalisées, voir cache.py)
+VERSION_TRANSFORMATIONS = 1
+
+class Regle:
+    """
+    Une règle de production A -> α sous forme compacte : un identifiant de non-terminal
+    et un tuple d'identifiants de symboles.
+    """
+    __slots__ = ('gauche', 'droite')
+
+    def __init__(self, gauche, droite):
+        self.gauche = gauche  # Identifiant du non-terminal de gauche
+        self.droite = droite  # Tuple d'identifiants, () pour la chaîne vide
 
 class CFG:
     def __init__(self, axiome=None):
         """
         Initialiser un format CFG, contenant l'ensemble des non-terminaux, l'ensemble des terminaux, le symbole de départ et les règles de production.
 
+        Les symboles sont internés dans une table (voir symboles.TableSymboles) : les structures
+        ci-dessous ne contiennent que des identifiants entiers, la forme textuelle n'étant
+        reconstruite qu'à la lecture et à l'écriture.
+
         :param axiome: Le symbole de départ, par défaut 'S'
         """
-        self.non_terminals = set()  # Ensemble des non-terminaux
-        self.terminals = set()  # Ensemble des terminaux
-        self.productions = {}  # Règles de production, format {non-terminal: [liste de productions]}
-        self.axiome = axiome  # Symbole de départ
+        self.symboles = TableSymboles()  # Table d'internement nom <-> identifiant
+        self.non_terminals = set()  # Ensemble des non-terminaux (identifiants)
+        self.terminals = set()  # Ensemble des terminaux (identifiants)
+        self.productions = {}  # Règles de production, format {non-terminal: [liste de tuples de symboles]}
+        self.axiome = None  # Symbole de départ (identifiant)
+        self.prochain_non_terminal = 0  # Tous les noms d'indice inférieur sont déjà utilisés
+        self.observateurs = []  # Observateurs des étapes de transformation (voir instrumentation.py)
+        self.listes_partagees = set()  # Non-terminaux dont la liste de règles est partagée (voir derivee)
+        if axiome is not None:
+            self.add_axiome(axiome)
 
     def add_production(self, non_terminal, production_list):
         """
@@ -20,24 +55,48 @@ class CFG:
         :param non_terminal: Non-terminal
         :param production_list: Liste des productions (list de str)
         """
-        if not self.axiome:  # Si axiome n'est pas encore défini, définir le premier non-terminal ajouté comme axiome
+        if self.axiome is None:  # Si axiome n'est pas encore défini, définir le premier non-terminal ajouté comme axiome
             self.add_axiome(non_terminal)
 
-        if non_terminal not in self.non_terminals:
-            self.non_terminals.add(non_terminal)
-
-        if non_terminal in self.productions:
-            self.productions[non_terminal].extend(production_list)
-        else:
-            self.productions[non_terminal] = production_list
+        nt = self.symboles.non_terminal(non_terminal)
 
-        # Mettre à jour les ensembles des terminaux et des non-terminaux
+        # Découper chaque production une seule fois et la convertir en tuple d'identifiants
+        productions = []
         for production in production_list:
-            for char in production:
-                if char.islower():  # Les lettres minuscules sont des terminaux
-                    self.terminals.add(char)
-                elif CFG.is_valid_non_terminal(char):  # Les lettres majuscules (sauf 'E') sont des non-terminaux
-                    self.non_terminals.add(char)
+            symbols = []
+            for symbol in CFG.split_production(production):
+                if symbol == 'E':  # La chaîne vide ne contribue aucun symbole
+                    continue
+                if symbol.islower():  # Les lettres minuscules sont des terminaux
+                    symbols.append(self.symboles.terminal(symbol))
+                else:
+                    symbols.append(self.symboles.non_terminal(symbol))
+            productions.append(tuple(symbols))
+        self.ajouter_productions(nt, productions)
+
+    def ajouter_productions(self, nt, productions):
+        """
+        Ajouter des règles déjà converties en identifiants, sans analyser de texte.
+
+        Les non-terminaux des parties droites sont ajoutés à non_terminals même s'ils n'ont pas
+        (encore) de règles : l'ensemble reste celui des non-terminaux internés par la grammaire.
+
+        :param nt: Identifiant du non-terminal de gauche (le premier ajouté devient l'axiome)
+        :param productions: Liste de tuples d'identifiants internés dans self.symboles
+        """
+        if self.axiome is None:
+            self.axiome = nt
+        self.non_terminals.add(nt)
+        for production in productions:
+            for symbol in production:
+                (self.terminals if symbol < 0 else self.non_terminals).add(symbol)
+        if nt in self.listes_partagees:  # Copie à l'écriture : l'autre grammaire garde sa liste
+            self.productions[nt] = self.productions[nt] + list(productions)
+            self.listes_partagees.discard(nt)
+        elif nt in self.productions:
+            self.productions[nt].extend(productions)
+        else:
+            self.productions[nt] = list(productions)
 
     def add_axiome(self, non_terminal):
         """
@@ -45,10 +104,10 @@ class CFG:
 
         :param non_terminal: Le non-terminal à définir comme axiome
         """
-        if self.axiome is None:  
-            self.axiome = non_terminal
+        if self.axiome is None:
+            self.axiome = self.symboles.non_terminal(non_terminal)
         else:
-            raise ValueError(f"L'axiome est déjà défini comme '{self.axiome}'.")
+            raise ValueError(f"L'axiome est déjà défini comme '{self.nom(self.axiome)}'.")
 
     def add_production_avec_validation(self, non_terminal, production_list):
         if not CFG.is_valid_non_terminal(non_terminal):
@@ -60,16 +119,110 @@ class CFG:
 
         self.add_production(non_terminal, production_list)
 
+    def nom(self, symbole):
+        """
+        Retourner le nom d'un symbole interné.
+
+        :param symbole: Identifiant du symbole
+        :return: Nom du symbole
+        """
+        return self.symboles.nom(symbole)
+
+    def nom_production(self, production):
+        """
+        Retourner la forme textuelle d'une production.
+
+        :param production: Tuple d'identifiants
+        :return: Chaîne de caractères ('E' pour la production vide)
+        """
+        return self.symboles.nom_production(production)
+
+    def liste_regles(self):
+        """
+        Retourner toutes les règles de production sous forme d'objets Regle.
+
+        :return: Liste de Regle, dans l'ordre des non-terminaux puis des productions
+        """
+        return [Regle(nt, prod) for nt, prods in self.productions.items() for prod in prods]
+
+    def taille(self):
+        """
+        Mesurer la taille de la grammaire.
+
+        :return: Tuple (nombre de non-terminaux, nombre de règles, nombre total de symboles en partie droite)
+        """
+        regles = sum(len(prods) for prods in self.productions.values())
+        symboles = sum(len(prod) for prods in self.productions.values() for prod in prods)
+        return len(self.productions), regles, symboles
+
+    def vers_compact(self):
+        """
+        Retourner une forme compacte de la grammaire, faite uniquement de listes, de tuples et
+        d'entiers, peu coûteuse à sérialiser (pickle) pour l'envoyer à un autre processus.
+
+        :return: Tuple (noms des non-terminaux, noms des terminaux, axiome, non-terminaux, productions)
+        """
+        return (
+            list(self.symboles.noms_non_terminaux),
+            list(self.symboles.noms_terminaux),
+            self.axiome,
+            sorted(self.non_terminals),
+            [(nt, list(prods)) for nt, prods in self.productions.items()],  # Copie : indépendante des passes suivantes
+        )
+
+    def derivee(self):
+        """
+        Retourner une nouvelle grammaire qui partage les listes de règles de celle-ci.
+
+        Les passes ne modifient jamais une liste de règles en place : elles la remplacent. Seul
+        ajouter_productions allonge une liste, et il la copie d'abord si elle est partagée
+        (copie à l'écriture). Une dérivée coûte donc une copie du dictionnaire des règles et des
+        ensembles de symboles, pas des règles elles-mêmes. La table des symboles, qui ne fait que
+        grandir, est commune aux deux grammaires.
+
+        :return: Nouvel objet CFG, avec les mêmes identifiants de symboles et les mêmes observateurs
+        """
+        grammaire = CFG()
+        grammaire.symboles = self.symboles
+        grammaire.non_terminals = set(self.non_terminals)
+        grammaire.terminals = set(self.terminals)
+        grammaire.productions = dict(self.productions)
+        grammaire.axiome = self.axiome
+        grammaire.prochain_non_terminal = self.prochain_non_terminal
+        grammaire.observateurs = list(self.observateurs)
+        grammaire.listes_partagees = set(self.productions)
+        self.listes_partagees.update(self.productions)
+        return grammaire
+
+    @classmethod
+    def depuis_compact(cls, etat):
+        """
+        Reconstruire une grammaire à partir de sa forme compacte, sans réanalyser de texte.
+
+        :param etat: Tuple produit par vers_compact()
+        :return: Nouvel objet CFG, avec les mêmes identifiants de symboles
+        """
+        noms_non_terminaux, noms_terminaux, axiome, non_terminals, productions = etat
+        grammaire = cls()
+        for nom in noms_non_terminaux:
+            grammaire.symboles.non_terminal(nom)
+        for nom in noms_terminaux:
+            grammaire.terminals.add(grammaire.symboles.terminal(nom))
+        grammaire.axiome = axiome
+        grammaire.non_terminals = set(non_terminals)
+        grammaire.productions = {nt: list(prods) for nt, prods in productions}
+        return grammaire
+
     def display(self):
         """
         Afficher l'ensemble des non-terminaux, des terminaux, du symbole de départ et des règles de production du CFG.
         """
-        print("Ensemble des non-terminaux:", self.non_terminals)
-        print("Ensemble des terminaux:", self.terminals)
-        print("Symbole de départ:", self.axiome)
+        print("Ensemble des non-terminaux:", {self.nom(nt) for nt in self.non_terminals})
+        print("Ensemble des terminaux:", {self.nom(t) for t in self.terminals})
+        print("Symbole de départ:", self.nom(self.axiome))
         print("Règles de production:")
         for non_terminal, productions in self.productions.items():
-            print(f"  {non_terminal} -> {' | '.join(productions)}")
+            print(f"  {self.nom(non_terminal)} -> {' | '.join(self.nom_production(p) for p in productions)}")
 
     @staticmethod
     def is_valid_non_terminal(symbol):
@@ -79,7 +232,7 @@ class CFG:
         :param symbol: Symbole
         :return: Booléen
         """
-        pattern = r'^[A-DF-Z][0-9]$'
+        pattern = r'^[A-DF-Z][0-9]+$'  # Une lettre suivie d'un numéro quelconque (A0, B12, Z345)
         return bool(re.match(pattern, symbol))
 
     @staticmethod
@@ -91,7 +244,7 @@ class CFG:
         :return: Booléen
         """
         return len(symbol) == 1 and symbol.islower()
-    
+
 
     @staticmethod
     def split_production(production):
@@ -101,7 +254,7 @@ class CFG:
         :param production: Production à découper
         :return: Liste des symboles
         """
-        pattern = r'[A-DF-Z][0-9]|[a-z]|E'  # Non-terminaux (A1, S0), terminaux (a-z), ou vide (E)
+        pattern = r'[A-DF-Z][0-9]+|[a-z]|E'  # Non-terminaux (A1, S0, B12), terminaux (a-z), ou vide (E)
         matches = re.findall(pattern, production)
         return matches
 
@@ -127,10 +280,16 @@ class CFG:
             for c in symbols
         )
 
-    def chomsky(self):
+    @etape
+    def chomsky(self, minimiser=False):
         """
         Convertir le CFG(grammaire algébrique) en forme normale de Chomsky.
+
+        :param minimiser: Fusionner ensuite les non-terminaux équivalents (voir minimiser)
         """
+        # Étape 0 : Retirer les symboles inutiles pour alléger les étapes suivantes
+        self.supprimer_unused_non_terminal()
+
         # Étape 1 : Extraire les terminaux dans des productions séparées
         self.extraire_terminaux_regles()
         # self.display()
@@ -151,10 +310,35 @@ class CFG:
         self.supprimer_unused_non_terminal()
         # self.display()
 
-    def greibach(self):
+        # Étape 6 (optionnelle) : Fusionner les non-terminaux équivalents
+        if minimiser:
+            self.minimiser()
+
+    @etape
+    def greibach(self, minimiser=False, methode="substitution"):
         """
         Convertir le CFG en forme normale de Greibach.
-        """
+
+        :param minimiser: Fusionner ensuite les non-terminaux équivalents (voir minimiser)
+        :param methode: "substitution" (élimination de la récursion à gauche puis développement des
+                        non-terminaux de tête) ou "coin_gauche" (voir greibach_coin_gauche, taille polynomiale)
+        :raises ValueError: Si la méthode est inconnue
+        """
+        if methode not in METHODES_GREIBACH:
+            raise ValueError(f"Méthode inconnue : '{methode}' (méthodes : {', '.join(METHODES_GREIBACH)})")
+        if methode == "coin_gauche":
+            if not self.est_forme_chomsky():
+                self.chomsky()
+            self.greibach_coin_gauche()
+            self.supprimer_unused_non_terminal()
+            if minimiser:
+                self.minimiser()
+            return
+
+        # Étape 0 : Retirer les symboles inutiles, dont les non-terminaux référencés sans règle
+        # (sans effet sur une forme de Chomsky, déjà nettoyée par chomsky())
+        self.supprimer_unused_non_terminal()
+
         # Étape 1 : Éliminer la récursion à gauche
         self.eliminer_left_recursion()
 
@@ -168,72 +352,84 @@ class CFG:
         # Étape 4 : Nettoyer les non-terminaux inutilisés
         self.supprimer_unused_non_terminal()
 
+        # Étape 5 (optionnelle) : Fusionner les non-terminaux équivalents
+        if minimiser:
+            self.minimiser()
+
+    @etape
     def eliminer_epsilon_regles(self):
         """
         Éliminer les productions epsilon (règles nullables) tout en gardant certaines règles spécifiées comme S0->E.
         """
         # Trouver tous les non-terminaux qui peuvent générer la chaîne vide
-        nullable = {nt for nt, productions in self.productions.items() if 'E' in productions}
-
-        while True:
-            new_nullable = nullable.copy()
-            for nt, productions in self.productions.items():
-                for prod in productions:
-                    symbols = CFG.split_production(prod)
-                    if all(symbol in nullable for symbol in symbols):  # Si la partie droite est entièrement nullable
-                        new_nullable.add(nt)
-            if new_nullable == nullable:
-                break
-            nullable = new_nullable
+        nullable = AnalyseGrammaire(self).nullables()
 
         # Mettre à jour les règles, supprimer les productions epsilon et ajouter toutes les combinaisons possibles non-nulles
         for nt in list(self.productions.keys()):
-            new_productions = set()
+            new_productions = {}  # Dictionnaire utilisé comme ensemble ordonné
             for prod in self.productions[nt]:
-                if prod == 'E' and nt == self.axiome:
-                    new_productions.add('E')  # Conserver S0 -> E si S0 est l'axiome
-                    continue
-                if prod == 'E':
+                if not prod:
+                    if nt == self.axiome:
+                        new_productions[()] = None  # Conserver S0 -> E si S0 est l'axiome
                     continue  # Supprimer les autres chaînes vides
 
-                symbols = CFG.split_production(prod)
                 options = [
-                    [symbol, ''] if symbol in nullable else [symbol]
-                    for symbol in symbols
+                    (symbol, None) if symbol in nullable else (symbol,)
+                    for symbol in prod
                 ]
-                from itertools import product
                 for option in product(*options):
-                    new_prod = ''.join(option)
+                    new_prod = tuple(symbol for symbol in option if symbol is not None)
                     if new_prod:  # Ajouter uniquement les combinaisons non-nulles
-                        new_productions.add(new_prod)
+                        new_productions[new_prod] = None
             self.productions[nt] = list(new_productions)
 
-        if 'E' not in self.productions[self.axiome] and self.axiome in nullable:
-            self.productions[self.axiome].append('E')
+        if self.axiome in nullable and () not in self.productions[self.axiome]:
+            self.productions[self.axiome] = self.productions[self.axiome] + [()]
 
+    @etape
     def eliminer_unit_regles(self):
         """
         Éliminer les productions unitaires (unit rules).
-        """
-        for nt in list(self.productions.keys()):
-            # Identifier les productions unitaires
-            unit_productions = [p for p in self.productions[nt] 
-                                if len(CFG.split_production(p)) == 1 and p in self.non_terminals]
 
-            # Tant qu'il existe des productions unitaires
-            while unit_productions:
-                unit = unit_productions.pop()
-
-                # Supprimer la règle unitaire
-                self.productions[nt].remove(unit)
-
-                # Ajouter les règles de production du non-terminal cible, sans doublons
-                for prod in self.productions[unit]:
-                    if prod not in self.productions[nt]:
-                        self.productions[nt].append(prod)
-                        if len(CFG.split_production(prod)) == 1 and prod in self.non_terminals:
-                            unit_productions.append(prod)
+        On construit le graphe unitaire (A -> B pour chaque règle A -> B), on le condense en
+        composantes fortement connexes (les cycles A -> B -> A partagent les mêmes règles), puis
+        on propage les ensembles de règles non unitaires dans l'ordre topologique inverse :
+        chaque composante n'est calculée qu'une seule fois, quel que soit le nombre de
+        non-terminaux qui l'atteignent.
+        """
+        non_unitaires = {}  # {non-terminal: productions non unitaires, dans l'ordre}
+        unitaires = {}  # {non-terminal: cibles des productions unitaires}
+        for nt, productions in self.productions.items():
+            non_unitaires[nt] = [p for p in productions if len(p) != 1 or p[0] not in self.non_terminals]
+            unitaires[nt] = list(dict.fromkeys(p[0] for p in productions if len(p) == 1 and p[0] in self.non_terminals))
+
+        position = {nt: i for i, nt in enumerate(self.productions)}
+        composantes = composantes_fortement_connexes(list(self.productions), lambda nt: unitaires.get(nt, []))
+
+        # Les composantes arrivent puits d'abord : celles atteintes sont déjà fermées
+        composante_de = {}
+        fermetures = []  # Pour chaque composante, ses productions non unitaires accessibles
+        for numero, composante in enumerate(composantes):
+            composante.sort(key=lambda nt: position.get(nt, len(position)))
+            for nt in composante:
+                composante_de[nt] = numero
+
+            fermeture = {}  # Dictionnaire utilisé comme ensemble ordonné
+            for nt in composante:
+                fermeture.update(dict.fromkeys(non_unitaires.get(nt, [])))
+            for nt in composante:
+                for cible in unitaires.get(nt, []):
+                    if composante_de[cible] != numero:
+                        fermeture.update(dict.fromkeys(fermetures[composante_de[cible]]))
+            fermetures.append(list(fermeture))
+
+        # Chaque non-terminal garde ses propres productions en tête, puis hérite du reste
+        for nt in self.productions:
+            new_productions = dict.fromkeys(non_unitaires[nt])
+            new_productions.update(dict.fromkeys(fermetures[composante_de[nt]]))
+            self.productions[nt] = list(new_productions)
 
+    @etape
     def eliminer_long_regles(self):
         """
         Éliminer les productions dont la partie droite a une longueur supérieure à 2.
@@ -242,24 +438,20 @@ class CFG:
 
         for nt in list(self.productions.keys()):
             new_productions = []
-            for prod in self.productions[nt]:
-                # Découper la production en une liste de symboles
-                symbols = CFG.split_production(prod)
-
+            for symbols in self.productions[nt]:
                 # Tant que la production contient plus de 2 symboles
                 while len(symbols) > 2:
                     # Générer un nouveau non-terminal
                     new_nt = self.generer_new_non_terminal()
-                    self.non_terminals.add(new_nt)
 
                     # Créer une règle pour les 2 premiers symboles
-                    new_rules[new_nt] = [''.join(symbols[:2])]
+                    new_rules[new_nt] = [symbols[:2]]
 
                     # Réduire la production à partir du nouveau non-terminal
-                    symbols = [new_nt] + symbols[2:]
+                    symbols = (new_nt,) + symbols[2:]
 
                 # Ajouter la production réduite
-                new_productions.append(''.join(symbols))
+                new_productions.append(symbols)
 
             # Mettre à jour les productions pour le non-terminal actuel
             self.productions[nt] = new_productions
@@ -267,6 +459,7 @@ class CFG:
         # Ajouter les nouvelles règles générées
         self.productions.update(new_rules)
 
+    @etape
     def extraire_terminaux_regles(self):
         """
         Extraire les terminaux dans des productions séparées.
@@ -275,119 +468,347 @@ class CFG:
         for nt in list(self.productions.keys()):
             new_productions = []
             for prod in self.productions[nt]:
-                # Découper la production en une liste de symboles
-                symbols = CFG.split_production(prod)
-
                 # Si la production ne contient que des non-terminaux ou est de longueur 1, ne pas la modifier
-                if len(symbols) == 1 or all(CFG.is_valid_non_terminal(c) for c in symbols):
+                if len(prod) <= 1 or all(symbol >= 0 for symbol in prod):
                     new_productions.append(prod)
                 else:
                     new_prod = []
-                    for c in symbols:
-                        if c.islower():  # Si c'est un terminal
+                    for c in prod:
+                        if c < 0:  # Si c'est un terminal
                             if c not in mapping:
                                 # Générer un nouveau non-terminal pour le terminal
                                 new_nt = self.generer_new_non_terminal()
-                                self.non_terminals.add(new_nt)
-                                self.productions[new_nt] = [c]
+                                self.productions[new_nt] = [(c,)]
                                 mapping[c] = new_nt
                             new_prod.append(mapping[c])  # Remplacer le terminal par le nouveau non-terminal
                         else:
                             new_prod.append(c)  # Conserver les non-terminaux
-                    new_productions.append(''.join(new_prod))  # Reconstruire la production
+                    new_productions.append(tuple(new_prod))  # Reconstruire la production
             self.productions[nt] = new_productions
 
     def generer_new_non_terminal(self):
         """
         Générer un nouveau non-terminal.
-        """
-        for number in range(0, 10):
-            for letter in string.ascii_uppercase:
-                if letter != 'E':
-                    new_nt = f"{letter}{number}"
-                    if new_nt not in self.non_terminals:
-                        self.non_terminals.add(new_nt)
-                        return new_nt
 
+        Les noms sont énumérés dans l'ordre A0, B0, ..., Z0, A1, ..., Z9, A10, ... (sans E) :
+        le nom d'indice k est la lettre k % 25 suivie du numéro k // 25, il n'y a donc pas de limite.
+        Seuls les noms absents de la table des symboles sont attribués : un nom déjà interné, même
+        hors de non_terminals, peut encore désigner un autre symbole. Un compteur mémorise le
+        premier indice qui peut être libre, ce qui rend l'allocation O(1) amortie au lieu de
+        reparcourir tous les noms à chaque appel.
+
+        :return: Identifiant du nouveau non-terminal
+        """
+        while True:
+            index = self.prochain_non_terminal
+            self.prochain_non_terminal += 1
+            new_nt = f"{LETTRES_NON_TERMINAUX[index % 25]}{index // 25}"
+            if new_nt not in self.symboles.ids:  # Un nom interné peut être référencé sans être défini
+                symbole = self.symboles.non_terminal(new_nt)
+                self.non_terminals.add(symbole)
+                return symbole
+
+    @etape
     def eliminer_left_recursion(self):
         """
         Éliminer la récursion directe et indirecte à gauche.
-        """
-        non_terminals = list(self.non_terminals)
-        for i in range(len(non_terminals)):
-            nt_i = non_terminals[i]
 
-            # Remplacer la récursion indirecte à gauche
-            for j in range(i):
-                nt_j = non_terminals[j]
-                updated_productions = []
+        Seuls les non-terminaux récursifs à gauche sont traités : on calcule le graphe des coins
+        gauches (A -> B si une production de A commence par B) et ses composantes fortement
+        connexes. Une récursion à gauche ne peut passer que par un cycle, donc les substitutions
+        sont limitées aux membres d'une même composante cyclique, les autres non-terminaux
+        restent intacts. Dans chaque composante, l'ordre de traitement est déterministe
+        (voir ordre_recursion_gauche).
+        """
+        coins = AnalyseGrammaire(self).coins_gauches()
+        composantes = composantes_fortement_connexes(sorted(self.productions), lambda nt: coins.get(nt, []))
+        for composante in composantes:
+            if len(composante) == 1 and composante[0] not in coins.get(composante[0], ()):
+                continue  # Pas de cycle : le non-terminal n'est pas récursif à gauche
+
+            ordre = self.ordre_recursion_gauche(composante, coins)
+            for i, nt_i in enumerate(ordre):
+                # Remplacer la récursion indirecte à gauche par les membres déjà traités
+                for nt_j in ordre[:i]:
+                    updated_productions = []
+                    for prod in self.productions[nt_i]:
+                        if prod and prod[0] == nt_j:  # Si le premier symbole est nt_j
+                            suffix = prod[1:]
+                            for beta in self.productions[nt_j]:
+                                updated_productions.append(beta + suffix)
+                        else:
+                            updated_productions.append(prod)
+                    self.productions[nt_i] = updated_productions
+
+                # Éliminer la récursion directe à gauche
+                alpha_productions = []
+                beta_productions = []
                 for prod in self.productions[nt_i]:
-                    # Découper la production en symboles
-                    symbols = CFG.split_production(prod)
-                    if symbols[0] == nt_j:  # Si le premier symbole est nt_j
-                        for beta in self.productions[nt_j]:
-                            updated_productions.append(beta + ''.join(symbols[1:]))
+                    if prod and prod[0] == nt_i:  # Si le premier symbole est nt_i
+                        alpha_productions.append(prod[1:])
                     else:
-                        updated_productions.append(prod)
-                self.productions[nt_i] = updated_productions
-
-            # Éliminer la récursion directe à gauche
-            alpha_productions = []
-            beta_productions = []
-            for prod in self.productions[nt_i]:
-                # Découper la production en symboles
-                symbols = CFG.split_production(prod)
-                if symbols[0] == nt_i:  # Si le premier symbole est nt_i
-                    alpha_productions.append(''.join(symbols[1:]))
-                else:
-                    beta_productions.append(prod)
-
-            if alpha_productions:
-                # Générer un nouveau non-terminal
-                new_nt = self.generer_new_non_terminal()
-                self.non_terminals.add(new_nt)
-                # Alpha productions : alpha + nouveau non-terminal
-                self.productions[new_nt] = [alpha + new_nt for alpha in alpha_productions] + ['E']
-                # Beta productions : beta + nouveau non-terminal
-                self.productions[nt_i] = [beta + new_nt for beta in beta_productions]
+                        beta_productions.append(prod)
 
+                if alpha_productions:
+                    # Générer un nouveau non-terminal
+                    new_nt = self.generer_new_non_terminal()
+                    # Alpha productions : alpha + nouveau non-terminal
+                    self.productions[new_nt] = [alpha + (new_nt,) for alpha in alpha_productions] + [()]
+                    # Beta productions : beta + nouveau non-terminal
+                    self.productions[nt_i] = [beta + (new_nt,) for beta in beta_productions]
+
+    @etape
+    def minimiser(self):
+        """
+        Fusionner les non-terminaux équivalents et supprimer les productions en double.
+
+        Deux non-terminaux sont équivalents s'ils ont le même ensemble de productions une fois
+        chaque non-terminal remplacé par le représentant de sa classe. Les composantes fortement
+        connexes du graphe des dépendances sont traitées dans l'ordre topologique inverse, si
+        bien que les symboles d'une production hors de la composante sont déjà canoniques :
+        - un non-terminal non récursif est retrouvé par sa signature (ensemble de ses
+          productions renommées) dans une table de hachage commune à toute la grammaire ;
+        - dans une composante cyclique, les classes sont obtenues par raffinement de partition :
+          on part d'une classe unique et on regroupe à chaque tour les membres par signature,
+          jusqu'à ce que le nombre de classes ne change plus (A -> aA | b et B -> aB | b sont
+          ainsi fusionnés).
+        Le langage engendré est inchangé, ainsi que la forme (Chomsky ou Greibach) des
+        productions ; seul le nombre de dérivations d'un mot peut diminuer.
+        """
+        successeurs = {nt: [s for s in dict.fromkeys(chain.from_iterable(prods)) if s >= 0]
+                       for nt, prods in self.productions.items()}
+        composantes = composantes_fortement_connexes(list(self.productions), lambda nt: successeurs.get(nt, []))
+        decalage = max(max(self.non_terminals, default=0), max(self.productions, default=0)) + 1
+        renommage = {}  # Non-terminal fusionné -> représentant de sa classe
+        representants = {}  # Signature d'un non-terminal non récursif -> représentant
+
+        def signature(nt, canonique):
+            """
+            :param canonique: Dictionnaire des symboles à remplacer (les autres sont conservés)
+            :return: Ensemble des productions de nt, renommées
+            """
+            return frozenset(tuple(map(canonique.get, prod, prod)) for prod in self.productions.get(nt, []))
+
+        for composante in composantes:
+            if len(composante) == 1 and composante[0] not in successeurs.get(composante[0], []):
+                nt = composante[0]
+                representant = representants.setdefault(signature(nt, renommage), nt)
+                if representant != nt:
+                    renommage[nt] = representant
+                continue
+
+            # Pendant le raffinement, les membres de la composante sont provisoirement renommés en
+            # decalage + le numéro de leur classe
+            renommage.update(dict.fromkeys(composante, decalage))
+            classe = dict.fromkeys(composante, 0)
+            nombre = 1
+            while True:
+                numeros = {}  # Signature -> numéro de la nouvelle classe
+                classe = {nt: numeros.setdefault(signature(nt, renommage), len(numeros)) for nt in composante}
+                if len(numeros) == nombre:
+                    break
+                nombre = len(numeros)
+                renommage.update((nt, decalage + numero) for nt, numero in classe.items())
+            premiers = {}  # Classe -> premier membre rencontré
+            for nt in composante:
+                del renommage[nt]
+                representant = premiers.setdefault(classe[nt], nt)
+                if representant != nt:
+                    renommage[nt] = representant
+
+        # L'axiome représente toujours sa classe
+        if self.axiome in renommage:
+            ancien = renommage.pop(self.axiome)
+            renommage = {nt: self.axiome if r == ancien else r for nt, r in renommage.items()}
+            renommage[ancien] = self.axiome
+
+        self.productions = {
+            nt: list(dict.fromkeys([tuple(map(renommage.get, prod, prod)) for prod in prods] if renommage else prods))
+            for nt, prods in self.productions.items() if nt not in renommage
+        }
+        self.non_terminals.difference_update(renommage)
+
+    def ordre_recursion_gauche(self, composante, coins):
+        """
+        Choisir l'ordre de traitement des non-terminaux d'une composante récursive à gauche.
+
+        Les productions d'un membre déjà traité sont recopiées dans chaque membre suivant qui
+        commence par lui : on place donc d'abord les membres qui ont le moins de productions,
+        puis ceux qui sont le moins souvent coin gauche dans la composante (ordre d'internement
+        en cas d'égalité).
+
+        :param composante: Liste des non-terminaux de la composante
+        :param coins: Relation des coins gauches (voir AnalyseGrammaire.coins_gauches)
+        :return: Liste ordonnée des non-terminaux
+        """
+        membres = set(composante)
+        entrants = {nt: 0 for nt in composante}
+        for nt in composante:
+            for cible in coins[nt]:
+                if cible in membres:
+                    entrants[cible] += 1
+        return sorted(composante, key=lambda nt: (len(self.productions[nt]), entrants[nt], nt))
+
+    @etape
     def assurer_terminal_premier(self):
         """
         Assurer que toutes les productions commencent par un terminal.
-        
+
         :raises KeyError: Si un non-terminal référencé dans une production n'a pas de règles définies.
         """
         for nt in list(self.productions.keys()):
-            updated_productions = set()  # Ensemble pour stocker les nouvelles productions mises à jour
+            updated_productions = {}  # Ensemble ordonné pour stocker les nouvelles productions mises à jour
             for prod in self.productions[nt]:
-                symbols = CFG.split_production(prod)  # Découper la production en symboles
-                if symbols[0] == 'E':  # Ignorer la chaîne vide sauf si c'est pour l'axiome
+                if not prod:  # Ignorer la chaîne vide sauf si c'est pour l'axiome
                     if nt == self.axiome:
-                        updated_productions.add('E')
+                        updated_productions[()] = None
                     continue
 
-                if symbols[0].islower():  # Si la production commence par un terminal, elle est déjà valide
-                    updated_productions.add(prod)
+                if prod[0] < 0:  # Si la production commence par un terminal, elle est déjà valide
+                    updated_productions[prod] = None
                 else:  # La production commence par un non-terminal
-                    prefix = symbols[0]
-                    suffix = ''.join(symbols[1:])
+                    prefix = prod[0]
+                    suffix = prod[1:]
                     if prefix not in self.productions:
-                        raise KeyError(f"Le non-terminal '{prefix}' n'a pas de production définie.")
+                        raise KeyError(f"Le non-terminal '{self.nom(prefix)}' n'a pas de production définie.")
                     for replacement in self.productions[prefix]:
-                        replacement_symbols = CFG.split_production(replacement)
-                        if replacement_symbols[0].islower():
-                            updated_productions.add(replacement + suffix)
+                        if replacement and replacement[0] < 0:
+                            updated_productions[replacement + suffix] = None
                         else:
                             # Développer récursivement jusqu'à obtenir un préfixe terminal
                             for final_prod in self.developpe_production(replacement + suffix):
-                                updated_productions.add(final_prod)
+                                updated_productions[final_prod] = None
             self.productions[nt] = list(updated_productions)
 
+    def est_forme_chomsky(self):
+        """
+        Vérifier si la grammaire est en forme normale de Chomsky (A -> BC, A -> a ou A -> E).
+
+        Comme dans la sortie de chomsky(), une règle vide hors de l'axiome est tolérée : elle est
+        redondante, l'élimination des epsilon ayant déjà ajouté les variantes sans ce non-terminal.
+
+        :return: Booléen
+        """
+        for productions in self.productions.values():
+            for prod in productions:
+                if len(prod) == 1:
+                    if prod[0] >= 0:
+                        return False
+                elif len(prod) == 2:
+                    if prod[0] < 0 or prod[1] < 0:
+                        return False
+                elif prod:
+                    return False
+        return True
+
+    @etape
+    def greibach_coin_gauche(self):
+        """
+        Convertir une grammaire en forme normale de Chomsky en forme normale de Greibach par la
+        transformation du coin gauche (Rosenkrantz), sans substitution répétée.
+
+        Pour A et l'un de ses coins gauches B (A =>* Bγ en développant toujours le premier
+        symbole), le non-terminal [A/B] engendre les suites γ non vides. Un mot de A commence par
+        la lettre d'une règle B -> a dont B est un coin gauche de A, puis une règle C -> BD fait
+        remonter d'un coin gauche B à C en lisant un mot de D :
+        - A -> a [A/B] pour B -> a, et A -> a si B = A ;
+        - [A/B] -> δ [A/C] pour C -> BD, et [A/B] -> δ si C = A,
+        où δ parcourt les débuts de D : a [D/F] pour F -> a (F coin gauche de D), et a si F = D.
+        Toutes les règles commencent par un terminal et ont au plus trois symboles ; seule la règle
+        vide de l'axiome est gardée (voir est_forme_chomsky). Seuls l'axiome
+        et les [A/B] sont gardés, avec A l'axiome ou un second symbole de règle binaire : avec n
+        non-terminaux, p règles binaires et t terminaux, la sortie a O(n²) non-terminaux et
+        O(n²·p·t) règles au pire, alors que la substitution peut croître exponentiellement.
+
+        :raises ValueError: Si la grammaire n'est pas en forme normale de Chomsky
+        """
+        if not self.est_forme_chomsky():
+            raise ValueError("greibach_coin_gauche demande une grammaire en forme normale de Chomsky")
+        if self.axiome is None:
+            return  # Grammaire vide
+
+        par_premier = {}  # {B: [(C, D) pour chaque règle C -> BD]}
+        lettres = {}  # {F: [a pour chaque règle F -> a]}
+        coins = {}  # {A: [B tels que A -> B...]}
+        for nt, productions in self.productions.items():
+            for prod in dict.fromkeys(productions):
+                if len(prod) == 2:
+                    par_premier.setdefault(prod[0], []).append((nt, prod[1]))
+                    coins.setdefault(nt, {})[prod[0]] = None
+                elif len(prod) == 1:
+                    lettres.setdefault(nt, []).append(prod[0])
+
+        fermetures = {}  # {A: ensemble des coins gauches de A, A compris}
+
+        def coins_gauches(a):
+            fermeture = fermetures.get(a)
+            if fermeture is None:
+                fermeture = fermetures[a] = {a}
+                pile = [a]
+                while pile:
+                    for b in coins.get(pile.pop(), ()):
+                        if b not in fermeture:
+                            fermeture.add(b)
+                            pile.append(b)
+            return fermeture
+
+        debuts = {}  # {D: [(a, F) pour F -> a, F coin gauche de D]}
+
+        def debuts_de(d):
+            if d not in debuts:
+                debuts[d] = [(lettre, f) for f in sorted(coins_gauches(d)) for lettre in lettres.get(f, ())]
+            return debuts[d]
+
+        nouveaux = {}  # {(A, B): identifiant de [A/B]}
+        a_traiter = []
+
+        def coin(a, b):
+            nt = nouveaux.get((a, b))
+            if nt is None:
+                nt = nouveaux[(a, b)] = self.generer_new_non_terminal()
+                a_traiter.append((a, b))
+            return nt
+
+        def suites(d):
+            # Débuts δ d'un mot de D : a [D/F], et a seul si F = D
+            for lettre, f in debuts_de(d):
+                yield (lettre, coin(d, f))
+                if f == d:
+                    yield (lettre,)
+
+        resultat = {}
+        axiome = self.axiome
+        regles_axiome = {}
+        for lettre, b in debuts_de(axiome):
+            regles_axiome[(lettre, coin(axiome, b))] = None
+            if b == axiome:
+                regles_axiome[(lettre,)] = None
+        if () in self.productions.get(axiome, []):
+            regles_axiome[()] = None
+        resultat[axiome] = list(regles_axiome)
+
+        while a_traiter:
+            a, b = a_traiter.pop()
+            fermeture = coins_gauches(a)
+            regles = {}
+            for c, d in par_premier.get(b, ()):
+                if c not in fermeture:
+                    continue
+                suite_c = coin(a, c)
+                for delta in suites(d):
+                    regles[delta + (suite_c,)] = None
+                    if c == a:
+                        regles[delta] = None
+            resultat[nouveaux[(a, b)]] = list(regles)
+
+        self.productions = resultat
+        self.non_terminals = set(resultat)
+
     def developpe_production(self, prod, cache=None):
         """
         Développer récursivement une production pour garantir qu'elle commence par un terminal.
-        
-        :param prod: La production à développer.
+
+        :param prod: La production à développer (tuple de symboles).
         :param cache: Dictionnaire optionnel pour mémoriser les résultats des développements déjà effectués.
         :return: Liste des productions qui commencent par un terminal.
         :raises KeyError: Si un non-terminal référencé dans une production n'a pas de règles définies.
@@ -397,23 +818,21 @@ class CFG:
         if prod in cache:  # Vérifier si le résultat est déjà en cache
             return cache[prod]
 
-        if prod == 'E':  # Retourner directement la chaîne vide si elle est rencontrée
-            return ['E']
+        if not prod:  # Retourner directement la chaîne vide si elle est rencontrée
+            return [()]
 
-        symbols = CFG.split_production(prod)  # Découper la production en symboles
-        if symbols[0].islower():  # Si le premier symbole est un terminal, la production est valide
+        if prod[0] < 0:  # Si le premier symbole est un terminal, la production est valide
             return [prod]
 
         results = []
-        prefix = symbols[0]  # Premier symbole de la production
-        suffix = ''.join(symbols[1:])  # Reste de la production
+        prefix = prod[0]  # Premier symbole de la production
+        suffix = prod[1:]  # Reste de la production
         if prefix not in self.productions:
-            raise KeyError(f"Le non-terminal '{prefix}' n'a pas de production définie.")
+            raise KeyError(f"Le non-terminal '{self.nom(prefix)}' n'a pas de production définie.")
 
         # Parcourir les remplacements possibles pour le préfixe (non-terminal)
         for replacement in self.productions[prefix]:
-            replacement_symbols = CFG.split_production(replacement)
-            if replacement_symbols[0] == 'E':  # Si le remplacement est la chaîne vide
+            if not replacement:  # Si le remplacement est la chaîne vide
                 if suffix:  # Continuer avec le suffixe s'il existe
                     results.extend(self.developpe_production(suffix, cache))
             else:  # Ajouter le remplacement et continuer avec le suffixe
@@ -422,21 +841,21 @@ class CFG:
         cache[prod] = results  # Stocker les résultats dans le cache pour éviter les calculs redondants
         return results
 
+    @etape
     def supprimer_unused_non_terminal(self):
         """
         Supprimer les non-terminaux inutilisés et les règles superflues.
-        """
-        used = {self.axiome}
-        stack = [self.axiome]
 
-        while stack:
-            nt = stack.pop()
-            for prod in self.productions.get(nt, []):
-                for symbol in self.split_production(prod):  
-                    if symbol in self.non_terminals and symbol not in used:
-                        used.add(symbol)
-                        stack.append(symbol)
+        Un non-terminal est inutile s'il n'est pas productif (il ne génère aucun mot terminal)
+        ou s'il n'est pas accessible depuis l'axiome ; les règles qui le mentionnent sont retirées.
+        """
+        analyse = AnalyseGrammaire(self)
+        productifs = analyse.productifs()
+        used = analyse.accessibles(productifs)
 
-        # Supprimer les non-terminaux inutilisés
-        self.non_terminals = used
-        self.productions = {nt: prods for nt, prods in self.productions.items() if nt in used}
+        # Supprimer les non-terminaux inutilisés (leurs noms restent dans la table des symboles)
+        self.non_terminals = used | {self.axiome}
+        self.productions = {
+            nt: [prod for prod in prods if all(symbol < 0 or symbol in productifs for symbol in prod)]
+            for nt, prods in self.productions.items() if nt in used
+        }
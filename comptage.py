@@ -0,0 +1,189 @@
+import random
+
+# Nombre maximal de mots que compter(distincts=True) accepte de construire
+LIMITE_DISTINCTS = 10**7
+
+class CompteurMots:
+    def __init__(self, cfg):
+        """
+        Préparer le comptage et le tirage aléatoire des mots d'une grammaire en forme normale de Chomsky.
+
+        Pour chaque non-terminal A et chaque longueur n, on calcule (une seule fois, en entiers
+        de précision arbitraire) le nombre d'arbres de dérivation de A de longueur n :
+        - n = 1 : nombre de règles A -> a ;
+        - n > 1 : somme, pour A -> BC et 1 <= k < n, de compte(B, k) * compte(C, n - k).
+        Pour une grammaire non ambiguë, c'est exactement le nombre de mots.
+
+        :param cfg: L'objet CFG, en forme normale de Chomsky (par exemple la sortie de CFG.chomsky())
+        :raises ValueError: Si une production n'est pas de la forme A -> a, A -> BC ou S -> E.
+        """
+        self.cfg = cfg
+        self.axiome = cfg.axiome
+        self.terminales = {nt: [] for nt in cfg.productions}  # {A: [lettres a telles que A -> a]}
+        self.binaires = {nt: [] for nt in cfg.productions}  # {A: [(B, C) tels que A -> BC]}
+        self.vide = False  # L'axiome produit-il la chaîne vide ?
+        for nt, productions in cfg.productions.items():
+            for prod in dict.fromkeys(productions):
+                if not prod:
+                    # Hors de l'axiome, une règle vide est redondante après l'élimination des epsilon
+                    if nt == cfg.axiome:
+                        self.vide = True
+                elif len(prod) == 1 and prod[0] < 0:
+                    self.terminales[nt].append(cfg.nom(prod[0]))
+                elif len(prod) == 2 and prod[0] in cfg.productions and prod[1] in cfg.productions:
+                    self.binaires[nt].append(prod)
+                else:
+                    raise ValueError(
+                        f"'{cfg.nom(nt)} -> {cfg.nom_production(prod)}' n'est pas en forme normale de Chomsky !")
+
+        # comptes[A][n] : nombre de dérivations de longueur n depuis A (la case 0 vaut toujours 0)
+        self.comptes = {nt: [0, len(self.terminales[nt])] for nt in cfg.productions}
+
+    def _etendre(self, n):
+        """
+        Compléter les tables de comptes jusqu'à la longueur n (les longueurs déjà calculées sont réutilisées).
+
+        :param n: Longueur maximale nécessaire
+        """
+        deja = len(next(iter(self.comptes.values()), [0, 0])) - 1
+        for longueur in range(deja + 1, n + 1):
+            for nt, paires in self.binaires.items():
+                total = 0
+                for b, c in paires:
+                    compte_b, compte_c = self.comptes[b], self.comptes[c]
+                    for k in range(1, longueur):
+                        total += compte_b[k] * compte_c[longueur - k]
+                self.comptes[nt].append(total)
+
+    def compter(self, n, distincts=False, limite=LIMITE_DISTINCTS):
+        """
+        Compter les dérivations (ou les mots distincts) de longueur n.
+
+        Sans distincts, le résultat est le nombre d'arbres de dérivation, calculé sans énumérer
+        aucun mot : il n'est égal au nombre de mots que si la grammaire n'est pas ambiguë.
+        Avec distincts, les mots sont construits (WordGenerator.mots_par_longueur) : avant de
+        commencer, le nombre de mots à construire est borné par le nombre de dérivations et par
+        le nombre de mots possibles sur l'alphabet, pour chaque non-terminal et chaque longueur
+        jusqu'à n, et le calcul est refusé si cette borne dépasse limite.
+
+        :param n: Longueur des mots
+        :param distincts: Si vrai, compter les mots distincts (utile pour une grammaire ambiguë)
+        :param limite: Nombre maximal de mots que le mode distincts accepte de construire
+        :return: Nombre de dérivations, ou de mots distincts (entier)
+        :raises ValueError: Si distincts est vrai et que la borne dépasse limite
+        """
+        if self.axiome not in self.comptes:
+            return 0
+        if n == 0:
+            return 1 if self.vide else 0
+        self._etendre(n)
+        if distincts:
+            alphabet = len({lettre for lettres in self.terminales.values() for lettre in lettres})
+            borne = sum(min(comptes[longueur], alphabet ** longueur)
+                        for comptes in self.comptes.values() for longueur in range(1, n + 1))
+            if borne > limite:
+                raise ValueError(
+                    f"Le comptage des mots distincts de longueur {n} construirait jusqu'à {borne} mots "
+                    f"(limite : {limite}) ; sans distincts, le nombre de dérivations est "
+                    f"{self.comptes[self.axiome][n]}.")
+            from generer import WordGenerator  # Import local : generer importe ce module
+            return len(WordGenerator(self.cfg).mots_par_longueur(n)[n])
+        return self.comptes[self.axiome][n]
+
+    def mot_de_rang(self, n, rang):
+        """
+        Construire le mot de longueur n dont la dérivation a le rang donné (méthode récursive).
+
+        À chaque nœud, on parcourt les règles puis les points de coupure en retranchant les
+        nombres de dérivations, ce qui coûte O(n) par nœud et O(n²) opérations par mot.
+
+        :param n: Longueur du mot
+        :param rang: Entier dans [0, compter(n))
+        :return: Le mot
+        :raises ValueError: Si le rang est hors de l'intervalle.
+        """
+        total = self.compter(n)
+        if not 0 <= rang < total:
+            raise ValueError(f"Le rang {rang} est hors de l'intervalle [0, {total}) pour la longueur {n}.")
+        if n == 0:
+            return ''
+
+        morceaux = []
+        pile = [(self.axiome, n, rang)]  # Parcours en profondeur, fils gauche d'abord
+        while pile:
+            nt, longueur, r = pile.pop()
+            if longueur == 1:
+                morceaux.append(self.terminales[nt][r])
+                continue
+            for b, c in self.binaires[nt]:
+                compte_b, compte_c = self.comptes[b], self.comptes[c]
+                for k in range(1, longueur):
+                    bloc = compte_b[k] * compte_c[longueur - k]
+                    if r < bloc:
+                        rang_b, rang_c = divmod(r, compte_c[longueur - k])
+                        pile.append((c, longueur - k, rang_c))
+                        pile.append((b, k, rang_b))
+                        break
+                    r -= bloc
+                else:
+                    continue
+                break
+        return ''.join(morceaux)
+
+    def nombre_analyses(self, mot):
+        """
+        Compter les arbres de dérivation d'un mot depuis l'axiome (CYK avec comptage).
+
+        :param mot: Le mot
+        :return: Nombre d'arbres de dérivation
+        """
+        n = len(mot)
+        if n == 0:
+            return 1 if self.vide else 0
+        # table[i][l] : {A: nombre de dérivations de mot[i:i+l] depuis A}
+        table = [[None] * (n + 1) for _ in range(n)]
+        for i, lettre in enumerate(mot):
+            table[i][1] = {nt: 1 for nt, lettres in self.terminales.items() if lettre in lettres}
+        for longueur in range(2, n + 1):
+            for i in range(n - longueur + 1):
+                cellule = {}
+                for nt, paires in self.binaires.items():
+                    total = 0
+                    for b, c in paires:
+                        for k in range(1, longueur):
+                            gauche = table[i][k].get(b)
+                            if gauche:
+                                droite = table[i + k][longueur - k].get(c)
+                                if droite:
+                                    total += gauche * droite
+                    if total:
+                        cellule[nt] = total
+                table[i][longueur] = cellule
+        return table[0][n].get(self.axiome, 0)
+
+    def echantillonner(self, n, k, distincts=False, rng=None):
+        """
+        Tirer k mots de longueur n uniformément au hasard.
+
+        Sans déduplication, le tirage est uniforme parmi les dérivations (donc parmi les mots si la
+        grammaire n'est pas ambiguë). Avec distincts=True, un mot tiré est accepté avec probabilité
+        1 / (nombre de ses dérivations), ce qui rend le tirage uniforme parmi les mots distincts.
+
+        :param n: Longueur des mots
+        :param k: Nombre de mots à tirer
+        :param distincts: Corriger le biais dû à l'ambiguïté par rejet
+        :param rng: Générateur aléatoire (random.Random), optionnel
+        :return: Liste de k mots
+        :raises ValueError: S'il n'existe aucun mot de longueur n.
+        """
+        rng = rng or random.Random()
+        total = self.compter(n)
+        if total == 0:
+            raise ValueError(f"La grammaire ne génère aucun mot de longueur {n}.")
+        mots = []
+        while len(mots) < k:
+            mot = self.mot_de_rang(n, rng.randrange(total))
+            if distincts and n > 0 and rng.randrange(self.nombre_analyses(mot)) != 0:
+                continue  # Rejet : un mot à d dérivations n'est gardé qu'une fois sur d
+            mots.append(mot)
+        return mots
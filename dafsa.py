@@ -0,0 +1,317 @@
+import sys
+import struct
+import argparse
+from array import array
+
+# Format binaire : en-tête puis tableaux (finaux, débuts, lettres, cibles), entiers 32 bits petit-boutistes
+MAGIQUE = b'DAFS'
+VERSION_BINAIRE = 1
+# magique, version, racine, nombre d'états, nombre de transitions, longueur maximale des mots
+EN_TETE = struct.Struct('<4sB3xIIII')
+
+class Dafsa:
+    def __init__(self, finaux, debuts, lettres, cibles, racine, longueur_max=0):
+        """
+        Automate acyclique déterministe minimal (DAFSA) d'un langage fini.
+
+        Les préfixes et les suffixes communs à plusieurs mots ne sont représentés qu'une fois.
+        Les états sont numérotés des feuilles vers la racine (un état n'a de transitions que vers
+        des états de numéro inférieur). Les transitions de l'état q sont les positions
+        debuts[q] à debuts[q + 1] - 1 de lettres (une chaîne, triée pour chaque état) et de
+        cibles. Tous les états mènent à un état final, si bien qu'un préfixe lu en entier est
+        toujours le préfixe d'un mot.
+
+        :param finaux: bytearray, 1 pour les états finaux
+        :param debuts: array('I') de taille nombre d'états + 1
+        :param lettres: Chaîne des lettres des transitions
+        :param cibles: array('I') des états d'arrivée des transitions
+        :param racine: État initial
+        :param longueur_max: Longueur maximale des mots (information)
+        """
+        self.finaux = finaux
+        self.debuts = debuts
+        self.lettres = lettres
+        self.cibles = cibles
+        self.racine = racine
+        self.longueur_max = longueur_max
+        self._comptes = None
+
+    @classmethod
+    def depuis_mots(cls, mots, longueur_max=0):
+        """
+        Construire le DAFSA d'une suite de mots triée, en une passe (Daciuk, Mihov, Watson et Watson).
+
+        Seul le chemin du dernier mot lu n'est pas encore minimisé : quand le mot suivant s'en
+        écarte, les états au-delà du préfixe commun ne changeront plus et sont remplacés par leur
+        équivalent déjà enregistré (même finalité, mêmes transitions), ou enregistrés. La mémoire
+        est celle de l'automate minimal, jamais celle de la liste des mots.
+
+        :param mots: Itérable de mots distincts, dans l'ordre lexicographique
+        :param longueur_max: Longueur maximale des mots (information gardée dans l'automate)
+        :return: Le Dafsa
+        :raises ValueError: Si les mots ne sont pas triés ou contiennent un doublon
+        """
+        registre = {}  # {(final, transitions): état}
+        signatures = []  # Signature de chaque état, par numéro
+        # Chemin du dernier mot : [final, {lettre: état enregistré}, lettre vers l'état suivant du chemin]
+        chemin = [[False, {}, None]]
+
+        def enregistrer(noeud):
+            signature = (noeud[0], tuple(noeud[1].items()))
+            etat = registre.get(signature)
+            if etat is None:
+                etat = registre[signature] = len(signatures)
+                signatures.append(signature)
+            return etat
+
+        def minimiser(profondeur):
+            while len(chemin) > profondeur + 1:
+                etat = enregistrer(chemin.pop())
+                parent = chemin[-1]
+                parent[1][parent[2]] = etat
+                parent[2] = None
+
+        precedent = None
+        for mot in mots:
+            if precedent is not None and mot <= precedent:
+                raise ValueError(f"Les mots doivent être distincts et triés : '{mot}' après '{precedent}'")
+            commun = 0
+            if precedent is not None:
+                limite = min(len(mot), len(precedent))
+                while commun < limite and mot[commun] == precedent[commun]:
+                    commun += 1
+            minimiser(commun)
+            for lettre in mot[commun:]:
+                chemin[-1][2] = lettre
+                chemin.append([False, {}, None])
+            chemin[-1][0] = True
+            precedent = mot
+        minimiser(0)
+        racine = enregistrer(chemin.pop())
+
+        finaux = bytearray(final for final, _ in signatures)
+        debuts = array('I', [0])
+        lettres = []
+        cibles = array('I')
+        for _, transitions in signatures:
+            for lettre, cible in transitions:
+                lettres.append(lettre)
+                cibles.append(cible)
+            debuts.append(len(cibles))
+        return cls(finaux, debuts, ''.join(lettres), cibles, racine, longueur_max)
+
+    def _etat(self, mot, depart=None):
+        """
+        Lire un mot depuis un état.
+
+        :return: État atteint, ou None si une transition manque
+        """
+        etat = self.racine if depart is None else depart
+        debuts, lettres, cibles = self.debuts, self.lettres, self.cibles
+        for lettre in mot:
+            i = lettres.find(lettre, debuts[etat], debuts[etat + 1])
+            if i < 0:
+                return None
+            etat = cibles[i]
+        return etat
+
+    def __contains__(self, mot):
+        etat = self._etat(mot)
+        return etat is not None and self.finaux[etat] == 1
+
+    def a_prefixe(self, prefixe):
+        """
+        :return: True si un mot du langage commence par prefixe
+        """
+        # Seul le langage vide a un état (la racine) qui ne mène à aucun état final
+        return self._etat(prefixe) is not None and (len(self.finaux) > 1 or self.finaux[self.racine] == 1)
+
+    def mots(self, prefixe=""):
+        """
+        Énumérer, dans l'ordre lexicographique, les mots qui commencent par prefixe.
+
+        :param prefixe: Préfixe commun (par défaut, tous les mots)
+        :return: Itérateur sur les mots
+        """
+        etat = self._etat(prefixe)
+        if etat is None:
+            return
+        debuts, lettres, cibles, finaux = self.debuts, self.lettres, self.cibles, self.finaux
+        # Pile de (état, mot lu, prochaine transition) : parcours en profondeur sans récursion
+        pile = [(etat, prefixe, debuts[etat])]
+        if finaux[etat]:
+            yield prefixe
+        while pile:
+            etat, mot, i = pile.pop()
+            if i == debuts[etat + 1]:
+                continue
+            pile.append((etat, mot, i + 1))
+            suivant, lu = cibles[i], mot + lettres[i]
+            if finaux[suivant]:
+                yield lu
+            pile.append((suivant, lu, debuts[suivant]))
+
+    def __iter__(self):
+        return self.mots()
+
+    def comptes(self):
+        """
+        Compter les mots reconnus depuis chaque état (les états sont numérotés des feuilles vers la racine).
+
+        :return: Liste d'entiers indexée par état
+        """
+        if self._comptes is None:
+            comptes = []
+            debuts, cibles = self.debuts, self.cibles
+            for etat, final in enumerate(self.finaux):
+                comptes.append(final + sum(comptes[cibles[i]] for i in range(debuts[etat], debuts[etat + 1])))
+            self._comptes = comptes
+        return self._comptes
+
+    def __len__(self):
+        return self.comptes()[self.racine]
+
+    def nombre_avec_prefixe(self, prefixe):
+        """
+        :return: Nombre de mots qui commencent par prefixe, sans les énumérer
+        """
+        etat = self._etat(prefixe)
+        return 0 if etat is None else self.comptes()[etat]
+
+    def taille(self):
+        """
+        Mesurer la taille de l'automate.
+
+        :return: Tuple (nombre d'états, nombre de transitions)
+        """
+        return len(self.finaux), len(self.cibles)
+
+    def vers_octets(self):
+        """
+        Sérialiser l'automate dans le format binaire compact (voir EN_TETE).
+
+        :return: bytes
+        """
+        debuts, cibles = array('I', self.debuts), array('I', self.cibles)
+        if sys.byteorder == 'big':
+            debuts.byteswap()
+            cibles.byteswap()
+        en_tete = EN_TETE.pack(MAGIQUE, VERSION_BINAIRE, self.racine, len(self.finaux), len(self.cibles),
+                               self.longueur_max)
+        return b''.join([en_tete, bytes(self.finaux), debuts.tobytes(), self.lettres.encode('ascii'),
+                         cibles.tobytes()])
+
+    @classmethod
+    def depuis_octets(cls, donnees):
+        """
+        Relire un automate sérialisé par vers_octets.
+
+        La taille du contenu doit être celle annoncée par l'en-tête, et les tableaux doivent
+        décrire un automate valide (voir __init__) : un fichier tronqué ou corrompu est rejeté
+        au lieu de donner un automate incohérent.
+
+        :param donnees: bytes
+        :return: Le Dafsa
+        :raises ValueError: Si l'en-tête ne correspond pas au format ou si le contenu est incohérent
+        """
+        if len(donnees) < EN_TETE.size:
+            raise ValueError("Automate tronqué (en-tête incomplet)")
+        magique, version, racine, nombre_etats, nombre_transitions, longueur_max = EN_TETE.unpack_from(donnees)
+        if magique != MAGIQUE or version != VERSION_BINAIRE:
+            raise ValueError(f"Format d'automate inconnu (version {version})")
+        attendue = EN_TETE.size + nombre_etats + 4 * (nombre_etats + 1) + 5 * nombre_transitions
+        if len(donnees) != attendue:
+            raise ValueError(f"Taille d'automate incohérente : {len(donnees)} octets, l'en-tête en annonce {attendue}")
+        position = EN_TETE.size
+        finaux = bytearray(donnees[position:position + nombre_etats])
+        position += nombre_etats
+        debuts = array('I')
+        debuts.frombytes(donnees[position:position + 4 * (nombre_etats + 1)])
+        position += 4 * (nombre_etats + 1)
+        try:
+            lettres = donnees[position:position + nombre_transitions].decode('ascii')
+        except UnicodeDecodeError:
+            raise ValueError("Lettres de l'automate illisibles") from None
+        position += nombre_transitions
+        cibles = array('I')
+        cibles.frombytes(donnees[position:position + 4 * nombre_transitions])
+        if sys.byteorder == 'big':
+            debuts.byteswap()
+            cibles.byteswap()
+
+        # Débuts croissants de 0 au nombre de transitions, finaux à 0 ou 1, racine existante, et
+        # chaque transition vers un état de numéro inférieur (automate acyclique, numéroté des feuilles)
+        if (nombre_etats == 0 or racine >= nombre_etats or debuts[0] != 0 or debuts[-1] != nombre_transitions
+                or any(debuts[q] > debuts[q + 1] for q in range(nombre_etats)) or max(finaux) > 1
+                or any(cibles[i] >= q for q in range(nombre_etats) for i in range(debuts[q], debuts[q + 1]))):
+            raise ValueError("Automate incohérent (états ou transitions hors limites)")
+        return cls(finaux, debuts, lettres, cibles, racine, longueur_max)
+
+    def ecrire(self, file_path):
+        """
+        Écrire l'automate au format binaire.
+
+        :param file_path: Chemin du fichier
+        """
+        with open(file_path, 'wb') as fichier:
+            fichier.write(self.vers_octets())
+
+    @classmethod
+    def lire(cls, file_path):
+        """
+        Lire un automate écrit par ecrire.
+
+        :param file_path: Chemin du fichier
+        :return: Le Dafsa
+        """
+        with open(file_path, 'rb') as fichier:
+            return cls.depuis_octets(fichier.read())
+
+    def ecrire_texte(self, sortie, prefixe=""):
+        """
+        Développer l'automate au format texte de generer.py : un mot par ligne, 'E' pour la chaîne vide.
+
+        :param sortie: Fichier texte ouvert en écriture
+        :param prefixe: N'écrire que les mots qui commencent par prefixe
+        """
+        tampon = []
+        for mot in self.mots(prefixe):
+            tampon.append(mot if mot != '' else 'E')
+            if len(tampon) >= 4096:  # Écrire par blocs pour limiter les appels système
+                sortie.write('\n'.join(tampon) + '\n')
+                tampon = []
+        if tampon:
+            sortie.write('\n'.join(tampon) + '\n')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(usage="python3 dafsa.py <fichier.dafsa> [--mots FICHIER] [--prefixe P] [--developper]")
+    parser.add_argument("automate", help="automate écrit par generer.py --dafsa")
+    parser.add_argument("--mots", metavar="FICHIER", nargs="?", const="-",
+                        help="tester l'appartenance des mots du fichier (un par ligne, 'E' pour la chaîne vide ; "
+                             "par défaut : entrée standard)")
+    parser.add_argument("--prefixe", metavar="P", help="compter (et avec --developper, lister) les mots qui commencent par P")
+    parser.add_argument("--developper", action="store_true", help="écrire les mots au format texte de generer.py")
+    args = parser.parse_args()
+
+    try:
+        automate = Dafsa.lire(args.automate)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+    if args.mots is not None:
+        source = sys.stdin if args.mots == "-" else open(args.mots, encoding='utf-8')
+        with source:
+            for ligne in source:
+                mot = ligne.strip()
+                if mot:
+                    print(f"{mot} : {'oui' if ('' if mot == 'E' else mot) in automate else 'non'}")
+    elif args.developper:
+        print(f"Mots générés (longueur maximale {automate.longueur_max}) :")
+        automate.ecrire_texte(sys.stdout, args.prefixe or "")
+    elif args.prefixe is not None:
+        print(f"Mots commençant par '{args.prefixe}' : {automate.nombre_avec_prefixe(args.prefixe)}")
+    else:
+        etats, transitions = automate.taille()
+        print(f"{len(automate)} mot(s) de longueur au plus {automate.longueur_max}, "
+              f"{etats} état(s), {transitions} transition(s)")
@@ -0,0 +1,413 @@
+import sys
+import argparse
+from collections import deque
+from analyse import AnalyseGrammaire
+from lire import read_cfg_rules
+
+class NoeudSPPF:
+    __slots__ = ('etiquette', 'debut', 'fin', 'familles')
+
+    def __init__(self, etiquette, debut, fin):
+        """
+        Nœud d'une forêt d'analyse partagée (SPPF, shared packed parse forest).
+
+        Un nœud de symbole a pour étiquette l'identifiant d'un terminal ou d'un non-terminal, un
+        nœud intermédiaire le couple (règle, point) d'une règle reconnue jusqu'au point ; tous
+        deux couvrent les positions [debut, fin) de l'entrée. Chaque famille (nœud emballé) est un
+        couple (gauche, droite) : droite est le nœud du dernier symbole reconnu, gauche le nœud
+        intermédiaire de ce qui le précède dans la règle (None s'il est le premier). La famille
+        (None, None) est celle d'une règle vide. Un nœud a plusieurs familles si son segment
+        est ambigu, et un sous-arbre commun à plusieurs arbres n'est représenté qu'une fois.
+
+        :param etiquette: Identifiant de symbole, ou couple (numéro de règle, position du point)
+        :param debut: Position de début (incluse)
+        :param fin: Position de fin (exclue)
+        """
+        self.etiquette = etiquette
+        self.debut = debut
+        self.fin = fin
+        self.familles = {}  # Dictionnaire utilisé comme ensemble ordonné de couples (gauche, droite)
+
+    def est_symbole(self):
+        """
+        :return: True pour un nœud de symbole, False pour un nœud intermédiaire
+        """
+        return not isinstance(self.etiquette, tuple)
+
+class AnalyseurEarley:
+    def __init__(self, cfg):
+        """
+        Préparer l'analyse d'Earley d'une grammaire quelconque (productions vides et unitaires comprises).
+
+        La grammaire n'a pas besoin d'être normalisée : elle est utilisée telle que lue par
+        lire.read_cfg_rules. Les règles sont numérotées et indexées par non-terminal de gauche
+        (pour la prédiction), et les non-terminaux nullables sont calculés une fois : un item
+        qui attend un non-terminal nullable est aussitôt avancé (Aycock et Horspool), ce qui
+        rend inutile de revenir sur un ensemble déjà fermé.
+
+        :param cfg: L'objet CFG (non modifié)
+        """
+        self.cfg = cfg
+        self.axiome = cfg.axiome
+        self.regles = [(regle.gauche, regle.droite) for regle in cfg.liste_regles()]
+        self.par_gauche = {}  # {non-terminal: [numéros de ses règles]}
+        for numero, (gauche, _) in enumerate(self.regles):
+            self.par_gauche.setdefault(gauche, []).append(numero)
+        self.nullables = AnalyseGrammaire(cfg).nullables()
+        self.terminaux = {cfg.nom(t): t for t in cfg.terminals}  # {nom du terminal: identifiant}
+
+    def analyse(self, foret=False):
+        """
+        Commencer l'analyse d'une entrée lue jeton par jeton (voir EtatEarley.lire).
+
+        :param foret: Construire la forêt d'analyse partagée
+        :return: Un EtatEarley à la position 0
+        """
+        return EtatEarley(self, foret)
+
+    def reconnait(self, jetons):
+        """
+        Vérifier si une suite de jetons appartient au langage de la grammaire.
+
+        :param jetons: Itérable de jetons (noms de terminaux, par exemple les caractères d'un mot)
+        :return: Booléen
+        """
+        etat = self.analyse()
+        for jeton in jetons:
+            if not etat.lire(jeton):
+                return False
+        return etat.accepte
+
+    def foret(self, jetons):
+        """
+        Analyser une suite de jetons et retourner la racine de sa forêt d'analyse.
+
+        :param jetons: Itérable de jetons
+        :return: Nœud (axiome, 0, n), ou None si l'entrée n'appartient pas au langage
+        """
+        etat = self.analyse(foret=True)
+        for jeton in jetons:
+            if not etat.lire(jeton):
+                return None
+        return etat.racine()
+
+    def nombre_arbres(self, racine):
+        """
+        Compter les arbres d'analyse représentés par une forêt, sans les énumérer.
+
+        :param racine: Racine de la forêt (voir foret)
+        :return: Nombre d'arbres (entier), float('inf') si la grammaire a un cycle (A ->+ A) sur l'entrée
+        """
+        if racine is None:
+            return 0
+        valeurs = {}
+        sur_pile = set()
+        pile = [(racine, False)]
+        while pile:
+            noeud, visite = pile.pop()
+            if visite:
+                total = 0
+                for gauche, droite in noeud.familles:
+                    produit = 1
+                    for enfant in (gauche, droite):
+                        if enfant is not None:
+                            produit *= valeurs[enfant]
+                    total += produit
+                valeurs[noeud] = total if noeud.familles or not noeud.est_symbole() or noeud.etiquette >= 0 else 1
+                sur_pile.discard(noeud)
+                continue
+            if noeud in valeurs:
+                continue
+            sur_pile.add(noeud)
+            pile.append((noeud, True))
+            for famille in noeud.familles:
+                for enfant in famille:
+                    if enfant is None or enfant in valeurs:
+                        continue
+                    if enfant in sur_pile:  # Un cycle de dérivation : une infinité d'arbres
+                        return float('inf')
+                    pile.append((enfant, False))
+        return valeurs[racine]
+
+    def un_arbre(self, racine):
+        """
+        Extraire un arbre d'analyse d'une forêt.
+
+        Les nœuds sont classés par hauteur minimale d'arbre fini (propagation depuis les feuilles,
+        comme pour les non-terminaux productifs) : en suivant, pour chaque nœud, la famille qui
+        lui a donné son rang, on obtient toujours un arbre fini, même si la forêt a des cycles.
+
+        :param racine: Racine de la forêt (voir foret)
+        :return: Arbre (nom du non-terminal, [sous-arbres]), les feuilles étant des noms de terminaux ;
+                 None si racine est None
+        """
+        if racine is None:
+            return None
+
+        # Parcourir la forêt pour indexer, pour chaque nœud, les familles qui l'utilisent
+        attentes = {}  # {nœud: [(parent, famille)]}
+        compteurs = {}  # {(parent, famille): nombre d'enfants sans rang}
+        choix = {}  # {nœud: famille retenue}
+        file = deque()
+        vus = {racine}
+        pile = [racine]
+        while pile:
+            noeud = pile.pop()
+            if not noeud.familles:  # Terminal : une feuille
+                choix[noeud] = None
+                file.append(noeud)
+            for famille in noeud.familles:
+                enfants = [enfant for enfant in famille if enfant is not None]
+                compteurs[(noeud, famille)] = len(enfants)
+                if not enfants and noeud not in choix:  # Règle vide
+                    choix[noeud] = famille
+                    file.append(noeud)
+                for enfant in enfants:
+                    attentes.setdefault(enfant, []).append((noeud, famille))
+                    if enfant not in vus:
+                        vus.add(enfant)
+                        pile.append(enfant)
+
+        # Chaque nœud reçoit la première famille dont tous les enfants ont déjà une famille
+        while file:
+            noeud = file.popleft()
+            for parent, famille in attentes.get(noeud, []):
+                compteurs[(parent, famille)] -= 1
+                if compteurs[(parent, famille)] == 0 and parent not in choix:
+                    choix[parent] = famille
+                    file.append(parent)
+
+        arbres = {}
+        pile = [racine]
+        while pile:
+            noeud = pile[-1]
+            if noeud in arbres:
+                pile.pop()
+                continue
+            enfants = self._enfants(noeud, choix)
+            manquants = [enfant for enfant in enfants if enfant.etiquette >= 0 and enfant not in arbres]
+            if manquants:
+                pile.extend(manquants)
+                continue
+            pile.pop()
+            arbres[noeud] = (self.cfg.nom(noeud.etiquette),
+                             [arbres[e] if e.etiquette >= 0 else self.cfg.nom(e.etiquette) for e in enfants])
+        return arbres[racine]
+
+    @staticmethod
+    def _enfants(noeud, choix):
+        """
+        Retourner les nœuds de symbole fils d'un nœud de symbole, pour la famille retenue.
+
+        :return: Liste de nœuds de symbole, dans l'ordre de la règle
+        """
+        enfants = []
+        famille = choix[noeud]
+        while famille is not None:
+            gauche, droite = famille
+            if droite is not None:
+                enfants.append(droite)
+            famille = choix[gauche] if gauche is not None else None
+        enfants.reverse()
+        return enfants
+
+class EtatEarley:
+    def __init__(self, analyseur, foret=False):
+        """
+        État d'une analyse d'Earley en cours, alimentée jeton par jeton.
+
+        Seul l'ensemble d'items de la position courante est construit en entier ; pour les
+        positions passées, on ne garde que l'index des items en attente d'un non-terminal
+        (utilisé pour la complétion par origine). La mémoire par position est donc bornée par la
+        taille de la grammaire, et une entrée rejetée est abandonnée dès le premier jeton impossible.
+        Le coût est linéaire pour la plupart des grammaires déterministes, quadratique au pire
+        pour une grammaire non ambiguë et cubique dans le cas général.
+
+        :param analyseur: L'AnalyseurEarley
+        :param foret: Construire la forêt d'analyse partagée (sa taille croît avec l'entrée)
+        """
+        self.analyseur = analyseur
+        self.position = 0
+        self.attentes = []  # Pour chaque position k : {non-terminal: [items (règle, point, origine) de l'ensemble k]}
+        self.par_terminal = {}  # {terminal: items de l'ensemble courant qui attendent ce terminal}
+        self.accepte = False  # Vrai si l'entrée lue jusqu'ici appartient au langage
+        self.noeuds = {} if foret else None  # {clé: NoeudSPPF}
+        initiaux = {}
+        if analyseur.axiome is not None:
+            for regle in analyseur.par_gauche.get(analyseur.axiome, []):
+                initiaux[(regle, 0, 0)] = None
+                if not analyseur.regles[regle][1]:
+                    self._famille(regle, 0, 0, 0, None, None)
+        self._fermer(initiaux)
+
+    def _noeud(self, regle, point, origine, position):
+        """
+        Retourner (en le créant au besoin) le nœud de la forêt d'un item.
+
+        :return: None au début d'une règle, le nœud de symbole (A, origine, position) pour un item
+                 terminé, sinon le nœud intermédiaire ((règle, point), origine, position)
+        """
+        gauche, droite = self.analyseur.regles[regle]
+        if point == len(droite):
+            return self._noeud_symbole(gauche, origine, position)
+        if point == 0:
+            return None
+        return self._noeud_symbole((regle, point), origine, position)
+
+    def _noeud_symbole(self, etiquette, debut, fin):
+        """
+        :return: Le nœud (etiquette, debut, fin) de la forêt, créé au besoin
+        """
+        cle = (etiquette, debut, fin)
+        noeud = self.noeuds.get(cle)
+        if noeud is None:
+            noeud = self.noeuds[cle] = NoeudSPPF(etiquette, debut, fin)
+        return noeud
+
+    def _famille(self, regle, point, origine, position, gauche, droite):
+        """
+        Ajouter une famille (gauche, droite) au nœud de l'item (regle, point, origine) à position.
+        """
+        if self.noeuds is not None:
+            self._noeud(regle, point, origine, position).familles[(gauche, droite)] = None
+
+    def _fermer(self, initiaux):
+        """
+        Compléter l'ensemble d'items de la position courante (prédiction et complétion).
+
+        :param initiaux: Items de départ de l'ensemble (dictionnaire utilisé comme ensemble ordonné)
+        """
+        analyseur = self.analyseur
+        regles = analyseur.regles
+        i = self.position
+        foret = self.noeuds is not None
+        vus = set(initiaux)
+        agenda = list(initiaux)
+        attente = {}  # Index des items de cet ensemble qui attendent un non-terminal
+        par_terminal = {}
+        self.accepte = False
+
+        def ajouter(item, gauche, droite):
+            if foret:
+                self._famille(*item, i, gauche, droite)
+            if item not in vus:
+                vus.add(item)
+                agenda.append(item)
+
+        while agenda:
+            item = agenda.pop()
+            regle, point, origine = item
+            nt, droite = regles[regle]
+            if point == len(droite):
+                # Complétion : avancer les items de l'ensemble d'origine qui attendaient nt
+                if nt == analyseur.axiome and origine == 0:
+                    self.accepte = True
+                if origine == i:
+                    continue  # Segment vide : déjà traité à la prédiction (nt est nullable)
+                noeud = self._noeud_symbole(nt, origine, i) if foret else None
+                for r, p, o in self.attentes[origine].get(nt, ()):
+                    ajouter((r, p + 1, o), self._noeud(r, p, o, origine) if foret else None, noeud)
+                continue
+
+            symbole = droite[point]
+            if symbole < 0:
+                par_terminal.setdefault(symbole, []).append(item)
+                continue
+
+            en_attente = attente.get(symbole)
+            if en_attente is None:
+                # Prédiction : une seule fois par non-terminal et par position
+                en_attente = attente[symbole] = []
+                for r in analyseur.par_gauche.get(symbole, ()):
+                    if not regles[r][1]:
+                        ajouter((r, 0, i), None, None)  # Règle vide : reconnue aussitôt
+                    elif (r, 0, i) not in vus:
+                        vus.add((r, 0, i))
+                        agenda.append((r, 0, i))
+            en_attente.append(item)
+            if symbole in analyseur.nullables:
+                # Le non-terminal peut dériver le segment vide [i, i) : avancer sans attendre sa complétion
+                ajouter((regle, point + 1, origine), self._noeud(regle, point, origine, i) if foret else None,
+                        self._noeud_symbole(symbole, i, i) if foret else None)
+
+        self.attentes.append(attente)
+        self.par_terminal = par_terminal
+
+    def lire(self, jeton):
+        """
+        Lire le jeton suivant de l'entrée.
+
+        :param jeton: Nom d'un terminal
+        :return: False si aucun mot du langage ne commence par l'entrée lue (l'analyse s'arrête là)
+        """
+        terminal = self.analyseur.terminaux.get(jeton)
+        items = self.par_terminal.get(terminal, []) if terminal is not None else []
+        i = self.position
+        self.position += 1
+        suivants = {}
+        feuille = self._noeud_symbole(terminal, i, i + 1) if self.noeuds is not None and items else None
+        for regle, point, origine in items:
+            suivants[(regle, point + 1, origine)] = None
+            if self.noeuds is not None:
+                self._famille(regle, point + 1, origine, i + 1, self._noeud(regle, point, origine, i), feuille)
+        self._fermer(suivants)
+        return bool(suivants)
+
+    def racine(self):
+        """
+        :return: Racine de la forêt de l'entrée lue (nœud (axiome, 0, position)), None si elle est rejetée
+        """
+        if not self.accepte or self.noeuds is None:
+            return None
+        return self.noeuds.get((self.analyseur.axiome, 0, self.position))
+
+def afficher_arbre(arbre, marge=""):
+    """
+    Afficher un arbre d'analyse avec une indentation par niveau.
+
+    :param arbre: Arbre (nom, [sous-arbres]) ou nom de terminal
+    :param marge: Indentation courante
+    """
+    pile = [(arbre, marge)]
+    while pile:
+        noeud, marge = pile.pop()
+        if isinstance(noeud, str):
+            print(f"{marge}{noeud}")
+            continue
+        nom, enfants = noeud
+        print(f"{marge}{nom}{'' if enfants else ' -> E'}")
+        pile.extend((enfant, marge + "  ") for enfant in reversed(enfants))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(usage="python3 earley.py <file_path> [fichier_mots] [--arbres] [--arbre]")
+    parser.add_argument("grammaire", help="fichier de grammaire, normalisée ou non (par exemple cfg.general)")
+    parser.add_argument("mots", nargs="?", help="un mot par ligne, 'E' pour la chaîne vide (par défaut : entrée standard)")
+    parser.add_argument("--arbres", action="store_true", help="afficher le nombre d'arbres d'analyse de chaque mot")
+    parser.add_argument("--arbre", action="store_true", help="afficher un arbre d'analyse de chaque mot reconnu")
+    args = parser.parse_args()
+
+    cfg_rules = read_cfg_rules(args.grammaire)
+    if cfg_rules is None:
+        print("Échec de la lecture des règles CFG, veuillez vérifier le contenu du fichier.")
+        sys.exit(1)
+    analyseur = AnalyseurEarley(cfg_rules)
+    foret = args.arbres or args.arbre
+
+    source = open(args.mots, encoding='utf-8') if args.mots else sys.stdin
+    with source:
+        for ligne in source:
+            mot = ligne.strip()
+            if not mot:
+                continue
+            jetons = '' if mot == 'E' else mot
+            if not foret:
+                print(f"{mot} : {'oui' if analyseur.reconnait(jetons) else 'non'}")
+                continue
+            racine = analyseur.foret(jetons)
+            if args.arbres and racine is not None:
+                nombre = analyseur.nombre_arbres(racine)
+                print(f"{mot} : oui ({'une infinité' if nombre == float('inf') else nombre} arbre(s))")
+            else:
+                print(f"{mot} : {'oui' if racine else 'non'}")
+            if args.arbre and racine is not None:
+                afficher_arbre(analyseur.un_arbre(racine), "  ")
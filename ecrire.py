@@ -1,4 +1,25 @@
+import sys
+from array import array
 import cfg
+import lire
+
+def lignes_texte(cfg):
+    """
+    Produire les lignes du format texte d'un CFG, une par non-terminal (« A0 : aB0 | E »).
+
+    :param cfg: L'objet CFG
+    :return: Générateur de lignes, terminées par un saut de ligne
+    """
+    noms = {}  # Production -> texte, chaque production distincte n'est formatée qu'une fois
+    for non_terminal, productions in cfg.productions.items():
+        # Reconstruire la forme textuelle uniquement au moment de l'écriture
+        textes = []
+        for p in productions:
+            texte = noms.get(p)
+            if texte is None:
+                texte = noms[p] = cfg.nom_production(p)
+            textes.append(texte)
+        yield f"{cfg.nom(non_terminal)} : {' | '.join(textes)}\n"
 
 def write_to_file(cfg, file_path):
     """
@@ -8,9 +29,49 @@ def write_to_file(cfg, file_path):
     :param file_path: Chemin du fichier
     """
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            for non_terminal, productions in cfg.productions.items():
-                file.write(f"{non_terminal} : {' | '.join(productions)}\n")
+        with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as file:
+            file.writelines(lignes_texte(cfg))
+        print(f"Les règles a été écrit avec succès dans {file_path}")
+    except Exception as e:
+        print(f"Une erreur s'est produite lors de l'écriture du fichier : {e}")
+
+def ecrire_binaire(cfg, file_path):
+    """
+    Écrire un CFG au format binaire compact, relu par lire.read_cfg_rules sans analyse de texte.
+
+    Le fichier contient un en-tête (voir lire.EN_TETE), les noms des symboles séparés par des
+    sauts de ligne, puis cinq tableaux d'entiers 32 bits petit-boutistes : les non-terminaux,
+    les parties gauches, le nombre de règles de chacune, la longueur de chaque règle et la suite
+    de tous les symboles des parties droites. Les identifiants sont conservés tels quels.
+
+    :param cfg: L'objet CFG à écrire
+    :param file_path: Chemin du fichier
+    """
+    noms_nt, noms_t, axiome, non_terminaux, productions = cfg.vers_compact()
+    gauches, comptes, longueurs, symboles = array('i'), array('I'), array('I'), array('i')
+    for gauche, regles in productions:
+        gauches.append(gauche)
+        comptes.append(len(regles))
+        for regle in regles:
+            longueurs.append(len(regle))
+            symboles.extend(regle)
+    tableaux = [array('i', non_terminaux), gauches, comptes, longueurs, symboles]
+    if sys.byteorder == 'big':
+        for tableau in tableaux:
+            tableau.byteswap()
+
+    texte_nt = '\n'.join(noms_nt).encode('utf-8')
+    texte_t = '\n'.join(noms_t).encode('utf-8')
+    en_tete = lire.EN_TETE.pack(lire.MAGIQUE, lire.VERSION_BINAIRE, -1 if axiome is None else axiome,
+                                len(noms_nt), len(texte_nt), len(noms_t), len(texte_t),
+                                len(non_terminaux), len(gauches), len(longueurs), len(symboles))
+    try:
+        with open(file_path, 'wb') as file:
+            file.write(en_tete)
+            file.write(texte_nt)
+            file.write(texte_t)
+            for tableau in tableaux:
+                tableau.tofile(file)
         print(f"Les règles a été écrit avec succès dans {file_path}")
     except Exception as e:
         print(f"Une erreur s'est produite lors de l'écriture du fichier : {e}")
@@ -0,0 +1,154 @@
+import numpy as np
+from generer import EnumerateurParesseux
+
+# Nombre premier < 2**26 : un produit de deux coefficients et une somme de quelques dizaines de
+# tels produits tiennent dans un entier signé de 64 bits
+PREMIER = 67108859
+
+class EmpreintesLangage:
+    def __init__(self, cfg, matrices):
+        """
+        Préparer le calcul, longueur par longueur, du nombre de dérivations et de l'empreinte d'une grammaire.
+
+        Chaque lettre a est associée à une matrice aléatoire M_a (modulo PREMIER), un mot
+        a1...an à la matrice M_a1 ... M_an, et l'empreinte de la longueur n est la somme de ces
+        produits sur toutes les dérivations des mots de longueur n. Comme les nombres de
+        dérivations, elle se calcule par programmation dynamique sans énumérer les mots : pour
+        A -> BC, F(A, n) = somme sur k de F(B, k) F(C, n - k).
+
+        :param cfg: L'objet CFG (non modifié ; une copie sans productions vides ni unitaires est utilisée)
+        :param matrices: Dictionnaire {nom de terminal: matrice carrée}, commun aux grammaires comparées
+        """
+        self.enumerateur = EnumerateurParesseux(EnumerateurParesseux.preparer(cfg))
+        self.matrices = {symbole: matrices[nom] for symbole, nom in self.enumerateur.noms.items()}
+        taille = len(next(iter(matrices.values()))) if matrices else 1
+        self.identite = np.eye(taille, dtype=np.int64)
+        self.par_longueur = {}  # {(non-terminal, n): (nombre de dérivations, empreinte ou None)}
+        self.suffixes = {}  # {(production, i, n): idem, pour production[i:]}
+
+    def longueur(self, n):
+        """
+        Calculer le nombre de dérivations et l'empreinte des mots de longueur n de l'axiome.
+
+        :param n: Longueur des mots
+        :return: Couple (nombre de dérivations, empreinte) ; l'empreinte est None si aucun mot
+        """
+        enumerateur = self.enumerateur
+        if enumerateur.axiome is None:
+            return 0, None
+        if n == 0:
+            return (1, self.identite) if enumerateur.vide else (0, None)
+        return self._symbole(enumerateur.axiome, n)
+
+    def _symbole(self, symbole, n):
+        """
+        Calculer (avec mémorisation) les dérivations de longueur n d'un symbole.
+
+        :return: Couple (nombre de dérivations, empreinte) des mots de longueur n dérivés de symbole
+        """
+        if symbole < 0:
+            return (1, self.matrices[symbole]) if n == 1 else (0, None)
+        cle = (symbole, n)
+        if cle not in self.par_longueur:
+            self.par_longueur[cle] = self._additionner(
+                self._suffixe(p, 0, n) for p in self.enumerateur.regles.get(symbole, []) if len(p) <= n)
+        return self.par_longueur[cle]
+
+    def _suffixe(self, production, i, n):
+        """
+        Calculer (avec mémorisation) les dérivations de longueur n d'une fin de production.
+
+        :return: Couple (nombre de dérivations, empreinte) des mots de longueur n dérivés de production[i:]
+        """
+        if i == len(production) - 1:
+            return self._symbole(production[i], n)
+        cle = (production, i, n)
+        if cle not in self.suffixes:
+            termes = []
+            reste = len(production) - i - 1  # Chaque symbole produit au moins une lettre
+            for k in range(1, n - reste + 1):
+                nombre, empreinte = self._symbole(production[i], k)
+                if not nombre:
+                    continue
+                nombre_fin, empreinte_fin = self._suffixe(production, i + 1, n - k)
+                if nombre_fin:
+                    termes.append((nombre * nombre_fin, empreinte @ empreinte_fin % PREMIER))
+            self.suffixes[cle] = self._additionner(termes)
+        return self.suffixes[cle]
+
+    @staticmethod
+    def _additionner(termes):
+        """
+        Additionner des couples (nombre de dérivations, empreinte).
+
+        :param termes: Itérable de couples (nombre de dérivations, empreinte)
+        :return: Leur somme, (0, None) si elle est vide
+        """
+        nombre, empreinte = 0, None
+        for nombre_terme, empreinte_terme in termes:
+            if nombre_terme:
+                nombre += nombre_terme
+                empreinte = empreinte_terme if empreinte is None else (empreinte + empreinte_terme) % PREMIER
+        return nombre, empreinte
+
+    def mots(self, n):
+        """
+        Matérialiser l'ensemble des mots de longueur n de l'axiome.
+
+        :param n: Longueur des mots
+        :return: Ensemble de mots
+        """
+        enumerateur = self.enumerateur
+        if enumerateur.axiome is None:
+            return set()
+        if n == 0:
+            return {''} if enumerateur.vide else set()
+        return enumerateur.ensemble(enumerateur.axiome, n)
+
+def comparer_grammaires(cfg_a, cfg_b, longueur_max, graine=0, journal=None):
+    """
+    Comparer les langages de deux grammaires, longueur par longueur, jusqu'à longueur_max.
+
+    Pour chaque longueur, on compare d'abord les nombres de dérivations et les empreintes (voir
+    EmpreintesLangage), sans énumérer de mots. Si tout est égal, les multiensembles de mots sont
+    égaux avec une probabilité d'erreur inférieure à n / PREMIER : les matrices sont de taille
+    n // 2 + 1, assez grandes pour qu'aucune identité polynomiale de degré n ne les annule. Sinon
+    (langages différents, ou simplement ambiguïtés différentes), les ensembles de mots de cette
+    longueur sont matérialisés et comparés ; on s'arrête à la première longueur qui diffère.
+
+    :param cfg_a: Première grammaire
+    :param cfg_b: Seconde grammaire
+    :param longueur_max: Longueur maximale comparée
+    :param graine: Graine des matrices aléatoires
+    :param journal: Fonction appelée avec une ligne de texte par longueur, optionnelle
+    :return: None si les langages coïncident jusqu'à longueur_max, sinon un triplet (plus petit mot
+             de la plus petite longueur qui les distingue, sa longueur, True s'il est engendré par A
+             et non par B)
+    """
+    rng = np.random.default_rng(graine)
+    taille = longueur_max // 2 + 1
+    lettres = sorted({cfg_a.nom(t) for t in cfg_a.terminals} | {cfg_b.nom(t) for t in cfg_b.terminals})
+    matrices = {lettre: rng.integers(0, PREMIER, (taille, taille), dtype=np.int64) for lettre in lettres}
+    a = EmpreintesLangage(cfg_a, matrices)
+    b = EmpreintesLangage(cfg_b, matrices)
+
+    for n in range(longueur_max + 1):
+        nombre_a, empreinte_a = a.longueur(n)
+        nombre_b, empreinte_b = b.longueur(n)
+        egales = (empreinte_a is None) == (empreinte_b is None) and (
+            empreinte_a is None or np.array_equal(empreinte_a, empreinte_b))
+        if nombre_a == nombre_b and egales:
+            if journal:
+                journal(f"longueur {n} : {nombre_a} dérivation(s) de part et d'autre, empreintes égales")
+            continue
+
+        mots_a, mots_b = a.mots(n), b.mots(n)
+        if mots_a == mots_b:  # Mêmes mots, mais pas avec le même nombre de dérivations
+            if journal:
+                journal(f"longueur {n} : {nombre_a} / {nombre_b} dérivation(s), mêmes {len(mots_a)} mot(s)")
+            continue
+        mot = min(mots_a ^ mots_b)
+        if journal:
+            journal(f"longueur {n} : {len(mots_a)} / {len(mots_b)} mot(s), les langages diffèrent")
+        return mot, n, mot in mots_a
+    return None
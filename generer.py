@@ -1,6 +1,15 @@
+import os
 import sys
+import copy
+import heapq
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from cfg import CFG
 from lire import read_cfg_rules
+from comptage import CompteurMots
+from dafsa import Dafsa
+from cache import CacheGrammaires, DOSSIER_CACHE
 
 class WordGenerator:
     def __init__(self, cfg):
@@ -18,20 +27,22 @@ class WordGenerator:
         :return: Liste des mots satisfaisant les conditions
         """
         results = set()
+        if self.start_symbol is None:  # Grammaire vide (langage vide), aucun mot à générer
+            return []
 
-        def expand(symbols):
+        def expand(symbols, vides):
             """
             Développer récursivement une liste de symboles.
-            :param symbols: La séquence de symboles actuelle
+            :param symbols: La séquence de symboles actuelle (tuple d'identifiants)
+            :param vides: Nombre de chaînes vides (E) produites jusqu'ici, comptées dans la longueur
             """
             # Si la longueur dépasse la limite maximale, arrêter la récursion
-            if len(symbols) > max_length:
+            if len(symbols) + vides > max_length:
                 return
 
-            # Si tous les symboles sont des terminaux ou une chaîne vide, ajouter le mot aux résultats
-            if all(symbol in self.cfg.terminals or symbol == 'E' for symbol in symbols):
-                # Supprimer 'E' et ajouter au résultat
-                word = ''.join(symbol for symbol in symbols if symbol != 'E')
+            # Si tous les symboles sont des terminaux, ajouter le mot aux résultats
+            if all(symbol < 0 for symbol in symbols):
+                word = self.cfg.nom_production(symbols) if symbols else ''
                 results.add(word)
                 return
 
@@ -39,12 +50,12 @@ class WordGenerator:
             for i, symbol in enumerate(symbols):
                 if symbol in self.cfg.non_terminals:  # Développer uniquement les non-terminaux
                     for production in self.cfg.productions.get(symbol, []):
-                        new_symbols = symbols[:i] + CFG.split_production(production) + symbols[i + 1:]
-                        expand(new_symbols)
+                        new_symbols = symbols[:i] + production + symbols[i + 1:]
+                        expand(new_symbols, vides if production else vides + 1)
                     break  # Développer un seul non-terminal pour éviter les combinaisons redondantes
 
         # Commencer le développement à partir du symbole de départ
-        expand([self.start_symbol])
+        expand((self.start_symbol,), 0)
 
         # La chaîne vide (E) est prioritaire
         sorted_results = sorted(results)
@@ -53,15 +64,469 @@ class WordGenerator:
             sorted_results.insert(0, '')  # Placer la chaîne vide en premier
         return sorted_results
 
+    def longueurs_minimales(self, poids_vide=0):
+        """
+        Calculer la longueur minimale d'un mot dérivable depuis chaque non-terminal.
+        Les non-terminaux non productifs n'apparaissent pas dans le résultat.
+        :param poids_vide: Longueur comptée pour chaque production vide appliquée (voir mots_par_longueur)
+        :return: Dictionnaire {non-terminal: longueur minimale}
+        """
+        minimum = {}
+        change = True
+        while change:
+            change = False
+            for nt, productions in self.cfg.productions.items():
+                for production in productions:
+                    longueur = 0 if production else poids_vide
+                    for symbol in production:
+                        if symbol < 0:
+                            longueur += 1
+                        elif symbol in minimum:
+                            longueur += minimum[symbol]
+                        else:
+                            break
+                    else:
+                        if longueur < minimum.get(nt, longueur + 1):
+                            minimum[nt] = longueur
+                            change = True
+        return minimum
+
+    def mots_par_longueur(self, max_length, poids_vide=0):
+        """
+        Calculer, par programmation dynamique, l'ensemble des mots de chaque longueur.
+        Pour chaque couple (non-terminal, longueur), l'ensemble des mots est calculé une seule fois
+        à partir des ensembles des longueurs inférieures : le coût dépend du nombre de mots
+        distincts et non du nombre de dérivations.
+        Avec poids_vide=1, chaque production vide appliquée compte comme une lettre : la case n
+        contient les mots w ayant une dérivation où len(w) + (nombre de productions vides) = n,
+        la mesure que generate_words borne par max_length.
+        :param max_length: Longueur maximale des mots générés
+        :param poids_vide: Longueur comptée pour chaque production vide appliquée (0 : longueur du mot)
+        :return: Liste indexée par la longueur, chaque case contenant l'ensemble des mots de l'axiome
+        """
+        if self.start_symbol is None:
+            return [set() for _ in range(max_length + 1)]
+
+        minimum = self.longueurs_minimales(poids_vide)
+        # Ne garder que les règles dont tous les symboles sont productifs
+        regles = [
+            (nt, production)
+            for nt, productions in self.cfg.productions.items()
+            for production in productions
+            if all(symbol < 0 or symbol in minimum for symbol in production)
+        ]
+        # Longueur minimale de chaque suffixe de production, pour élaguer les découpages impossibles
+        suffixes = {}
+        for _, production in regles:
+            if production not in suffixes:
+                longueurs = [0] * (len(production) + 1)
+                if not production:
+                    longueurs[0] = poids_vide
+                for i in range(len(production) - 1, -1, -1):
+                    symbol = production[i]
+                    longueurs[i] = longueurs[i + 1] + (1 if symbol < 0 else minimum[symbol])
+                suffixes[production] = longueurs
+        # Règles dont un symbole peut avoir la même longueur que la règle entière (les autres étant
+        # nullables) : elles seules dépendent d'ensembles de la même longueur et demandent un point fixe
+        recursives = [
+            (nt, production) for nt, production in regles
+            if any(symbol >= 0 and suffixes[production][0] - minimum[symbol] == 0 for symbol in production)
+        ]
+        noms = {symbol: self.cfg.nom(symbol) for _, production in regles for symbol in production if symbol < 0}
+        mots = {nt: [set() for _ in range(max_length + 1)] for nt in self.cfg.productions}
+
+        def combiner(production, i, restant, memo):
+            """
+            Calculer les mots de longueur `restant` dérivables depuis production[i:].
+            :return: Ensemble de mots
+            """
+            cle = (i, restant)
+            if cle in memo:
+                return memo[cle]
+            if i == len(production):
+                resultat = {''} if restant == suffixes[production][i] else set()
+            else:
+                symbol = production[i]
+                suite = suffixes[production][i + 1]
+                resultat = set()
+                if symbol < 0:
+                    if restant >= 1 + suite:
+                        lettre = noms[symbol]
+                        resultat = {lettre + fin for fin in combiner(production, i + 1, restant - 1, memo)}
+                else:
+                    for longueur in range(minimum[symbol], restant - suite + 1):
+                        debuts = mots[symbol][longueur]
+                        if not debuts:
+                            continue
+                        fins = combiner(production, i + 1, restant - longueur, memo)
+                        resultat.update(debut + fin for debut in debuts for fin in fins)
+            memo[cle] = resultat
+            return resultat
+
+        def appliquer(nt, production, longueur):
+            """
+            Ajouter à mots[nt][longueur] les mots produits par une règle.
+            :return: True si l'ensemble a changé
+            """
+            if suffixes[production][0] > longueur:
+                return False
+            cible = mots[nt][longueur]
+            avant = len(cible)
+            cible |= combiner(production, 0, longueur, {})
+            return len(cible) != avant
+
+        for longueur in range(max_length + 1):
+            for nt, production in regles:
+                appliquer(nt, production, longueur)
+            change = True
+            while change:
+                change = False
+                for nt, production in recursives:
+                    if appliquer(nt, production, longueur):
+                        change = True
+
+        return mots.get(self.start_symbol, [set() for _ in range(max_length + 1)])
+
+    def generate_words_dp(self, max_length):
+        """
+        Générer les mots par programmation dynamique, avec le même résultat et le même ordre que
+        generate_words : comme lui, chaque production vide appliquée compte dans la longueur
+        (mots_par_longueur avec poids_vide=1). Pour une grammaire dont seul l'axiome a une
+        production vide (forme de Chomsky ou de Greibach), ce sont tous les mots de longueur au
+        plus max_length.
+        :param max_length: Longueur maximale des mots générés
+        :return: Liste triée des mots
+        """
+        results = set()
+        for ensemble in self.mots_par_longueur(max_length, poids_vide=1):
+            results |= ensemble
+        return sorted(results)  # La chaîne vide est la plus petite, elle reste en tête
+
+    def iter_words(self, max_length, limite_cache=1000000):
+        """
+        Énumérer paresseusement les mots, longueur par longueur, dans l'ordre longueur puis
+        lexicographique (la chaîne vide en premier).
+        Les mots d'un couple (non-terminal, longueur) sont produits à la demande par fusion de flux
+        triés, sans construire l'ensemble complet ; seuls les petits ensembles sont gardés en cache,
+        dans la limite de limite_cache mots au total.
+        :param max_length: Longueur maximale des mots générés
+        :param limite_cache: Nombre maximal de mots conservés en cache
+        :return: Itérateur sur les mots
+        """
+        if self.start_symbol is None:
+            return
+        enumerateur = EnumerateurParesseux(EnumerateurParesseux.preparer(self.cfg), limite_cache)
+        if enumerateur.vide:
+            yield ''
+        for n in range(1, max_length + 1):
+            yield from enumerateur.mots(enumerateur.axiome, n)
+
+    def iter_words_lexicographique(self, max_length, limite_cache=1000000):
+        """
+        Énumérer paresseusement les mots de longueur au plus max_length dans l'ordre lexicographique
+        (celui de generate_words_dp), par fusion des flux triés de chaque longueur.
+        Les longueurs inférieures à max_length sont d'abord parcourues une fois, dans l'ordre, pour
+        remplir le cache : sinon tous les flux démarrent ensemble et aucun ne profite des mots
+        déjà produits par les autres.
+        :param max_length: Longueur maximale des mots générés
+        :param limite_cache: Nombre maximal de mots conservés en cache
+        :return: Itérateur sur les mots
+        """
+        if self.start_symbol is None:
+            return
+        enumerateur = EnumerateurParesseux(EnumerateurParesseux.preparer(self.cfg), limite_cache)
+        for n in range(1, max_length):
+            for _ in enumerateur.mots(enumerateur.axiome, n):
+                pass
+        if enumerateur.vide:
+            yield ''
+        yield from heapq.merge(*[enumerateur.mots(enumerateur.axiome, n) for n in range(1, max_length + 1)])
+
+    def generate_dafsa(self, max_length):
+        """
+        Construire l'automate minimal (voir dafsa.Dafsa) des mots de longueur au plus max_length,
+        directement depuis le flux trié des mots, sans jamais en garder la liste.
+        :param max_length: Longueur maximale des mots générés
+        :return: Le Dafsa
+        """
+        return Dafsa.depuis_mots(self.iter_words_lexicographique(max_length), max_length)
+
+    def generate_words_parallele(self, max_length, jobs):
+        """
+        Générer tous les mots de longueur au plus max_length avec un groupe de processus.
+        L'espace des dérivations est découpé en tâches (alternative de l'axiome, longueur, longueur
+        du premier symbole) ; chaque processus reçoit une fois la forme compacte de la grammaire et
+        renvoie la liste triée des mots de chaque tâche. Les listes sont ensuite fusionnées
+        (fusion à k voies) et dédoublonnées. Le résultat est la liste de tous les mots de longueur
+        au plus max_length : celle de generate_words_dp quand seul l'axiome a une production vide
+        (forme de Chomsky ou de Greibach).
+        :param max_length: Longueur maximale des mots générés
+        :param jobs: Nombre de processus
+        :return: Liste triée des mots
+        """
+        if self.start_symbol is None:
+            return []
+        grammaire = EnumerateurParesseux.preparer(self.cfg)
+        enumerateur = EnumerateurParesseux(grammaire, 0)
+        # Les tâches les plus longues d'abord, pour équilibrer la charge
+        taches = [
+            (index, n, premier)
+            for n in range(max_length, 0, -1)
+            for index, production in enumerate(enumerateur.regles.get(enumerateur.axiome, []))
+            for premier in enumerateur.longueurs_premier(production, n)
+        ]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser_processus,
+                                 initargs=(grammaire.vers_compact(),)) as executor:
+            listes = list(executor.map(_executer_tache, taches))
+
+        results = [''] if enumerateur.vide else []
+        precedent = None
+        for word in heapq.merge(*listes):
+            if word != precedent:
+                results.append(word)
+                precedent = word
+        return results
+
+class EnumerateurParesseux:
+    def __init__(self, grammaire, limite_cache=1000000):
+        """
+        Initialiser l'énumération paresseuse des mots d'une grammaire préparée par preparer().
+        :param grammaire: L'objet CFG sans productions vides (hors axiome) ni unitaires
+        :param limite_cache: Nombre maximal de mots conservés en cache
+        """
+        self.axiome = grammaire.axiome
+        self.vide = () in grammaire.productions.get(grammaire.axiome, [])
+        self.minimum = WordGenerator(grammaire).longueurs_minimales()
+        self.regles = {
+            nt: [p for p in productions if p and all(symbol < 0 or symbol in self.minimum for symbol in p)]
+            for nt, productions in grammaire.productions.items()
+        }
+        self.noms = {symbol: grammaire.nom(symbol) for symbol in grammaire.terminals}
+        self.cache = {}
+        self.budget = limite_cache
+        self.ensembles = {}  # Ensembles matérialisés, voir ensemble()
+
+    @staticmethod
+    def preparer(cfg):
+        """
+        Retourner une copie de la grammaire sans productions vides ni unitaires : chaque symbole
+        d'une règle produit alors au moins une lettre, et un mot de longueur n ne dépend que de
+        longueurs < n.
+        :param cfg: L'objet CFG (non modifié)
+        :return: Nouvel objet CFG
+        """
+        grammaire = copy.deepcopy(cfg)
+        grammaire.eliminer_epsilon_regles()
+        grammaire.eliminer_unit_regles()
+        grammaire.supprimer_unused_non_terminal()
+        return grammaire
+
+    def longueur_min(self, symbol):
+        """
+        Longueur minimale d'un symbole à l'intérieur d'une règle (au moins 1).
+        """
+        return 1 if symbol < 0 else max(1, self.minimum[symbol])
+
+    def longueurs_premier(self, production, n):
+        """
+        Lister les longueurs possibles du premier symbole d'une production de longueur totale n.
+        """
+        if len(production) > n:
+            return []
+        reste = sum(self.longueur_min(symbol) for symbol in production[1:])
+        if len(production) == 1:
+            return [n] if self.longueur_min(production[0]) <= n else []
+        return list(range(self.longueur_min(production[0]), n - reste + 1))
+
+    def mots(self, nt, n):
+        """
+        Produire les mots de longueur n dérivables depuis nt, triés et sans doublons.
+        """
+        if (nt, n) in self.cache:
+            yield from self.cache[(nt, n)]
+            return
+        flux = heapq.merge(*[
+            self.produit(p, 0, n, sum(self.longueur_min(symbol) for symbol in p))
+            for p in self.regles.get(nt, []) if len(p) <= n
+        ])
+        tampon = [] if self.budget > 0 else None
+        precedent = None
+        for mot in flux:
+            if mot == precedent:  # Doublon venant d'une autre règle ou d'un autre découpage
+                continue
+            precedent = mot
+            if tampon is not None:
+                tampon.append(mot)
+                if len(tampon) > self.budget:
+                    tampon = None  # Trop gros pour le cache : il sera regénéré à la demande
+            yield mot
+        if tampon is not None and (nt, n) not in self.cache:
+            self.cache[(nt, n)] = tampon
+            self.budget -= len(tampon)
+
+    def flux(self, production, i, restant, minimum_reste, longueur):
+        """
+        Produire, triés, les mots de production[i:] de longueur restant, le symbole i ayant la
+        longueur donnée : le début étant de longueur fixe, l'ordre des débuts puis des fins suffit.
+        """
+        symbol = production[i]
+        suite = minimum_reste - self.longueur_min(symbol)
+        debuts = [self.noms[symbol]] if symbol < 0 else self.mots(symbol, longueur)
+        for debut in debuts:
+            for fin in self.produit(production, i + 1, restant - longueur, suite):
+                yield debut + fin
+
+    def produit(self, production, i, restant, minimum_reste):
+        """
+        Produire, triés, les mots de longueur restant dérivables depuis production[i:].
+        Chaque longueur donnée au symbole i forme un flux trié, les flux sont fusionnés.
+        """
+        symbol = production[i]
+        suite = minimum_reste - self.longueur_min(symbol)
+        if i == len(production) - 1:
+            if symbol < 0:
+                if restant == 1:
+                    yield self.noms[symbol]
+            else:
+                yield from self.mots(symbol, restant)
+            return
+
+        if symbol < 0:
+            if restant - 1 >= suite:
+                yield from self.flux(production, i, restant, minimum_reste, 1)
+        else:
+            yield from heapq.merge(*[
+                self.flux(production, i, restant, minimum_reste, longueur)
+                for longueur in range(self.longueur_min(symbol), restant - suite + 1)
+            ])
+
+    def ensemble(self, nt, n):
+        """
+        Retourner l'ensemble (matérialisé et mémorisé) des mots de longueur n dérivables depuis nt.
+        Plus rapide que mots() mais sans borne sur la mémoire : utilisé par les processus du groupe.
+        """
+        cle = (nt, n)
+        if cle not in self.ensembles:
+            resultat = set()
+            for p in self.regles.get(nt, []):
+                if len(p) <= n:
+                    resultat |= self.ensemble_production(p, 0, n)
+            self.ensembles[cle] = resultat
+        return self.ensembles[cle]
+
+    def ensemble_production(self, production, i, restant, premier=None):
+        """
+        Retourner l'ensemble des mots de longueur restant dérivables depuis production[i:].
+        :param premier: Si donné, longueur imposée au symbole i
+        """
+        symbol = production[i]
+        if i == len(production) - 1:
+            if symbol < 0:
+                return {self.noms[symbol]} if restant == 1 else set()
+            return self.ensemble(symbol, restant)
+
+        suite = sum(self.longueur_min(s) for s in production[i + 1:])
+        if symbol < 0:
+            longueurs = [1]
+        elif premier is not None:
+            longueurs = [premier]
+        else:
+            longueurs = range(self.longueur_min(symbol), restant - suite + 1)
+        resultat = set()
+        for longueur in longueurs:
+            if restant - longueur < suite:
+                continue
+            debuts = {self.noms[symbol]} if symbol < 0 else self.ensemble(symbol, longueur)
+            if not debuts:
+                continue
+            cle = (production, i + 1, restant - longueur)
+            fins = self.ensembles.get(cle)
+            if fins is None:  # Les suffixes sont partagés par tous les débuts : les mémoriser
+                fins = self.ensembles[cle] = self.ensemble_production(production, i + 1, restant - longueur)
+            resultat.update(debut + fin for debut in debuts for fin in fins)
+        return resultat
+
+# Énumérateur propre à chaque processus du groupe, construit une seule fois par processus
+_enumerateur_processus = None
+
+def _initialiser_processus(etat):
+    """
+    Reconstruire la grammaire depuis sa forme compacte dans un processus du groupe.
+    :param etat: Forme compacte produite par CFG.vers_compact()
+    """
+    global _enumerateur_processus
+    _enumerateur_processus = EnumerateurParesseux(CFG.depuis_compact(etat))
+
+def _executer_tache(tache):
+    """
+    Calculer les mots d'une tâche (alternative de l'axiome, longueur, longueur du premier symbole).
+    :param tache: Triplet (indice de l'alternative, longueur totale, longueur du premier symbole)
+    :return: Liste triée des mots
+    """
+    index, n, premier = tache
+    enumerateur = _enumerateur_processus
+    production = enumerateur.regles[enumerateur.axiome][index]
+    return sorted(enumerateur.ensemble_production(production, 0, n, premier))
+
 if __name__ == "__main__":
     # Vérifier les arguments de la ligne de commande
-    if len(sys.argv) != 3:
-        print("Utilisation : python3 generer.py <file_path> <max_length>")
+    parser = argparse.ArgumentParser(usage="python3 generer.py <file_path> <max_length> [options]\n"
+                                           "       python3 generer.py --compare A B n")
+    parser.add_argument("file_path", nargs="?")
+    parser.add_argument("max_length", nargs="?")
+    parser.add_argument("--compare", nargs=3, metavar=("A", "B", "n"),
+                        help="comparer les langages de deux grammaires longueur par longueur jusqu'à n "
+                             "et afficher le plus court mot qui les distingue")
+    parser.add_argument("--methode", choices=["dp", "derivation"], default="dp",
+                        help="dp : programmation dynamique par longueur (par défaut) ; "
+                             "derivation : développement exhaustif à gauche")
+    parser.add_argument("--flux", action="store_true",
+                        help="écrire les mots au fur et à mesure, par longueur puis par ordre "
+                             "lexicographique, sans les garder en mémoire")
+    parser.add_argument("--dafsa", metavar="FICHIER",
+                        help="écrire les mots sous forme d'automate minimal (DAFSA) dans FICHIER, construit "
+                             "au fil de l'énumération ; à interroger ou développer avec dafsa.py")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="répartir la génération sur N processus (sortie identique)")
+    parser.add_argument("--cache", metavar="DOSSIER", nargs="?", const=DOSSIER_CACHE,
+                        help="avec la méthode dp : réutiliser les tables de mots par longueur "
+                             f"enregistrées dans le cache (par défaut : {DOSSIER_CACHE})")
+    parser.add_argument("--count", action="store_true",
+                        help="afficher le nombre de dérivations de longueur exactement max_length "
+                             "(le nombre de mots si la grammaire n'est pas ambiguë)")
+    parser.add_argument("--sample", type=int, metavar="k",
+                        help="tirer k mots de longueur exactement max_length uniformément au hasard")
+    parser.add_argument("--distincts", action="store_true",
+                        help="avec --count ou --sample : ne pas compter plusieurs fois un mot ambigu")
+    parser.add_argument("--graine", type=int, help="graine du générateur aléatoire pour --sample")
+    args = parser.parse_args()
+
+    if args.compare:
+        from equivalence import comparer_grammaires  # Import local : NumPy n'est nécessaire qu'ici
+        fichier_a, fichier_b, longueur = args.compare
+        if not longueur.isdigit():
+            print("Erreur : n doit être un entier positif ou nul")
+            sys.exit(2)
+        grammaires = [read_cfg_rules(fichier_a), read_cfg_rules(fichier_b)]
+        if None in grammaires:
+            print("Échec de la lecture des règles CFG, veuillez vérifier le contenu du fichier.")
+            sys.exit(2)
+        difference = comparer_grammaires(*grammaires, int(longueur), journal=print)
+        if difference is None:
+            print(f"Les langages de {fichier_a} et {fichier_b} coïncident jusqu'à la longueur {longueur}.")
+            sys.exit(0)
+        mot, n, dans_a = difference
+        present, absent = (fichier_a, fichier_b) if dans_a else (fichier_b, fichier_a)
+        print(f"Les langages diffèrent : '{mot if mot != '' else 'E'}' (longueur {n}) est engendré par "
+              f"{present} mais pas par {absent}.")
         sys.exit(1)
 
-    file_path = sys.argv[1]
+    if args.file_path is None or args.max_length is None:
+        parser.error("<file_path> et <max_length> sont nécessaires")
+
+    file_path = args.file_path
     try:
-        max_length = int(sys.argv[2])
+        max_length = int(args.max_length)
         if max_length <= 0:
             raise ValueError
     except ValueError:
@@ -74,9 +539,70 @@ if __name__ == "__main__":
         print("Échec de la lecture des règles CFG, veuillez vérifier le contenu du fichier.")
         sys.exit(1)
 
+    if args.count or args.sample is not None:
+        # Le comptage travaille sur la forme normale de Chomsky
+        try:
+            compteur = CompteurMots(cfg_rules)
+        except ValueError:
+            cfg_rules.chomsky()
+            compteur = CompteurMots(cfg_rules)
+        if args.count:
+            try:
+                nombre = compteur.compter(max_length, args.distincts)
+            except ValueError as e:
+                print(f"Erreur : {e}")
+                sys.exit(1)
+            if args.distincts:
+                print(f"Nombre de mots distincts de longueur {max_length} : {nombre}")
+            else:
+                print(f"Nombre de dérivations de longueur {max_length} : {nombre}")
+        if args.sample is not None:
+            try:
+                echantillon = compteur.echantillonner(max_length, args.sample, args.distincts,
+                                                      random.Random(args.graine))
+            except ValueError as e:
+                print(f"Erreur : {e}")
+                sys.exit(1)
+            for word in echantillon:
+                print(word if word != '' else 'E')
+        sys.exit(0)
+
     # Générer les mots
     generator = WordGenerator(cfg_rules)
-    words = generator.generate_words(max_length)
+    if args.dafsa:
+        automate = generator.generate_dafsa(max_length)
+        automate.ecrire(args.dafsa)
+        etats, transitions = automate.taille()
+        print(f"{len(automate)} mot(s) de longueur au plus {max_length} écrits dans {args.dafsa} : "
+              f"{etats} état(s), {transitions} transition(s)")
+        sys.exit(0)
+    if args.flux:
+        print(f"Mots générés (longueur maximale {max_length}) :", flush=True)
+        tampon = []
+        try:
+            for word in generator.iter_words(max_length):
+                tampon.append(word if word != '' else 'E')
+                if len(tampon) >= 4096:  # Écrire par blocs pour limiter les appels système
+                    sys.stdout.write('\n'.join(tampon) + '\n')
+                    sys.stdout.flush()
+                    tampon = []
+            if tampon:
+                sys.stdout.write('\n'.join(tampon) + '\n')
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Le programme en aval (head, grep -m ...) a fermé le tube : arrêter sans erreur
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
+
+    if args.jobs > 1:
+        words = generator.generate_words_parallele(max_length, args.jobs)
+    elif args.methode == "dp" and args.cache is not None:
+        # Mêmes tables que generate_words_dp (productions vides comptées dans la longueur)
+        words = sorted(set().union(*CacheGrammaires(args.cache).mots_par_longueur(generator, max_length, 1)))
+    elif args.methode == "dp":
+        words = generator.generate_words_dp(max_length)
+    else:
+        words = generator.generate_words(max_length)
 
     # Afficher les mots générés
     print(f"Mots générés (longueur maximale {max_length}) :")
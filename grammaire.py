@@ -1,22 +1,244 @@
+import io
+import os
+import sys
+import time
+import argparse
+import contextlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import lire
 import ecrire
+from pipeline import Pipeline, etapes_normalisation
+from cfg import METHODES_GREIBACH
+from cache import CacheGrammaires, DOSSIER_CACHE
+from instrumentation import Trace
+
+def afficher_taille(algebre):
+    """
+    Afficher la taille de la grammaire, pour suivre les régressions.
+
+    :param algebre: L'objet CFG
+    """
+    non_terminaux, regles, symboles = algebre.taille()
+    print(f"{non_terminaux} non-terminaux, {regles} règles, {symboles} symboles")
+
+def lister_grammaires(chemins):
+    """
+    Développer une liste de fichiers et de dossiers en liste de fichiers de grammaire.
+
+    :param chemins: Liste de chemins ; un dossier est remplacé par ses fichiers *.general, triés
+    :return: Liste de chemins de fichiers, sans doublon
+    """
+    fichiers = {}  # Dictionnaire utilisé comme ensemble ordonné
+    for chemin in chemins:
+        if os.path.isdir(chemin):
+            for nom in sorted(os.listdir(chemin)):
+                if nom.endswith(".general"):
+                    fichiers[os.path.join(chemin, nom)] = None
+        else:
+            fichiers[chemin] = None
+    return list(fichiers)
+
+def normaliser(algebre, dossier_cache=None, minimiser=False, methode="substitution"):
+    """
+    Calculer les formes normales de Chomsky et de Greibach, en passant par le cache si demandé.
+
+    La forme de Greibach est calculée à partir de la forme de Chomsky (voir pipeline.Pipeline),
+    sans modifier ni recopier les règles de la grammaire lue.
+
+    :param algebre: L'objet CFG lu (non modifié)
+    :param dossier_cache: Dossier du cache des grammaires normalisées, None pour ne pas l'utiliser
+    :param minimiser: Fusionner les non-terminaux équivalents (voir CFG.minimiser)
+    :param methode: Méthode de conversion en forme de Greibach (voir CFG.greibach)
+    :return: Triplet (forme de Chomsky, forme de Greibach, True si le résultat venait du cache)
+    """
+    if dossier_cache is not None:
+        return CacheGrammaires(dossier_cache).normaliser(algebre, minimiser, methode)
+    chomsky, greibach = Pipeline(algebre).calculer(*etapes_normalisation(minimiser, methode))
+    return chomsky, greibach, False
+
+def normaliser_fichier(chemin, dossier_sortie=None, dossier_cache=None, tracer=False, binaire=False,
+                       minimiser=False, methode="substitution"):
+    """
+    Calculer les formes normales de Chomsky et de Greibach d'un fichier de grammaire.
+
+    Les sorties sont écrites à côté de l'entrée (ou dans dossier_sortie) sous les noms
+    <nom>.chomsky et <nom>.greibach. Toute erreur est capturée et renvoyée dans le résultat,
+    pour qu'un fichier invalide n'interrompe pas le traitement des autres.
+
+    :param chemin: Chemin du fichier de grammaire
+    :param dossier_sortie: Dossier des fichiers produits, optionnel
+    :param dossier_cache: Dossier du cache des grammaires normalisées, None pour ne pas l'utiliser
+    :param tracer: Enregistrer une trace des étapes (voir instrumentation.Trace) dans le résultat
+    :param binaire: Écrire les sorties au format binaire (voir ecrire.ecrire_binaire)
+    :param minimiser: Fusionner les non-terminaux équivalents (voir CFG.minimiser)
+    :param methode: Méthode de conversion en forme de Greibach (voir CFG.greibach)
+    :return: Dictionnaire {fichier, erreur, duree, cache, chomsky, greibach[, trace]} ; chomsky et
+             greibach sont les tailles retournées par CFG.taille()
+    """
+    resultat = {"fichier": chemin, "erreur": None, "duree": 0.0, "cache": False, "chomsky": None, "greibach": None}
+    base = os.path.splitext(os.path.basename(chemin))[0]
+    dossier = dossier_sortie if dossier_sortie is not None else os.path.dirname(chemin)
+    messages = io.StringIO()  # Les messages de lire et ecrire sont gardés pour le rapport d'erreur
+    trace = Trace() if tracer else None
+    debut = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(messages):
+            algebre = lire.read_cfg_rules(chemin)
+            if algebre is None:
+                raise ValueError(messages.getvalue().strip() or "lecture impossible")
+            if trace is not None:
+                algebre.observateurs.append(trace)
+            chomsky, greibach, resultat["cache"] = normaliser(algebre, dossier_cache, minimiser, methode)
+            resultat["chomsky"] = chomsky.taille()
+            resultat["greibach"] = greibach.taille()
+            ecrire_sortie = ecrire.ecrire_binaire if binaire else ecrire.write_to_file
+            ecrire_sortie(chomsky, os.path.join(dossier, base + ".chomsky"))
+            ecrire_sortie(greibach, os.path.join(dossier, base + ".greibach"))
+    except Exception as e:
+        resultat["erreur"] = f"{type(e).__name__}: {e}"
+    resultat["duree"] = time.perf_counter() - debut
+    if trace is not None:
+        resultat["trace"] = trace.enregistrements
+    return resultat
+
+def normaliser_lot(fichiers, jobs=None, dossier_sortie=None, dossier_cache=None, tracer=False, binaire=False,
+                   minimiser=False, methode="substitution"):
+    """
+    Normaliser un lot de fichiers de grammaire en parallèle sur un groupe de processus.
+
+    Chaque processus importe les modules une seule fois et traite plusieurs fichiers. Si un
+    processus meurt (mémoire épuisée, signal...), les fichiers qui n'ont pas pu être traités
+    sont marqués en erreur et les autres résultats sont conservés.
+
+    :param fichiers: Liste de chemins de fichiers de grammaire
+    :param jobs: Nombre de processus (par défaut, le nombre de processeurs)
+    :param dossier_sortie: Dossier des fichiers produits, optionnel
+    :param dossier_cache: Dossier du cache des grammaires normalisées, None pour ne pas l'utiliser
+    :param tracer: Enregistrer une trace des étapes pour chaque fichier
+    :param binaire: Écrire les sorties au format binaire
+    :param minimiser: Fusionner les non-terminaux équivalents
+    :param methode: Méthode de conversion en forme de Greibach
+    :return: Liste des résultats de normaliser_fichier, dans l'ordre de fichiers
+    """
+    resultats = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executeur:
+        futurs = {executeur.submit(normaliser_fichier, chemin, dossier_sortie, dossier_cache, tracer, binaire,
+                                    minimiser, methode): chemin for chemin in fichiers}
+        for futur in as_completed(futurs):
+            chemin = futurs[futur]
+            try:
+                resultats[chemin] = futur.result()
+            except BrokenProcessPool as e:
+                resultats[chemin] = {"fichier": chemin, "erreur": f"processus interrompu ({e})",
+                                     "duree": 0.0, "cache": False, "chomsky": None, "greibach": None}
+    return [resultats[chemin] for chemin in fichiers]
+
+def afficher_resume(resultats, duree_totale):
+    """
+    Afficher le résumé d'un lot : durée et taille des sorties pour chaque fichier, puis les erreurs.
+
+    :param resultats: Liste des résultats de normaliser_fichier
+    :param duree_totale: Durée totale du lot en secondes
+    """
+    largeur = max([len(r["fichier"]) for r in resultats] + [len("fichier")])
+    print(f"{'fichier':<{largeur}}  {'durée (s)':>9}  {'règles CNF':>10}  {'règles GNF':>10}  {'symboles GNF':>12}")
+    for r in resultats:
+        if r["erreur"] is None:
+            print(f"{r['fichier']:<{largeur}}  {r['duree']:>9.3f}  {r['chomsky'][1]:>10}  "
+                  f"{r['greibach'][1]:>10}  {r['greibach'][2]:>12}{'  (cache)' if r['cache'] else ''}")
+        else:
+            print(f"{r['fichier']:<{largeur}}  {r['duree']:>9.3f}  {'ÉCHEC':>10}")
+    erreurs = [r for r in resultats if r["erreur"] is not None]
+    for r in erreurs:
+        print(f"Erreur dans {r['fichier']} : {r['erreur']}")
+    print(f"{len(resultats) - len(erreurs)} fichier(s) normalisé(s), {len(erreurs)} échec(s) en {duree_totale:.3f} s")
+
+def ecrire_trace(destination, traces):
+    """
+    Écrire les traces des étapes au format JSON.
+
+    :param destination: Chemin du fichier, ou '-' pour la sortie standard
+    :param traces: Liste de {fichier, etapes}, etapes étant les enregistrements d'une Trace
+    """
+    texte = json.dumps(traces, ensure_ascii=False, indent=1)
+    if destination == '-':
+        print(texte)
+    else:
+        with open(destination, 'w', encoding='utf-8') as fichier:
+            fichier.write(texte + '\n')
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(usage="python3 grammaire.py [fichiers ou dossiers ...] [options]")
+    parser.add_argument("chemins", nargs="*",
+                        help="fichiers de grammaire ou dossiers de fichiers *.general ; sans argument, "
+                             "cfg.general est normalisé dans alg.chomsky et alg.greibach")
+    parser.add_argument("--jobs", type=int, default=None, metavar="N",
+                        help="nombre de processus pour le traitement par lot (par défaut : nombre de processeurs)")
+    parser.add_argument("--sortie", metavar="DOSSIER",
+                        help="dossier des fichiers <nom>.chomsky et <nom>.greibach (par défaut : à côté de l'entrée)")
+    parser.add_argument("--cache", metavar="DOSSIER", default=DOSSIER_CACHE,
+                        help=f"dossier du cache des grammaires normalisées (par défaut : {DOSSIER_CACHE})")
+    parser.add_argument("--sans-cache", action="store_true",
+                        help="toujours recalculer les formes normales, sans lire ni écrire le cache")
+    parser.add_argument("--trace", metavar="FICHIER",
+                        help="écrire une trace JSON des étapes (durée, temps CPU, allocations, tailles "
+                             "avant et après) dans FICHIER ('-' : sortie standard) ; le cache est ignoré")
+    parser.add_argument("--minimiser", action="store_true",
+                        help="fusionner les non-terminaux équivalents et supprimer les règles en double "
+                             "dans les formes normales")
+    parser.add_argument("--greibach", choices=METHODES_GREIBACH, default="substitution",
+                        help="méthode de conversion en forme de Greibach : substitution (par défaut) ou "
+                             "coin_gauche (transformation du coin gauche, sortie de taille polynomiale)")
+    parser.add_argument("--binaire", action="store_true",
+                        help="écrire les formes normales au format binaire compact, relu sans analyse "
+                             "de texte par generer.py, appartenance.py et grammaire.py")
+    args = parser.parse_args()
+    # Une trace doit observer les étapes : les résultats ne sont alors ni lus ni écrits dans le cache
+    dossier_cache = None if args.sans_cache or args.trace else args.cache
+
+    if args.chemins:
+        # Traitement par lot : un fichier invalide est signalé sans interrompre les autres
+        fichiers = lister_grammaires(args.chemins)
+        if not fichiers:
+            print("Aucun fichier de grammaire trouvé.")
+            sys.exit(1)
+        if args.sortie is not None:
+            os.makedirs(args.sortie, exist_ok=True)
+        debut = time.perf_counter()
+        resultats = normaliser_lot(fichiers, args.jobs, args.sortie, dossier_cache, args.trace is not None,
+                                   args.binaire, args.minimiser, args.greibach)
+        afficher_resume(resultats, time.perf_counter() - debut)
+        if args.trace:
+            ecrire_trace(args.trace, [{"fichier": r["fichier"], "etapes": r.get("trace", [])} for r in resultats])
+        sys.exit(1 if any(r["erreur"] is not None for r in resultats) else 0)
+
     # Peut supprimer les commentaires pour afficher plus clairement la structure de la grammaire
-    file_path = "cfg.general"  
+    file_path = "cfg.general"
     algebre = lire.read_cfg_rules(file_path)
+    if algebre is None:
+        sys.exit(1)
     # print("Grammaires algébriques:")
-    # algebre.display()     
-    algebre.chomsky()
+    # algebre.display()
+    trace = Trace() if args.trace else None
+    if trace is not None:
+        algebre.observateurs.append(trace)
+    ecrire_sortie = ecrire.ecrire_binaire if args.binaire else ecrire.write_to_file
+    debut = time.perf_counter()
+    chomsky, greibach, trouve = normaliser(algebre, dossier_cache, args.minimiser, args.greibach)
+    duree = time.perf_counter() - debut
     print("-" * 50)
     print("Forme normale de Chomsky:")
-    # algebre.display()
-    ecrire.write_to_file(algebre,"alg.chomsky")
-    algebre.greibach()
+    afficher_taille(chomsky)
+    # chomsky.display()
+    ecrire_sortie(chomsky,"alg.chomsky")
     print("-" * 50)
     print("Forme normale de Greibach:")
-    #algebre.display()
-    ecrire.write_to_file(algebre,"alg.greibach")
+    afficher_taille(greibach)
+    #greibach.display()
+    ecrire_sortie(greibach,"alg.greibach")
     print("-" * 50)
-    
-    
\ No newline at end of file
+    print(f"Durée de la normalisation : {duree:.3f} s{' (résultat lu dans le cache)' if trouve else ''}")
+    if trace is not None:
+        ecrire_trace(args.trace, [{"fichier": file_path, "etapes": trace.enregistrements}])
@@ -0,0 +1,374 @@
+import sys
+import random
+import argparse
+from itertools import product
+from cfg import CFG, LETTRES_NON_TERMINAUX
+
+class ChomskyIncrementale:
+    def __init__(self, cfg):
+        """
+        Maintenir la forme normale de Chomsky d'une grammaire à laquelle on ajoute des règles.
+
+        Les étapes de CFG.chomsky() sont tenues à jour règle par règle au lieu d'être
+        recalculées sur toute la grammaire :
+        - les tables d'extraction des terminaux (a -> T) et de binarisation (XY -> P) sont
+          conservées, une règle ajoutée est découpée sans toucher aux autres ;
+        - les non-terminaux nullables sont propagés par compteurs (comme dans
+          AnalyseGrammaire._propager) ; seules les règles nouvelles et celles qui contiennent un
+          non-terminal devenu nullable sont redéveloppées ;
+        - la fermeture unitaire (ensemble des non-terminaux atteints par des règles unitaires,
+          et son inverse) est étendue arc par arc, et une règle non unitaire nouvelle n'est
+          propagée qu'aux non-terminaux qui atteignent son membre gauche.
+        Le nettoyage final (symboles inutiles) est fait à l'export, par chomsky().
+
+        :param cfg: L'objet CFG de départ (non modifié, il est copié)
+        """
+        self.source = CFG.depuis_compact(cfg.vers_compact())  # Grammaire d'origine, règles ajoutées comprises
+        self.symboles = self.source.symboles  # Table partagée avec la forme normale
+        self.auxiliaires = set()  # Non-terminaux créés par l'extraction des terminaux et la binarisation
+        self.prochain_nom = 0  # Comme CFG.prochain_non_terminal : les noms d'indice inférieur sont pris
+
+        # Étapes 1 et 2 : extraction des terminaux et binarisation
+        self.terminal_de = {}  # {terminal: non-terminal T, avec T -> terminal}
+        self.paire_de = {}  # {(X, Y): non-terminal P, avec P -> XY}
+        self.binaires = []  # Règles de longueur au plus 2 : (gauche, droite)
+        self.index_binaires = set()  # Les mêmes, pour éliminer les doublons
+        self._nouvelles = []  # Numéros des règles binaires créées par l'ajout en cours
+
+        # Étape 3 : règles nullables
+        self.nullables = set()
+        self.compteurs = []  # Pour chaque règle binaire, nombre de ses symboles pas encore nullables
+        self.occurrences = {}  # {non-terminal: [numéros de règles binaires, une entrée par occurrence]}
+        self.sans_vide = {}  # {non-terminal: règles sans production vide (dictionnaire ordonné)}
+
+        # Étape 4 : fermeture unitaire
+        self.atteints = {}  # {A: non-terminaux B tels que A ->* B par des règles unitaires (A compris)}
+        self.inverse = {}  # {B: non-terminaux A tels que B est dans atteints[A]}
+        self.unitaires = {}  # {A: cibles des règles unitaires de A}
+        self.regles = {}  # {A: règles de la forme normale (dictionnaire ordonné)}
+
+        self._ajouter_regles([(nt, prod) for nt, prods in self.source.productions.items() for prod in prods])
+
+    def add_production(self, non_terminal, production_list):
+        """
+        Ajouter des règles à la grammaire d'origine et mettre à jour la forme normale.
+
+        :param non_terminal: Non-terminal
+        :param production_list: Liste des productions (list de str), comme pour CFG.add_production
+        :raises ValueError: Si un non-terminal ou une production n'est pas valide
+        """
+        if not CFG.is_valid_non_terminal(non_terminal):
+            raise ValueError(f"'{non_terminal}' n'est pas un non-terminal valide !")
+        for production in production_list:
+            if not CFG.is_valid_production(production):
+                raise ValueError(f"'{production}' n'est pas une production valide !")
+
+        # Un nom choisi pour un non-terminal créé peut ensuite apparaître dans la grammaire
+        # d'origine : le non-terminal créé est alors renommé (son identifiant ne change pas).
+        # Le nouveau nom ne doit être aucun des noms de cet ajout, pas encore dans la table.
+        noms = [non_terminal] + [s for p in production_list for s in CFG.split_production(p) if s.isupper() and s != 'E']
+        reserves = set(noms)
+        for nom in noms:
+            symbole = self.symboles.ids.get(nom)
+            if symbole in self.auxiliaires:
+                self._renommer(symbole, reserves)
+
+        nt = self.symboles.non_terminal(non_terminal)
+        deja = len(self.source.productions.get(nt, []))
+        self.source.add_production(non_terminal, production_list)
+        self._ajouter_regles([(nt, prod) for prod in self.source.productions[nt][deja:]])
+
+    def _nom_libre(self, reserves=()):
+        """
+        Choisir un nom de non-terminal encore absent de la table des symboles.
+
+        Les noms sont énumérés dans le même ordre que par CFG.generer_new_non_terminal.
+
+        :param reserves: Noms à éviter en plus de ceux de la table
+        :return: Nom du non-terminal
+        """
+        while True:
+            index = self.prochain_nom
+            self.prochain_nom += 1
+            nom = f"{LETTRES_NON_TERMINAUX[index % 25]}{index // 25}"
+            if nom not in self.symboles.ids and nom not in reserves:
+                return nom
+
+    def _renommer(self, symbole, reserves=()):
+        """
+        Donner un nouveau nom à un non-terminal créé, pour libérer son nom actuel.
+
+        :param symbole: Identifiant du non-terminal créé
+        :param reserves: Noms à ne pas donner (noms de l'ajout en cours, pas encore dans la table)
+        """
+        symboles = self.symboles
+        nom = self._nom_libre(reserves)
+        del symboles.ids[symboles.nom(symbole)]
+        symboles.noms_non_terminaux[symbole] = nom
+        symboles.ids[nom] = symbole
+
+    def _auxiliaire(self, droite):
+        """
+        Créer un non-terminal pour une partie droite de la table d'extraction ou de binarisation.
+
+        :param droite: Partie droite (un terminal, ou deux symboles)
+        :return: Identifiant du nouveau non-terminal
+        """
+        nt = self.symboles.non_terminal(self._nom_libre())
+        self.auxiliaires.add(nt)
+        self._ajouter_binaire(nt, droite)
+        return nt
+
+    def _ajouter_binaire(self, nt, droite):
+        """
+        Enregistrer une règle de longueur au plus 2 et l'indexer pour la propagation des nullables.
+
+        :return: Numéro de la règle, None si elle existait déjà
+        """
+        if (nt, droite) in self.index_binaires:
+            return None
+        self.index_binaires.add((nt, droite))
+        numero = len(self.binaires)
+        self.binaires.append((nt, droite))
+        self.compteurs.append(sum(1 for s in droite if s not in self.nullables))
+        for symbole in droite:
+            if symbole >= 0:
+                self.occurrences.setdefault(symbole, []).append(numero)
+        self._nouvelles.append(numero)
+        return numero
+
+    def _binariser(self, nt, prod):
+        """
+        Découper une règle d'origine comme extraire_terminaux_regles puis eliminer_long_regles,
+        en réutilisant les non-terminaux déjà créés pour les mêmes terminaux et les mêmes paires.
+        """
+        if len(prod) > 1 and any(s < 0 for s in prod):
+            symboles = []
+            for s in prod:
+                if s < 0:
+                    if s not in self.terminal_de:
+                        self.terminal_de[s] = self._auxiliaire((s,))
+                    s = self.terminal_de[s]
+                symboles.append(s)
+            prod = tuple(symboles)
+        while len(prod) > 2:
+            paire = prod[:2]
+            if paire not in self.paire_de:
+                self.paire_de[paire] = self._auxiliaire(paire)
+            prod = (self.paire_de[paire],) + prod[2:]
+        self._ajouter_binaire(nt, prod)
+
+    def _ajouter_regles(self, regles):
+        """
+        Propager l'ajout de règles d'origine à travers toutes les étapes.
+
+        :param regles: Liste de couples (non-terminal, production)
+        """
+        self._nouvelles = []
+        for nt, prod in regles:
+            self._binariser(nt, prod)
+
+        # Nullables : seules les occurrences des non-terminaux nouvellement nullables sont visitées
+        nouveaux_nullables = []
+        a_traiter = [self.binaires[i][0] for i in self._nouvelles if self.compteurs[i] == 0]
+        while a_traiter:
+            nt = a_traiter.pop()
+            if nt in self.nullables:
+                continue
+            self.nullables.add(nt)
+            nouveaux_nullables.append(nt)
+            for numero in self.occurrences.get(nt, []):
+                self.compteurs[numero] -= 1
+                if self.compteurs[numero] == 0:
+                    a_traiter.append(self.binaires[numero][0])
+
+        # Règles à redévelopper : les nouvelles et celles où un symbole est devenu nullable
+        a_developper = dict.fromkeys(self._nouvelles)
+        for nt in nouveaux_nullables:
+            a_developper.update(dict.fromkeys(self.occurrences.get(nt, [])))
+        nouvelles_sans_vide = []
+        axiome = self.source.axiome
+        for numero in a_developper:
+            nt, prod = self.binaires[numero]
+            options = [(s, None) if s in self.nullables else (s,) for s in prod]
+            for option in product(*options):
+                developpee = tuple(s for s in option if s is not None)
+                if developpee or nt == axiome:  # Seul l'axiome garde S0 -> E
+                    self._ajouter_sans_vide(nt, developpee, nouvelles_sans_vide)
+        if axiome in self.nullables:
+            self._ajouter_sans_vide(axiome, (), nouvelles_sans_vide)
+
+        # Fermeture unitaire
+        for nt, prod in nouvelles_sans_vide:
+            if len(prod) == 1 and prod[0] >= 0:
+                self._ajouter_unitaire(nt, prod[0])
+            else:
+                for origine in self.inverse[nt]:
+                    if prod or origine == nt:  # La production vide ne se transmet pas (forme de Chomsky)
+                        self.regles[origine][prod] = None
+
+    def _connaitre(self, nt):
+        """
+        Initialiser les tables d'un non-terminal à sa première apparition.
+        """
+        if nt not in self.atteints:
+            self.atteints[nt] = {nt}
+            self.inverse[nt] = {nt}
+            self.unitaires[nt] = set()
+            self.regles[nt] = {}
+            self.sans_vide[nt] = {}
+
+    def _ajouter_sans_vide(self, nt, prod, nouvelles):
+        """
+        Ajouter une règle à la grammaire sans production vide, si elle est nouvelle.
+        """
+        self._connaitre(nt)
+        for s in prod:
+            if s >= 0:
+                self._connaitre(s)
+        if prod not in self.sans_vide[nt]:
+            self.sans_vide[nt][prod] = None
+            nouvelles.append((nt, prod))
+
+    def _ajouter_unitaire(self, source, cible):
+        """
+        Ajouter l'arc unitaire source -> cible en gardant la fermeture transitive.
+
+        Chaque non-terminal qui atteint source atteint désormais tout ce qu'atteint cible, et
+        hérite des règles non unitaires des non-terminaux qu'il n'atteignait pas encore.
+        """
+        if cible in self.unitaires[source]:
+            return
+        self.unitaires[source].add(cible)
+        atteints_cible = list(self.atteints[cible])
+        for origine in list(self.inverse[source]):
+            atteints = self.atteints[origine]
+            for nt in atteints_cible:
+                if nt in atteints:
+                    continue
+                atteints.add(nt)
+                self.inverse[nt].add(origine)
+                regles = self.regles[origine]
+                for prod in self.sans_vide[nt]:
+                    if prod and (len(prod) != 1 or prod[0] < 0):
+                        regles[prod] = None
+
+    def chomsky(self):
+        """
+        Exporter la forme normale de Chomsky courante.
+
+        :return: Nouvel objet CFG, débarrassé des non-terminaux inutiles comme par CFG.chomsky()
+        """
+        symboles = self.symboles
+        grammaire = CFG.depuis_compact((
+            list(symboles.noms_non_terminaux),
+            list(symboles.noms_terminaux),
+            self.source.axiome,
+            sorted(self.regles),
+            [(nt, list(regles)) for nt, regles in self.regles.items()],
+        ))
+        grammaire.terminals = set(self.source.terminals)
+        if grammaire.axiome is not None:
+            grammaire.productions.setdefault(grammaire.axiome, [])
+            grammaire.supprimer_unused_non_terminal()
+        return grammaire
+
+    def greibach(self):
+        """
+        Calculer la forme normale de Greibach à partir de la forme de Chomsky courante.
+
+        L'élimination de la récursion à gauche dépend de toute la grammaire : seule la partie
+        Chomsky est incrémentale, la conversion de Greibach est refaite sur son résultat.
+
+        :return: Nouvel objet CFG
+        """
+        grammaire = self.chomsky()
+        if grammaire.axiome is not None:
+            grammaire.greibach()
+        return grammaire
+
+    def verifier(self, longueur_max=6):
+        """
+        Comparer la forme normale incrémentale à un recalcul complet par CFG.chomsky().
+
+        Les noms des non-terminaux créés diffèrent d'un calcul à l'autre : on compare les mots
+        engendrés, longueur par longueur (voir generer.WordGenerator.mots_par_longueur).
+
+        :param longueur_max: Longueur maximale des mots comparés
+        :return: None si les deux grammaires engendrent les mêmes mots, sinon un triplet (plus petit
+                 mot de la plus petite longueur qui les distingue, sa longueur, True s'il n'est
+                 engendré que par la forme incrémentale)
+        """
+        from generer import WordGenerator
+
+        complete = CFG.depuis_compact(self.source.vers_compact())
+        if complete.axiome is not None:
+            complete.chomsky()
+        incrementale = self.chomsky()
+        tables = []
+        for grammaire in (incrementale, complete):
+            if grammaire.axiome is None:
+                tables.append([set() for _ in range(longueur_max + 1)])
+            else:
+                tables.append(WordGenerator(grammaire).mots_par_longueur(longueur_max))
+        for n, (mots_incrementale, mots_complete) in enumerate(zip(*tables)):
+            if mots_incrementale != mots_complete:
+                mot = min(mots_incrementale ^ mots_complete)
+                return mot, n, mot in mots_incrementale
+        return None
+
+def verifier_ajouts(graine, ajouts=8, longueur_max=5, terminaux="ab"):
+    """
+    Ajouter des règles aléatoires à une grammaire aléatoire et comparer, après chaque ajout, la
+    forme normale incrémentale à un recalcul complet (ChomskyIncrementale.verifier).
+
+    Les noms des non-terminaux sont tirés parmi les premiers noms que prennent les non-terminaux
+    créés (A0, B0, C0...) : les ajouts réutilisent souvent le nom d'un non-terminal auxiliaire,
+    qui doit alors être renommé.
+
+    :param graine: Graine du tirage
+    :param ajouts: Nombre d'ajouts
+    :param longueur_max: Longueur maximale des mots comparés
+    :param terminaux: Alphabet des terminaux
+    :return: None si tous les ajouts donnent les mêmes mots, sinon un couple (numéro de l'ajout
+             fautif, résultat de verifier)
+    """
+    rng = random.Random(graine)
+    noms = [f"{LETTRES_NON_TERMINAUX[i % 25]}{i // 25}" for i in range(8)]
+
+    def productions():
+        resultat = []
+        for _ in range(rng.randint(1, 3)):
+            longueur = rng.choice((0, 1, 1, 2, 2, 3))
+            production = ''.join(rng.choice(noms) if rng.random() < 0.5 else rng.choice(terminaux)
+                                 for _ in range(longueur))
+            resultat.append(production or 'E')
+        return resultat
+
+    grammaire = CFG()
+    grammaire.add_production("S0", productions())
+    normale = ChomskyIncrementale(grammaire)
+    for numero in range(1, ajouts + 1):
+        normale.add_production(rng.choice(noms + ["S0"]), productions())
+        difference = normale.verifier(longueur_max)
+        if difference is not None:
+            return numero, difference
+    return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(usage="python3 incremental.py [--graines N] [--ajouts K] [--longueur L]")
+    parser.add_argument("--graines", type=int, default=100, help="nombre de grammaires aléatoires (par défaut : 100)")
+    parser.add_argument("--ajouts", type=int, default=8, help="nombre d'ajouts par grammaire (par défaut : 8)")
+    parser.add_argument("--longueur", type=int, default=5, help="longueur maximale des mots comparés (par défaut : 5)")
+    args = parser.parse_args()
+
+    echecs = 0
+    for graine in range(args.graines):
+        resultat = verifier_ajouts(graine, args.ajouts, args.longueur)
+        if resultat is not None:
+            echecs += 1
+            numero, (mot, n, incrementale) = resultat
+            print(f"Graine {graine}, ajout {numero} : '{mot if mot != '' else 'E'}' (longueur {n}) n'est engendré "
+                  f"que par la forme {'incrémentale' if incrementale else 'complète'}")
+    print(f"{args.graines - echecs} grammaire(s) sur {args.graines} : forme incrémentale conforme au recalcul complet")
+    sys.exit(1 if echecs else 0)
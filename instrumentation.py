@@ -0,0 +1,124 @@
+import json
+import contextlib
+import time
+import functools
+import tracemalloc
+
+@contextlib.contextmanager
+def observation(cfg, nom):
+    """
+    Prévenir les observateurs d'une grammaire avant et après une étape (même si elle lève une exception).
+
+    :param cfg: L'objet CFG observé
+    :param nom: Nom de l'étape
+    """
+    observateurs = list(cfg.observateurs)
+    for observateur in observateurs:
+        observateur.avant_etape(cfg, nom)
+    erreur = None
+    try:
+        yield
+    except BaseException as e:
+        erreur = e
+        raise
+    finally:
+        for observateur in reversed(observateurs):
+            observateur.apres_etape(cfg, nom, erreur)
+
+def etape(methode):
+    """
+    Déclarer une méthode de CFG comme étape de transformation observable.
+
+    Si la grammaire n'a aucun observateur (cas par défaut), la méthode est appelée directement :
+    le seul coût est un test sur une liste vide. Sinon, chaque observateur est prévenu avant et
+    après l'étape (voir observation).
+
+    :param methode: Méthode de CFG (ses arguments, comme minimiser ou methode, sont transmis tels quels)
+    :return: Méthode enveloppée
+    """
+    nom = methode.__name__
+
+    @functools.wraps(methode)
+    def enveloppe(self, *args, **kwargs):
+        if not self.observateurs:
+            return methode(self, *args, **kwargs)
+        with observation(self, nom):
+            return methode(self, *args, **kwargs)
+    return enveloppe
+
+class Trace:
+    def __init__(self, memoire=True):
+        """
+        Observateur qui enregistre, pour chaque étape, la durée, le temps CPU, la mémoire allouée et
+        la taille de la grammaire avant et après.
+
+        Les étapes peuvent être imbriquées (chomsky() contient ses passes) : chaque
+        enregistrement porte son niveau d'imbrication, et les enregistrements sont rangés dans
+        l'ordre de fin des étapes.
+
+        :param memoire: Mesurer les allocations avec tracemalloc (ralentit le calcul)
+        """
+        self.memoire = memoire
+        self.enregistrements = []  # Une entrée par étape terminée
+        self.pile = []  # Étapes en cours : (nom, taille avant, horloge, horloge CPU, mémoire avant, pic)
+        self.tracemalloc_lance = False  # Vrai si cette trace a démarré tracemalloc elle-même
+
+    def avant_etape(self, cfg, nom):
+        """
+        Noter l'état de la grammaire et des horloges au début d'une étape.
+
+        :param cfg: L'objet CFG
+        :param nom: Nom de l'étape
+        """
+        memoire_avant = pic = 0
+        if self.memoire:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.tracemalloc_lance = True
+            courante, pic_parent = tracemalloc.get_traced_memory()
+            if self.pile:  # Conserver le pic atteint jusqu'ici par l'étape englobante
+                self.pile[-1][5] = max(self.pile[-1][5], pic_parent)
+            tracemalloc.reset_peak()
+            memoire_avant = pic = courante
+        self.pile.append([nom, cfg.taille(), time.perf_counter(), time.process_time(), memoire_avant, pic])
+
+    def apres_etape(self, cfg, nom, erreur=None):
+        """
+        Enregistrer les mesures d'une étape à sa fin.
+
+        :param cfg: L'objet CFG
+        :param nom: Nom de l'étape
+        :param erreur: Exception levée par l'étape, le cas échéant
+        """
+        _, taille_avant, horloge, horloge_cpu, memoire_avant, pic = self.pile.pop()
+        enregistrement = {
+            "etape": nom,
+            "niveau": len(self.pile),
+            "duree": time.perf_counter() - horloge,
+            "duree_cpu": time.process_time() - horloge_cpu,
+        }
+        if self.memoire:
+            courante, pic_etape = tracemalloc.get_traced_memory()
+            pic = max(pic, pic_etape)
+            enregistrement["memoire_nette"] = courante - memoire_avant  # Octets encore alloués à la fin
+            enregistrement["memoire_pic"] = pic - memoire_avant  # Pic d'allocation pendant l'étape
+            if self.pile:
+                self.pile[-1][5] = max(self.pile[-1][5], pic)
+            elif self.tracemalloc_lance:
+                tracemalloc.stop()
+                self.tracemalloc_lance = False
+        noms_tailles = ("non_terminaux", "regles", "symboles")
+        enregistrement["avant"] = dict(zip(noms_tailles, taille_avant))
+        enregistrement["apres"] = dict(zip(noms_tailles, cfg.taille()))
+        if erreur is not None:
+            enregistrement["erreur"] = f"{type(erreur).__name__}: {erreur}"
+        self.enregistrements.append(enregistrement)
+
+    def vers_json(self, **indentation):
+        """
+        Sérialiser la trace.
+
+        :param indentation: Options passées à json.dumps (indent, ...)
+        :return: Chaîne JSON (liste des enregistrements)
+        """
+        return json.dumps(self.enregistrements, ensure_ascii=False, **indentation)
@@ -1,22 +1,53 @@
-import cfg 
+import re
+import sys
+import mmap
+import struct
+from array import array
+from itertools import accumulate
+import cfg
 
-def read_cfg_rules(file_path):
+# Tokeniseur unique, compilé une fois : non-terminal (A0, B12), terminal (a-z) ou chaîne vide (E)
+SYMBOLE = re.compile(rb'[A-DF-Z][0-9]+|[a-z]|E')
+NON_TERMINAL = re.compile(rb'[A-DF-Z][0-9]+')
+
+# Format binaire : en-tête, noms des symboles, puis tableaux d'entiers 32 bits (petit-boutiste)
+MAGIQUE = b'CFGB'
+VERSION_BINAIRE = 1
+# magique, version, axiome (-1 si aucun), nombre et taille en octets des noms de non-terminaux
+# puis de terminaux, nombre de non-terminaux, de parties gauches, de règles et de symboles
+EN_TETE = struct.Struct('<4sB3xiIIIIIIII')
+
+class ErreurLecture(ValueError):
+    def __init__(self, chemin, ligne, message):
+        """
+        Erreur de syntaxe dans un fichier de grammaire.
+
+        :param chemin: Chemin du fichier
+        :param ligne: Numéro de la ligne fautive (à partir de 1), None pour un fichier binaire
+        :param message: Description de l'erreur
+        """
+        super().__init__(f"{chemin} : {message}" if ligne is None else f"{chemin}, ligne {ligne} : {message}")
+        self.chemin = chemin
+        self.ligne = ligne
+        self.message = message
+
+    def __reduce__(self):
+        # Reconstruire l'erreur avec ses trois arguments (transmission entre processus)
+        return ErreurLecture, (self.chemin, self.ligne, self.message)
+
+def read_cfg_rules(file_path, projection=False):
     """
     Lire les règles CFG dans le fichier donné et retourner un objet CFG.
-    """
-    rule = cfg.CFG()  # Créer un objet CFG
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line in file:
-                line = line.strip().replace(" ", "")
-                if not line or ':' not in line:
-                    continue
 
-                non_terminal, productions = line.split(':')
-                production_list = productions.split('|')
-                rule.add_production_avec_validation(non_terminal, production_list) # Utiliser l'objet CFG pour ajouter des règles
+    Le fichier peut être au format texte ou au format binaire de ecrire.ecrire_binaire (reconnu
+    à son en-tête). En cas d'erreur, un message (avec le numéro de ligne) est affiché.
 
+    :param file_path: Chemin du fichier
+    :param projection: Projeter le fichier en mémoire (mmap) au lieu de le lire par blocs
+    :return: L'objet CFG, ou None en cas d'erreur
+    """
+    try:
+        return lire_grammaire(file_path, projection)
     except FileNotFoundError:
         print(f"Fichier introuvable : {file_path}")
         return None # Retourne None pour que l'appelant puisse gérer l'erreur
@@ -24,4 +55,172 @@ def read_cfg_rules(file_path):
         print(f"Une erreur s'est produite : {e}")
         return None
 
-    return rule  # Retourner l'objet CFG
+def lire_grammaire(file_path, projection=False):
+    """
+    Lire une grammaire (texte ou binaire) en levant une exception en cas d'erreur.
+
+    :param file_path: Chemin du fichier
+    :param projection: Projeter le fichier en mémoire (mmap) au lieu de le lire par blocs
+    :return: L'objet CFG
+    :raises ErreurLecture: Si une ligne est invalide (le message donne le numéro de ligne)
+    :raises FileNotFoundError: Si le fichier n'existe pas
+    """
+    with open(file_path, 'rb') as fichier:
+        if fichier.read(len(MAGIQUE)) == MAGIQUE:
+            fichier.seek(0)
+            return depuis_binaire(fichier.read(), file_path)
+        fichier.seek(0)
+        if projection and fichier.seek(0, 2) > 0:  # Un fichier vide ne peut pas être projeté
+            with mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as projete:
+                return analyser_lignes(iter(projete.readline, b''), file_path)
+        fichier.seek(0)
+        return analyser_lignes(fichier, file_path)
+
+def depuis_octets(donnees, chemin="<entrée>"):
+    """
+    Construire un CFG depuis le contenu d'un fichier de grammaire (texte ou binaire) déjà en mémoire.
+
+    :param donnees: Contenu (bytes)
+    :param chemin: Nom de la source, pour les messages d'erreur
+    :return: L'objet CFG
+    :raises ErreurLecture: Si une ligne est invalide
+    """
+    if donnees[:len(MAGIQUE)] == MAGIQUE:
+        return depuis_binaire(donnees, chemin)
+    return analyser_lignes(donnees.splitlines(), chemin)
+
+class Internement(dict):
+    def __init__(self, symboles):
+        """
+        Dictionnaire jeton (bytes) -> identifiant, qui interne les jetons absents à la première rencontre.
+
+        :param symboles: Table des symboles (symboles.TableSymboles) de la grammaire en construction
+        """
+        super().__init__()
+        self.symboles = symboles
+
+    def __missing__(self, jeton):
+        nom = jeton.decode('ascii')
+        symbole = self.symboles.terminal(nom) if nom.islower() else self.symboles.non_terminal(nom)
+        self[jeton] = symbole
+        return symbole
+
+def analyser_lignes(lignes, chemin="<entrée>"):
+    """
+    Construire un CFG à partir de lignes de texte « A0 : aB0 | E ».
+
+    Chaque production distincte n'est découpée qu'une seule fois (par le tokeniseur SYMBOLE) :
+    les productions répétées, fréquentes dans les grammaires produites automatiquement, sont
+    retrouvées dans un dictionnaire. Les symboles sont internés directement, sans repasser par
+    le texte.
+
+    :param lignes: Itérable de lignes (bytes)
+    :param chemin: Nom du fichier, pour les messages d'erreur
+    :return: L'objet CFG
+    :raises ErreurLecture: Si une ligne est invalide
+    """
+    grammaire = cfg.CFG()
+    identifiants = Internement(grammaire.symboles)  # Jeton (bytes) -> identifiant
+    traductions = {}  # Production (bytes) -> tuple d'identifiants
+    regles = grammaire.productions
+
+    for numero, ligne in enumerate(lignes, 1):
+        ligne = ligne.strip().replace(b' ', b'')
+        if not ligne or b':' not in ligne:
+            continue
+
+        gauche, _, droite = ligne.partition(b':')
+        if b':' in droite:
+            raise ErreurLecture(chemin, numero, "une règle ne peut contenir qu'un seul ':'")
+        if not NON_TERMINAL.fullmatch(gauche):
+            raise ErreurLecture(chemin, numero, f"'{gauche.decode('utf-8', 'replace')}' n'est pas un non-terminal valide !")
+
+        nt = identifiants[gauche]  # Interné avant la partie droite, comme dans add_production
+        productions = regles.get(nt)
+        if productions is None:
+            productions = regles[nt] = []
+        for production in droite.split(b'|'):
+            traduction = traductions.get(production)
+            if traduction is None:
+                jetons = SYMBOLE.findall(production)
+                if sum(map(len, jetons)) != len(production):  # Un caractère n'a pas été reconnu
+                    raise ErreurLecture(chemin, numero,
+                                        f"'{production.decode('utf-8', 'replace')}' n'est pas une production valide !")
+                if b'E' in production:  # E ne peut apparaître que comme chaîne vide (pas dans un nom)
+                    jetons = [jeton for jeton in jetons if jeton != b'E']
+                traduction = traductions[production] = tuple(map(identifiants.__getitem__, jetons))
+            productions.append(traduction)
+
+    # Tous les symboles de la table sont utilisés, y compris les non-terminaux qui n'apparaissent
+    # qu'en partie droite (sans règle) : non_terminals reste d'accord avec la table des symboles
+    grammaire.non_terminals.update(range(len(grammaire.symboles.noms_non_terminaux)))
+    grammaire.terminals.update(range(-len(grammaire.symboles.noms_terminaux), 0))
+    grammaire.axiome = next(iter(regles), None)
+    return grammaire  # Retourner l'objet CFG
+
+def depuis_binaire(donnees, chemin="<entrée>"):
+    """
+    Reconstruire un CFG depuis le format binaire de ecrire.ecrire_binaire, sans analyse de texte.
+
+    La taille du contenu doit être exactement celle annoncée par l'en-tête, et tous les
+    identifiants de symboles doivent désigner un nom de la table : un fichier tronqué ou
+    corrompu est rejeté au lieu de donner une grammaire incomplète.
+
+    :param donnees: Contenu du fichier (bytes)
+    :param chemin: Nom de la source, pour les messages d'erreur
+    :return: L'objet CFG
+    :raises ErreurLecture: Si l'en-tête ne correspond pas au format ou si le contenu est incohérent
+    """
+    if len(donnees) < EN_TETE.size:
+        raise ErreurLecture(chemin, None, "fichier binaire tronqué (en-tête incomplet)")
+    (magique, version, axiome, nombre_nt, taille_nt, nombre_t, taille_t,
+     nombre_non_terminaux, nombre_gauches, nombre_regles, nombre_symboles) = EN_TETE.unpack_from(donnees)
+    if magique != MAGIQUE or version != VERSION_BINAIRE:
+        raise ErreurLecture(chemin, None, f"format binaire inconnu (version {version})")
+    attendue = EN_TETE.size + taille_nt + taille_t + 4 * (
+        nombre_non_terminaux + 2 * nombre_gauches + nombre_regles + nombre_symboles)
+    if len(donnees) != attendue:
+        raise ErreurLecture(chemin, None,
+                            f"taille incohérente : {len(donnees)} octets, l'en-tête en annonce {attendue}")
+
+    position = EN_TETE.size
+    noms = []
+    for taille, nombre in ((taille_nt, nombre_nt), (taille_t, nombre_t)):
+        try:
+            texte = donnees[position:position + taille].decode('utf-8')
+        except UnicodeDecodeError:
+            raise ErreurLecture(chemin, None, "noms de symboles illisibles") from None
+        liste = texte.split('\n') if texte else []
+        if len(liste) != nombre:
+            raise ErreurLecture(chemin, None, f"{len(liste)} noms de symboles, l'en-tête en annonce {nombre}")
+        noms.append(liste)
+        position += taille
+    noms_nt, noms_t = noms
+
+    tableaux = []
+    for code, nombre in (('i', nombre_non_terminaux), ('i', nombre_gauches), ('I', nombre_gauches),
+                         ('I', nombre_regles), ('i', nombre_symboles)):
+        tableau = array(code)
+        fin = position + nombre * tableau.itemsize
+        tableau.frombytes(donnees[position:fin])
+        if sys.byteorder == 'big':
+            tableau.byteswap()
+        tableaux.append(tableau)
+        position = fin
+    non_terminaux, gauches, comptes, longueurs, symboles = tableaux
+
+    if sum(comptes) != nombre_regles or sum(longueurs) != nombre_symboles:
+        raise ErreurLecture(chemin, None, "nombres de règles ou de symboles incohérents")
+    # Non-terminaux dans [0, nombre_nt), terminaux dans [-nombre_t, 0)
+    if any(tableau and (min(tableau) < 0 or max(tableau) >= nombre_nt) for tableau in (non_terminaux, gauches)) \
+            or (symboles and (min(symboles) < -nombre_t or max(symboles) >= nombre_nt)) \
+            or not -1 <= axiome < nombre_nt:
+        raise ErreurLecture(chemin, None, "identifiant de symbole hors de la table des noms")
+
+    symboles = symboles.tolist()
+    bornes = [0, *accumulate(longueurs)]
+    regles = [tuple(symboles[debut:fin]) for debut, fin in zip(bornes, bornes[1:])]
+    bornes = [0, *accumulate(comptes)]
+    productions = [(gauche, regles[debut:fin]) for gauche, debut, fin in zip(gauches, bornes, bornes[1:])]
+
+    return cfg.CFG.depuis_compact((noms_nt, noms_t, None if axiome < 0 else axiome, non_terminaux.tolist(), productions))
@@ -0,0 +1,112 @@
+from instrumentation import observation
+from cfg import METHODES_GREIBACH
+
+# Passes de CFG.greibach(), appliquées à une forme de Chomsky
+PASSES_GREIBACH = [
+    "supprimer_unused_non_terminal",
+    "eliminer_left_recursion",
+    "eliminer_epsilon_regles",
+    "eliminer_unit_regles",
+    "assurer_terminal_premier",
+    "supprimer_unused_non_terminal",
+]
+
+# Passes de CFG.greibach(methode="coin_gauche"), appliquées à une forme de Chomsky
+PASSES_GREIBACH_COIN_GAUCHE = [
+    "greibach_coin_gauche",
+    "supprimer_unused_non_terminal",
+]
+
+# Étapes prédéfinies : {nom: (étape d'entrée, passes de CFG à appliquer dans l'ordre)}
+# La chaîne de "nettoyee" à "chomsky" suit CFG.chomsky() pas à pas, "greibach" suit CFG.greibach() :
+# les résultats sont identiques à ceux des méthodes en place.
+ETAPES = {
+    "nettoyee": ("source", ["supprimer_unused_non_terminal"]),
+    "terminaux_extraits": ("nettoyee", ["extraire_terminaux_regles"]),
+    "binarisee": ("terminaux_extraits", ["eliminer_long_regles"]),
+    "binarisee_sans_vide": ("binarisee", ["eliminer_epsilon_regles"]),
+    "binarisee_sans_unitaires": ("binarisee_sans_vide", ["eliminer_unit_regles"]),
+    "chomsky": ("binarisee_sans_unitaires", ["supprimer_unused_non_terminal"]),
+    "greibach": ("chomsky", PASSES_GREIBACH),
+    "chomsky_minimisee": ("chomsky", ["minimiser"]),
+    "greibach_minimisee": ("chomsky_minimisee", PASSES_GREIBACH + ["minimiser"]),
+    "greibach_coin_gauche": ("chomsky", PASSES_GREIBACH_COIN_GAUCHE),
+    "greibach_coin_gauche_minimisee": ("chomsky_minimisee", PASSES_GREIBACH_COIN_GAUCHE + ["minimiser"]),
+    "sans_vide": ("nettoyee", ["eliminer_epsilon_regles", "supprimer_unused_non_terminal"]),
+}
+
+def etapes_normalisation(minimiser=False, methode="substitution"):
+    """
+    Retourner les noms des étapes des formes normales de Chomsky et de Greibach.
+
+    :param minimiser: Formes minimisées (voir CFG.minimiser)
+    :param methode: Méthode de conversion en forme de Greibach (voir CFG.greibach)
+    :return: Couple (étape de Chomsky, étape de Greibach)
+    :raises ValueError: Si la méthode est inconnue
+    """
+    if methode not in METHODES_GREIBACH:
+        raise ValueError(f"Méthode inconnue : '{methode}' (méthodes : {', '.join(METHODES_GREIBACH)})")
+    suffixe = "_minimisee" if minimiser else ""
+    greibach = "greibach" if methode == "substitution" else f"greibach_{methode}"
+    return "chomsky" + suffixe, greibach + suffixe
+
+class Pipeline:
+    def __init__(self, cfg, etapes=None):
+        """
+        Calculer des formes d'une grammaire par étapes nommées, sans jamais modifier la grammaire source.
+
+        Chaque étape part du résultat de son étape d'entrée, dérivé par CFG.derivee() : les
+        listes de règles que ses passes ne touchent pas restent partagées (copie à l'écriture).
+        Les résultats sont mémorisés par nom, si bien que les formes qui ont un préfixe commun
+        (Chomsky et Greibach, Chomsky et sa version minimisée...) ne le calculent qu'une fois.
+
+        :param cfg: La grammaire source (jamais modifiée)
+        :param etapes: Étapes supplémentaires, ou qui remplacent celles d'ETAPES, au même format
+        """
+        self.etapes = dict(ETAPES)
+        if etapes:
+            self.etapes.update(etapes)
+        self.resultats = {"source": cfg.derivee()}  # {nom d'étape: grammaire calculée}
+
+    def etape(self, nom):
+        """
+        Retourner le résultat d'une étape, en calculant au besoin les étapes dont elle dépend.
+
+        Les grammaires retournées sont mémorisées et servent d'entrée aux étapes suivantes : il
+        ne faut pas les modifier (utiliser derivee() pour obtenir une copie modifiable).
+
+        :param nom: Nom de l'étape ("chomsky", "greibach", "sans_vide"...)
+        :return: L'objet CFG de l'étape
+        :raises ValueError: Si l'étape n'est pas définie
+        """
+        if nom in self.resultats:
+            return self.resultats[nom]
+        if nom not in self.etapes:
+            raise ValueError(f"Étape inconnue : '{nom}' (étapes définies : {', '.join(sorted(self.etapes))})")
+
+        entree, passes = self.etapes[nom]
+        grammaire = self.etape(entree).derivee()
+        if grammaire.observateurs:
+            with observation(grammaire, nom):
+                self._appliquer(grammaire, passes)
+        else:
+            self._appliquer(grammaire, passes)
+        self.resultats[nom] = grammaire
+        return grammaire
+
+    @staticmethod
+    def _appliquer(grammaire, passes):
+        """
+        Appliquer des passes (méthodes de CFG sans argument) à une grammaire.
+        """
+        for passe in passes:
+            getattr(grammaire, passe)()
+
+    def calculer(self, *noms):
+        """
+        Calculer plusieurs étapes, en partageant leurs préfixes communs.
+
+        :param noms: Noms des étapes
+        :return: Liste des grammaires, dans l'ordre des noms
+        """
+        return [self.etape(nom) for nom in noms]
@@ -0,0 +1,609 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import hashlib
+import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import lire
+import ecrire
+from cfg import CFG, METHODES_GREIBACH
+from pipeline import Pipeline, etapes_normalisation
+from generer import WordGenerator
+from comptage import CompteurMots
+from earley import AnalyseurEarley
+
+PORT_DEFAUT = 8765
+# Taille maximale d'une ligne de requête (une grammaire peut être envoyée en texte)
+TAILLE_LIGNE_MAX = 64 * 2**20
+# Nombre de grammaires compilées gardées par chaque processus du groupe
+CAPACITE_PROCESSUS = 16
+# Formes dont la version compacte est renvoyée au serveur pour son cache
+FORMES_PARTAGEES = ("source", "chomsky", "greibach", "chomsky_minimisee", "greibach_minimisee",
+                    "greibach_coin_gauche", "greibach_coin_gauche_minimisee")
+
+class CacheLRU:
+    def __init__(self, capacite):
+        """
+        Dictionnaire de taille bornée qui oublie l'entrée la moins récemment utilisée.
+
+        :param capacite: Nombre maximal d'entrées
+        """
+        self.capacite = capacite
+        self.entrees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+
+    def get(self, cle):
+        """
+        :param cle: Clé de l'entrée
+        :return: Valeur (marquée comme récemment utilisée), ou None si elle est absente
+        """
+        valeur = self.entrees.get(cle)
+        if valeur is None:
+            self.echecs += 1
+            return None
+        self.entrees.move_to_end(cle)
+        self.succes += 1
+        return valeur
+
+    def put(self, cle, valeur):
+        """
+        Ajouter ou remplacer une entrée, puis évincer les plus anciennes au-delà de la capacité.
+        """
+        self.entrees[cle] = valeur
+        self.entrees.move_to_end(cle)
+        while len(self.entrees) > self.capacite:
+            self.entrees.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entrees)
+
+class GrammaireAbsente(Exception):
+    """
+    Le processus qui reçoit la requête n'a pas (ou plus) la grammaire : le serveur doit l'envoyer.
+    """
+
+class GrammaireCompilee:
+    def __init__(self, source, formes=None):
+        """
+        Grammaire lue et formes dérivées, gardées en mémoire par un processus du groupe.
+
+        Les formes normales sont calculées par un pipeline.Pipeline (une seule fois chacune) ;
+        celles que le serveur a déjà en cache sont reprises telles quelles. Les objets de travail
+        (générateur, compteur, analyseur d'Earley) sont créés à la première requête qui en a besoin
+        et conservent leurs tables d'une requête à l'autre.
+
+        :param source: L'objet CFG lu
+        :param formes: {nom d'étape: forme compacte (CFG.vers_compact)} déjà calculées, optionnel
+        """
+        self.pipeline = Pipeline(source)
+        for nom, compact in (formes or {}).items():
+            if nom != "source":
+                self.pipeline.resultats[nom] = CFG.depuis_compact(compact)
+        self.objets = {}  # {(type, étape): générateur, compteur ou analyseur}
+
+    def forme(self, nom):
+        """
+        :param nom: Nom d'étape du pipeline ("source", "chomsky", "greibach"...)
+        :return: L'objet CFG de l'étape (à ne pas modifier)
+        """
+        return self.pipeline.etape(nom)
+
+    def objet(self, fabrique, nom):
+        """
+        Retourner l'objet de travail construit par fabrique sur une forme, en le créant au besoin.
+
+        :param fabrique: Classe (WordGenerator, CompteurMots, AnalyseurEarley)
+        :param nom: Nom d'étape de la forme
+        """
+        cle = (fabrique.__name__, nom)
+        if cle not in self.objets:
+            self.objets[cle] = fabrique(self.forme(nom))
+        return self.objets[cle]
+
+    def exporter(self, connues):
+        """
+        Retourner les formes calculées par ce processus que le serveur n'a pas encore.
+
+        :param connues: Noms des formes déjà dans le cache du serveur
+        :return: {nom d'étape: forme compacte}
+        """
+        return {nom: self.pipeline.resultats[nom].vers_compact() for nom in FORMES_PARTAGEES
+                if nom in self.pipeline.resultats and nom not in connues}
+
+def _normaliser(grammaire, parametres):
+    """
+    Calculer des formes normales et les retourner au format texte.
+
+    :return: {forme: {"regles": texte, "taille": CFG.taille()}}
+    """
+    etapes = dict(zip(("chomsky", "greibach"),
+                      etapes_normalisation(parametres.get("minimiser", False), parametres.get("methode", "substitution"))))
+    resultat = {}
+    for forme in parametres.get("formes", ["chomsky", "greibach"]):
+        normale = grammaire.forme(etapes[forme])
+        resultat[forme] = {"regles": ''.join(ecrire.lignes_texte(normale)), "taille": normale.taille()}
+    return resultat
+
+def _generer(grammaire, parametres):
+    """
+    :return: Liste triée des mots de longueur au plus n ('' pour la chaîne vide)
+    """
+    return grammaire.objet(WordGenerator, "chomsky").generate_words_dp(parametres["n"])
+
+def _compter(grammaire, parametres):
+    """
+    :return: Nombre de dérivations (ou, avec "distincts", de mots distincts) de longueur n (entier)
+    """
+    return grammaire.objet(CompteurMots, "chomsky").compter(parametres["n"], parametres.get("distincts", False))
+
+def _appartenance(grammaire, parametres):
+    """
+    :return: Liste de booléens, un par mot (reconnaissance d'Earley sur la grammaire lue)
+    """
+    analyseur = grammaire.objet(AnalyseurEarley, "source")
+    return [analyseur.reconnait('' if mot == 'E' else mot) for mot in parametres["mots"]]
+
+# Opérations exécutées dans les processus du groupe : {nom: (fonction, paramètres obligatoires)}
+TRAITEMENTS = {
+    "normaliser": (_normaliser, ()),
+    "generer": (_generer, ("n",)),
+    "compter": (_compter, ("n",)),
+    "appartenance": (_appartenance, ("mots",)),
+}
+
+# Grammaires compilées du processus courant (chaque processus du groupe a la sienne)
+_grammaires = CacheLRU(CAPACITE_PROCESSUS)
+
+def traiter(operation, cle, donnees, formes, connues, parametres):
+    """
+    Exécuter une opération dans un processus du groupe.
+
+    :param operation: Nom de l'opération (clé de TRAITEMENTS)
+    :param cle: Empreinte de la grammaire
+    :param donnees: Contenu du fichier de grammaire (bytes), ou None si le serveur ne l'a pas joint
+    :param formes: Formes compactes du serveur ({nom d'étape: forme}), ou None si elles ne sont pas jointes
+    :param connues: Noms des formes que le serveur a déjà
+    :param parametres: Paramètres validés de la requête
+    :return: Couple (résultat, formes calculées ici que le serveur n'a pas encore)
+    :raises GrammaireAbsente: Si la grammaire n'est pas en mémoire et n'a pas été jointe
+    """
+    grammaire = _grammaires.get(cle)
+    if grammaire is None:
+        if formes is not None and "source" in formes:
+            grammaire = GrammaireCompilee(CFG.depuis_compact(formes["source"]), formes)
+        elif donnees is not None:
+            grammaire = GrammaireCompilee(lire.depuis_octets(donnees, "<requête>"))
+        else:
+            raise GrammaireAbsente(cle)
+        _grammaires.put(cle, grammaire)
+    fonction, _ = TRAITEMENTS[operation]
+    resultat = fonction(grammaire, parametres)
+    return resultat, grammaire.exporter(connues)
+
+class Metriques:
+    def __init__(self, fenetre=60.0, echantillons=1024):
+        """
+        Mesures de latence et de débit du service.
+
+        :param fenetre: Durée (s) de la fenêtre glissante du débit récent
+        :param echantillons: Nombre de latences gardées par opération pour les percentiles
+        """
+        self.debut = time.monotonic()
+        self.fenetre = fenetre
+        self.echantillons = echantillons
+        self.operations = {}  # {opération: {"requetes", "erreurs", "latences"}}
+        self.fins = deque()  # Instants de fin des requêtes de la fenêtre glissante
+        self.en_cours = 0  # Requêtes lues et pas encore terminées
+        self.en_attente = 0  # Lectures suspendues faute de place (contre-pression)
+
+    def enregistrer(self, operation, duree, erreur):
+        """
+        Enregistrer une requête terminée.
+
+        :param operation: Nom de l'opération
+        :param duree: Latence en secondes (de la lecture de la requête à l'envoi de la réponse)
+        :param erreur: True si la requête a échoué
+        """
+        mesures = self.operations.get(operation)
+        if mesures is None:
+            mesures = self.operations[operation] = {"requetes": 0, "erreurs": 0,
+                                                    "latences": deque(maxlen=self.echantillons)}
+        mesures["requetes"] += 1
+        mesures["erreurs"] += erreur
+        mesures["latences"].append(duree)
+        maintenant = time.monotonic()
+        self.fins.append(maintenant)
+        while self.fins and self.fins[0] < maintenant - self.fenetre:
+            self.fins.popleft()
+
+    def instantane(self, cache):
+        """
+        :param cache: Le CacheLRU des grammaires du serveur
+        :return: Dictionnaire sérialisable en JSON (latences en millisecondes, débits en requêtes par seconde)
+        """
+        maintenant = time.monotonic()
+        duree = maintenant - self.debut
+        operations = {}
+        for nom, mesures in self.operations.items():
+            latences = sorted(mesures["latences"])
+            rang = lambda q: latences[min(len(latences) - 1, int(q * len(latences)))] * 1000
+            operations[nom] = {"requetes": mesures["requetes"], "erreurs": mesures["erreurs"],
+                               "p50_ms": rang(0.5), "p95_ms": rang(0.95), "p99_ms": rang(0.99),
+                               "max_ms": latences[-1] * 1000}
+        total = sum(mesures["requetes"] for mesures in self.operations.values())
+        recentes = sum(1 for fin in self.fins if fin >= maintenant - self.fenetre)
+        return {"duree_s": duree, "requetes": total, "debit_moyen": total / duree if duree > 0 else 0.0,
+                "debit_recent": recentes / min(self.fenetre, duree) if duree > 0 else 0.0,
+                "en_cours": self.en_cours, "en_attente": self.en_attente, "operations": operations,
+                "cache": {"grammaires": len(cache), "capacite": cache.capacite,
+                          "succes": cache.succes, "echecs": cache.echecs}}
+
+class ServiceGrammaires:
+    def __init__(self, jobs=None, capacite=128, en_cours_max=None):
+        """
+        Service local qui garde les grammaires lues et normalisées entre les requêtes.
+
+        Protocole : une requête JSON par ligne, une réponse JSON par ligne, dans l'ordre de fin
+        (le champ "id" de la requête est recopié). Une requête contient "operation" ("normaliser",
+        "generer", "compter", "appartenance" ou "metriques"), la grammaire ("grammaire" : texte,
+        "chemin" : fichier lu par le serveur, ou "cle" : empreinte retournée par une réponse
+        précédente) et les paramètres de l'opération ("n", "mots", "minimiser", "distincts", "formes",
+        "methode").
+
+        Les grammaires sont identifiées par l'empreinte SHA-256 de leur contenu. Le serveur garde
+        leurs formes compactes (lue, Chomsky, Greibach...) dans un cache LRU ; les calculs se font
+        dans un groupe de processus, dont chacun garde aussi ses dernières grammaires compilées.
+        Au-delà de en_cours_max requêtes en cours, le serveur cesse de lire les connexions
+        (contre-pression) : les clients attendent au lieu d'accumuler du travail en mémoire.
+
+        :param jobs: Nombre de processus de calcul (par défaut, le nombre de processeurs)
+        :param capacite: Nombre de grammaires gardées dans le cache du serveur
+        :param en_cours_max: Nombre maximal de requêtes en cours (par défaut, deux par processus)
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = CacheLRU(capacite)
+        self.en_cours_max = en_cours_max or 2 * self.jobs
+        self.metriques = Metriques()
+        self.executeur = None
+        self.places = None
+        self.chargements = {}  # {empreinte: asyncio.Event} des grammaires en cours de première lecture
+
+    async def servir(self, chemin_socket=None, hote="127.0.0.1", port=PORT_DEFAUT, pret=None):
+        """
+        Démarrer le service et le faire tourner jusqu'à son annulation.
+
+        :param chemin_socket: Chemin d'une socket Unix ; sinon, écoute TCP sur hote:port
+        :param hote: Adresse d'écoute TCP
+        :param port: Port TCP
+        :param pret: Fonction appelée (sans argument) quand le service accepte les connexions
+        """
+        self.places = asyncio.Semaphore(self.en_cours_max)
+        self.executeur = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            if chemin_socket is not None:
+                serveur = await asyncio.start_unix_server(self._connexion, chemin_socket, limit=TAILLE_LIGNE_MAX)
+            else:
+                serveur = await asyncio.start_server(self._connexion, hote, port, limit=TAILLE_LIGNE_MAX)
+            async with serveur:
+                if pret is not None:
+                    pret()
+                await serveur.serve_forever()
+        finally:
+            self.executeur.shutdown(cancel_futures=True)
+            if chemin_socket is not None and os.path.exists(chemin_socket):
+                os.unlink(chemin_socket)
+
+    async def _connexion(self, lecteur, ecrivain):
+        """
+        Lire les requêtes d'une connexion et les traiter en parallèle, dans la limite des places libres.
+        """
+        verrou = asyncio.Lock()  # Une réponse est écrite d'un seul bloc
+        taches = set()
+        try:
+            while True:
+                self.metriques.en_attente += 1
+                try:
+                    await self.places.acquire()
+                finally:
+                    self.metriques.en_attente -= 1
+                try:
+                    ligne = await lecteur.readline()
+                except (ValueError, ConnectionError):  # Ligne trop longue ou connexion coupée
+                    self.places.release()
+                    break
+                if not ligne:
+                    self.places.release()
+                    break
+                if not ligne.strip():
+                    self.places.release()
+                    continue
+                tache = asyncio.create_task(self._repondre(ligne, ecrivain, verrou))
+                taches.add(tache)
+                tache.add_done_callback(taches.discard)
+            if taches:
+                await asyncio.gather(*taches)
+        finally:
+            ecrivain.close()
+
+    async def _repondre(self, ligne, ecrivain, verrou):
+        """
+        Traiter une requête et écrire sa réponse ; libère la place prise par _connexion.
+        """
+        debut = time.perf_counter()
+        self.metriques.en_cours += 1
+        operation = "invalide"
+        reponse = {"id": None}
+        try:
+            requete = json.loads(ligne)
+            if not isinstance(requete, dict):
+                raise ValueError("la requête doit être un objet JSON")
+            reponse["id"] = requete.get("id")
+            operation = str(requete.get("operation"))
+            reponse.update(await self._executer(operation, requete))
+            reponse["ok"] = True
+        except Exception as e:
+            reponse["ok"] = False
+            reponse["erreur"] = f"{type(e).__name__}: {e}"
+        finally:
+            self.metriques.en_cours -= 1
+            self.places.release()
+        duree = time.perf_counter() - debut
+        reponse["duree"] = duree
+        if operation != "metriques":
+            self.metriques.enregistrer(operation, duree, not reponse["ok"])
+        try:
+            async with verrou:
+                ecrivain.write(json.dumps(reponse, ensure_ascii=False).encode('utf-8') + b'\n')
+                await ecrivain.drain()
+        except ConnectionError:
+            pass  # Le client est parti : la réponse est perdue
+
+    async def _executer(self, operation, requete):
+        """
+        Exécuter une requête décodée.
+
+        :return: Champs de la réponse ({"resultat", "cle", "cache"})
+        :raises ValueError: Si l'opération, la grammaire ou un paramètre est invalide
+        """
+        if operation == "metriques":
+            return {"resultat": self.metriques.instantane(self.cache)}
+        if operation not in TRAITEMENTS:
+            raise ValueError(f"opération inconnue : '{operation}' "
+                             f"(opérations : {', '.join(list(TRAITEMENTS) + ['metriques'])})")
+        parametres = self._parametres(operation, requete)
+        cle, donnees = await self._grammaire(requete)
+
+        chargement = self.chargements.get(cle)
+        if chargement is not None:
+            await chargement.wait()  # Une requête précédente lit déjà cette grammaire : attendre son résultat
+        formes = self.cache.get(cle)
+        trouve = formes is not None
+        if formes is None and donnees is None:
+            raise ValueError(f"grammaire '{cle}' inconnue ou évincée du cache : l'envoyer de nouveau")
+        if not trouve:
+            chargement = self.chargements[cle] = asyncio.Event()
+        try:
+            return await self._calculer(operation, cle, donnees, formes, parametres)
+        finally:
+            if not trouve:
+                del self.chargements[cle]
+                chargement.set()
+
+    async def _calculer(self, operation, cle, donnees, formes, parametres):
+        """
+        Exécuter une opération dans le groupe de processus et compléter le cache du serveur.
+
+        :return: Champs de la réponse ({"resultat", "cle", "cache"})
+        """
+        trouve = formes is not None
+        boucle = asyncio.get_running_loop()
+        try:
+            try:
+                # Si la grammaire est connue, un processus l'a sans doute déjà : ne rien envoyer d'abord
+                resultat, nouvelles = await boucle.run_in_executor(
+                    self.executeur, traiter, operation, cle, None if trouve else donnees, None,
+                    tuple(formes or ()), parametres)
+            except GrammaireAbsente:
+                resultat, nouvelles = await boucle.run_in_executor(
+                    self.executeur, traiter, operation, cle, donnees, dict(formes), tuple(formes), parametres)
+        except BrokenProcessPool:
+            # Un processus est mort (mémoire épuisée...) : repartir d'un groupe neuf pour les requêtes suivantes
+            self.executeur.shutdown(wait=False, cancel_futures=True)
+            self.executeur = ProcessPoolExecutor(max_workers=self.jobs)
+            raise
+        if nouvelles or not trouve:
+            formes = dict(formes or {})
+            formes.update(nouvelles)
+            self.cache.put(cle, formes)
+        return {"resultat": resultat, "cle": cle, "cache": trouve}
+
+    @staticmethod
+    def _parametres(operation, requete):
+        """
+        Valider les paramètres d'une requête.
+
+        :return: Dictionnaire des paramètres utiles à l'opération
+        :raises ValueError: Si un paramètre obligatoire manque ou a un type invalide
+        """
+        _, obligatoires = TRAITEMENTS[operation]
+        for nom in obligatoires:
+            if nom not in requete:
+                raise ValueError(f"paramètre '{nom}' manquant pour '{operation}'")
+        parametres = {}
+        if "n" in requete:
+            if not isinstance(requete["n"], int) or isinstance(requete["n"], bool) or requete["n"] < 0:
+                raise ValueError("'n' doit être un entier positif ou nul")
+            parametres["n"] = requete["n"]
+        if "mots" in requete:
+            if not isinstance(requete["mots"], list) or not all(isinstance(mot, str) for mot in requete["mots"]):
+                raise ValueError("'mots' doit être une liste de chaînes")
+            parametres["mots"] = requete["mots"]
+        if "formes" in requete:
+            if not isinstance(requete["formes"], list) or not set(requete["formes"]) <= {"chomsky", "greibach"}:
+                raise ValueError("'formes' doit être une liste parmi 'chomsky' et 'greibach'")
+            parametres["formes"] = requete["formes"]
+        if "methode" in requete:
+            if requete["methode"] not in METHODES_GREIBACH:
+                raise ValueError(f"'methode' doit être parmi {', '.join(METHODES_GREIBACH)}")
+            parametres["methode"] = requete["methode"]
+        for nom in ("minimiser", "distincts"):
+            parametres[nom] = bool(requete.get(nom, False))
+        return parametres
+
+    @staticmethod
+    async def _grammaire(requete):
+        """
+        Identifier la grammaire d'une requête.
+
+        :return: Couple (empreinte, contenu en bytes ou None si seule l'empreinte est donnée)
+        :raises ValueError: Si la requête ne désigne aucune grammaire
+        """
+        if "grammaire" in requete:
+            donnees = str(requete["grammaire"]).encode('utf-8')
+        elif "chemin" in requete:
+            donnees = await asyncio.get_running_loop().run_in_executor(None, _lire_fichier, requete["chemin"])
+        elif "cle" in requete:
+            return str(requete["cle"]), None
+        else:
+            raise ValueError("la requête doit contenir 'grammaire', 'chemin' ou 'cle'")
+        return hashlib.sha256(donnees).hexdigest(), donnees
+
+def _lire_fichier(chemin):
+    """
+    :return: Contenu du fichier (bytes)
+    """
+    with open(chemin, 'rb') as fichier:
+        return fichier.read()
+
+class ClientGrammaires:
+    def __init__(self, chemin_socket=None, hote="127.0.0.1", port=PORT_DEFAUT):
+        """
+        Client synchrone du service, pour les outils qui veulent éviter de relire et renormaliser.
+
+        :param chemin_socket: Chemin de la socket Unix du service ; sinon, connexion TCP à hote:port
+        :param hote: Adresse TCP du service
+        :param port: Port TCP du service
+        """
+        if chemin_socket is not None:
+            self.connexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.connexion.connect(chemin_socket)
+        else:
+            self.connexion = socket.create_connection((hote, port))
+        self.fichier = self.connexion.makefile('rwb')
+        self.compteur = 0
+
+    def requete(self, operation, **champs):
+        """
+        Envoyer une requête et attendre sa réponse.
+
+        :param operation: Nom de l'opération
+        :param champs: Autres champs de la requête (grammaire, chemin, cle, n, mots...)
+        :return: Le résultat de l'opération
+        :raises RuntimeError: Si le service répond par une erreur
+        :raises ConnectionError: Si le service a fermé la connexion
+        """
+        self.compteur += 1
+        champs.update(operation=operation, id=self.compteur)
+        self.fichier.write(json.dumps(champs, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.fichier.flush()
+        ligne = self.fichier.readline()
+        if not ligne:
+            raise ConnectionError("le service a fermé la connexion")
+        reponse = json.loads(ligne)
+        if not reponse["ok"]:
+            raise RuntimeError(reponse["erreur"])
+        return reponse["resultat"]
+
+    def fermer(self):
+        """
+        Fermer la connexion.
+        """
+        self.fichier.close()
+        self.connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(usage="python3 service.py --serveur [--socket CHEMIN | --port N] [options]\n"
+                                           "       python3 service.py <operation> [fichier_grammaire] [options]")
+    parser.add_argument("operation", nargs="?", choices=list(TRAITEMENTS) + ["metriques"],
+                        help="opération à demander au service")
+    parser.add_argument("grammaire", nargs="?", help="fichier de grammaire (lu par le service)")
+    parser.add_argument("--serveur", action="store_true", help="démarrer le service")
+    parser.add_argument("--socket", metavar="CHEMIN", help="socket Unix du service (sinon TCP sur localhost)")
+    parser.add_argument("--port", type=int, default=PORT_DEFAUT, help=f"port TCP (par défaut : {PORT_DEFAUT})")
+    parser.add_argument("--jobs", type=int, default=None, metavar="N",
+                        help="serveur : nombre de processus de calcul (par défaut : nombre de processeurs)")
+    parser.add_argument("--capacite", type=int, default=128, metavar="N",
+                        help="serveur : nombre de grammaires gardées en cache (par défaut : 128)")
+    parser.add_argument("--en-cours", type=int, default=None, metavar="N",
+                        help="serveur : nombre maximal de requêtes en cours (par défaut : deux par processus)")
+    parser.add_argument("--n", type=int, help="generer, compter : longueur des mots")
+    parser.add_argument("--mots", metavar="FICHIER",
+                        help="appartenance : un mot par ligne, 'E' pour la chaîne vide (par défaut : entrée standard)")
+    parser.add_argument("--minimiser", action="store_true", help="normaliser : fusionner les non-terminaux équivalents")
+    parser.add_argument("--greibach", choices=METHODES_GREIBACH, default="substitution",
+                        help="normaliser : méthode de conversion en forme de Greibach (par défaut : substitution)")
+    parser.add_argument("--distincts", action="store_true", help="compter : ne compter qu'une fois un mot ambigu")
+    args = parser.parse_args()
+
+    if args.serveur:
+        service = ServiceGrammaires(args.jobs, args.capacite, args.en_cours)
+        adresse = args.socket if args.socket is not None else f"127.0.0.1:{args.port}"
+        try:
+            asyncio.run(service.servir(args.socket, port=args.port,
+                                       pret=lambda: print(f"Service à l'écoute sur {adresse}", flush=True)))
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if args.operation is None:
+        parser.error("indiquer une opération, ou --serveur pour démarrer le service")
+    if args.operation != "metriques" and args.grammaire is None:
+        parser.error("un fichier de grammaire est nécessaire")
+    requete = {}
+    if args.grammaire is not None:
+        requete["chemin"] = os.path.abspath(args.grammaire)
+    if args.operation in ("generer", "compter"):
+        if args.n is None:
+            parser.error("--n est nécessaire pour cette opération")
+        requete["n"] = args.n
+    if args.operation == "appartenance":
+        source = open(args.mots, encoding='utf-8') if args.mots else sys.stdin
+        with source:
+            requete["mots"] = [ligne.strip() for ligne in source if ligne.strip()]
+    requete["minimiser"] = args.minimiser
+    requete["methode"] = args.greibach
+    requete["distincts"] = args.distincts
+
+    try:
+        with ClientGrammaires(args.socket, port=args.port) as client:
+            resultat = client.requete(args.operation, **requete)
+    except (OSError, RuntimeError) as e:
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+    if args.operation == "normaliser":
+        for forme, contenu in resultat.items():
+            print(f"Forme normale de {forme.capitalize()} ({contenu['taille'][1]} règles) :")
+            print(contenu["regles"], end='')
+    elif args.operation == "generer":
+        for mot in resultat:
+            print(mot if mot != '' else 'E')
+    elif args.operation == "compter":
+        print(f"Nombre de {'mots distincts' if args.distincts else 'dérivations'} de longueur {args.n} : {resultat}")
+    elif args.operation == "appartenance":
+        for mot, present in zip(requete["mots"], resultat):
+            print(f"{mot} : {'oui' if present else 'non'}")
+    else:
+        print(json.dumps(resultat, ensure_ascii=False, indent=1))
@@ -0,0 +1,72 @@
+class TableSymboles:
+    def __init__(self):
+        """
+        Initialiser une table d'internement des symboles.
+
+        Les non-terminaux reçoivent des identifiants entiers positifs ou nuls (0, 1, 2, ...),
+        les terminaux des identifiants strictement négatifs (-1, -2, ...). Une production est
+        alors un tuple d'identifiants, et la chaîne vide (E) est le tuple vide.
+        """
+        self.noms_non_terminaux = []  # Identifiant -> nom, pour les non-terminaux
+        self.noms_terminaux = []  # (-identifiant - 1) -> nom, pour les terminaux
+        self.ids = {}  # Nom -> identifiant, pour tous les symboles
+
+    def non_terminal(self, nom):
+        """
+        Retourner l'identifiant d'un non-terminal, en l'internant si nécessaire.
+
+        :param nom: Nom du non-terminal (ex. 'S0')
+        :return: Identifiant entier (>= 0)
+        """
+        symbole = self.ids.get(nom)
+        if symbole is None:
+            symbole = len(self.noms_non_terminaux)
+            self.noms_non_terminaux.append(nom)
+            self.ids[nom] = symbole
+        return symbole
+
+    def terminal(self, nom):
+        """
+        Retourner l'identifiant d'un terminal, en l'internant si nécessaire.
+
+        :param nom: Nom du terminal (ex. 'a')
+        :return: Identifiant entier (< 0)
+        """
+        symbole = self.ids.get(nom)
+        if symbole is None:
+            symbole = -len(self.noms_terminaux) - 1
+            self.noms_terminaux.append(nom)
+            self.ids[nom] = symbole
+        return symbole
+
+    def nom(self, symbole):
+        """
+        Retourner le nom d'un symbole à partir de son identifiant.
+
+        :param symbole: Identifiant entier
+        :return: Nom du symbole
+        """
+        if symbole < 0:
+            return self.noms_terminaux[-symbole - 1]
+        return self.noms_non_terminaux[symbole]
+
+    def nom_production(self, production):
+        """
+        Reconstruire la forme textuelle d'une production.
+
+        :param production: Tuple d'identifiants
+        :return: Chaîne de caractères, 'E' pour la production vide
+        """
+        if not production:
+            return 'E'
+        return ''.join([self.nom(symbole) for symbole in production])
+
+    @staticmethod
+    def est_terminal(symbole):
+        """
+        Vérifier si un identifiant désigne un terminal.
+
+        :param symbole: Identifiant entier
+        :return: Booléen
+        """
+        return symbole < 0